@@ -2,37 +2,58 @@
 #
 #  This script generates the 5 cross-validation folds for the ESC-50 dataset
 #
+#  Files are hard-linked into the fold folders (LINK_MODE = 'symlink' for symbolic links), falling back to
+#  (parallel) copies when links are not supported, e.g. across filesystems.
+#
 ############################################################################################################
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 
 # Paths
 dataset_dir = './EV-benchmark/ESC-50'
-csv_path = os.path.join(dataset_dir, '/meta/esc50.csv')
+csv_path = os.path.join(dataset_dir, 'meta/esc50.csv')
 audio_dir = os.path.join(dataset_dir, 'audio/')
 output_dir = os.path.join(dataset_dir, 'cross_val_folds/')
+LINK_MODE = 'hardlink'  # 'hardlink', 'symlink' or 'copy'
+COPY_THREADS = 16
 
-# Create output folders if not already present
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
 
+def link_file(source_path, destination_path, mode=LINK_MODE):
+    """
+    Link source_path to destination_path.
+
+    :return: True if linked, False if a copy is needed (links not supported).
+    """
+    try:
+        if mode == 'hardlink':
+            os.link(source_path, destination_path)
+        elif mode == 'symlink':
+            os.symlink(os.path.abspath(source_path), destination_path)
+        else:
+            return False
+    except OSError:
+        return False
+    return True
+
+
+# Create output folders if not already present
 for i in range(1, 6):
-    fold_path = os.path.join(output_dir, f'fold_{i}')
-    if not os.path.exists(fold_path):
-        os.makedirs(fold_path)
+    os.makedirs(os.path.join(output_dir, f'fold_{i}'), exist_ok=True)
 
 # Read the CSV file
-df = pd.read_csv(csv_path)
+df = pd.read_csv(csv_path, usecols=['filename', 'fold'])
 
 # Organize files into fold folders
-for _, row in df.iterrows():
-    filename = row['filename']
-    fold = row['fold']
-    
-    source_path = os.path.join(audio_dir, filename)
-    destination_path = os.path.join(output_dir, f'fold_{fold}', filename)
-    
-    # Move or copy the file
-    shutil.copy(source_path, destination_path)
\ No newline at end of file
+source_paths = (audio_dir + df['filename']).tolist()
+destination_paths = (output_dir + 'fold_' + df['fold'].astype(str) + os.sep + df['filename']).tolist()
+pending = [(src, dst) for src, dst in zip(source_paths, destination_paths) if not os.path.lexists(dst)]
+to_copy = [(src, dst) for src, dst in pending if not link_file(src, dst)]
+
+# Copy the remaining files
+with ThreadPoolExecutor(max_workers=COPY_THREADS) as pool:
+    list(pool.map(lambda job: shutil.copy(*job), to_copy))
+
+print(f"{len(pending) - len(to_copy)} files linked, {len(to_copy)} copied ({len(df) - len(pending)} already present)")
@@ -1,5 +1,6 @@
 from torch.utils.data import DataLoader
-from dataloaders import (AudioSetEV_DataModule,
+from dataloaders import (dataset_manifest,
+                         AudioSetEV_DataModule,
                          ESC50_DataModule,
                          sireNNet_DataModule,
                          LSSiren_DataModule,
@@ -19,7 +20,7 @@ def compute_stats_from_dataloader(dl: DataLoader, sample_rate: int):
     total_batches = 0
 
     for batch in dl:
-        if batch is None:
+        if batch is None or len(batch[0]) == 0:
             continue
         waveforms, labels = batch
         # waveforms shape: (batch_size, channels, samples)
@@ -38,14 +39,38 @@ def compute_stats_from_dataloader(dl: DataLoader, sample_rate: int):
     return total_samples, total_duration_min, avg_duration_per_batch, total_positives, total_negatives
 
 
-def process_dataloader(dl, sample_rate: int, dataset_name: str):
+def compute_stats_from_manifest(dl: DataLoader, sample_rate: int):
+    """
+    Computes the same statistics as compute_stats_from_dataloader, from the datasets header-only manifests
+    (no audio decoding). Unreadable files are excluded, as they would be skipped by the DataLoader.
+    Durations are computed per sample (i.e. without the per-batch padding of variable-length collate functions).
+    """
+    manifest = dataset_manifest(dl.dataset)
+    manifest = manifest[manifest["sample_rate"].notna()]
+
+    total_samples = len(manifest)
+    total_duration_sec = manifest["length"].sum() / sample_rate
+    total_batches = len(dl)
+    total_positives = int((manifest["label"] == 1).sum())
+    total_negatives = int((manifest["label"] == 0).sum())
+
+    avg_duration_per_batch = (total_duration_sec / total_batches) if total_batches > 0 else 0
+    total_duration_min = total_duration_sec / 60.0
+    return total_samples, total_duration_min, avg_duration_per_batch, total_positives, total_negatives
+
+
+def process_dataloader(dl, sample_rate: int, dataset_name: str, from_manifest: bool = True):
     """
     Process a single dataloader or a list of dataloaders.
     
     :param dl: Either a DataLoader or a list of DataLoaders.
     :param sample_rate: The sample rate in Hz.
     :param dataset_name: Name of the dataset (for printing purposes).
+    :param from_manifest: If True, statistics are computed from header-only manifests (fast),
+                          otherwise by iterating (decoding) the full DataLoader.
     """
+    compute_stats = compute_stats_from_manifest if from_manifest else compute_stats_from_dataloader
+
     # If dl is a list of dataloaders, process them all
     if isinstance(dl, list):
         total_samples = 0
@@ -54,7 +79,7 @@ def process_dataloader(dl, sample_rate: int, dataset_name: str):
         total_negatives = 0
         
         for idx, sub_dl in enumerate(dl):
-            s, dur, avg_dur, pos, neg = compute_stats_from_dataloader(sub_dl, sample_rate)
+            s, dur, avg_dur, pos, neg = compute_stats(sub_dl, sample_rate)
             total_samples = s
             total_duration = dur  # in min
             total_positives = pos
@@ -67,7 +92,7 @@ def process_dataloader(dl, sample_rate: int, dataset_name: str):
             print(f"  Total negatives: {total_negatives}")
             print('....................................................')
     else:
-        s, dur, avg_dur, pos, neg = compute_stats_from_dataloader(dl, sample_rate)
+        s, dur, avg_dur, pos, neg = compute_stats(dl, sample_rate)
         print(f"Dataset: {dataset_name}")
         print(f"  Total samples: {s}")
         print(f"  Total duration (min): {dur:.2f}")
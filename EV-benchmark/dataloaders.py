@@ -1,38 +1,729 @@
 import os
+import json
+import hashlib
+import tempfile
+import math
+import time
+import warnings
+import multiprocessing as mp
+from collections import deque, namedtuple
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
 import random
+from concurrent.futures import ThreadPoolExecutor
 import torch
 import torch.nn.functional as F
-from torch.utils.data import Dataset, DataLoader, Subset, ConcatDataset, random_split
+import torch.distributed as dist
+from torch.utils.data import Dataset, IterableDataset, DataLoader, Subset, ConcatDataset, Sampler
 import torchaudio
+import soundfile as sf
 import pytorch_lightning as pl
 
 
+# Shared resampling -------------------------------------------------------------------------------------------------
+# Resample kernels are cached per process and keyed by (orig_sr, target_sr): building a sinc kernel is far more
+# expensive than applying it, and kernels built in the main process are inherited by forked DataLoader workers.
+_RESAMPLERS = {}
+
+
+def get_resampler(orig_sr, target_sr):
+    key = (int(orig_sr), int(target_sr))
+    resampler = _RESAMPLERS.get(key)
+    if resampler is None:
+        resampler = torchaudio.transforms.Resample(orig_freq=key[0], new_freq=key[1])
+        _RESAMPLERS[key] = resampler
+    return resampler
+
+
+def warm_resamplers(sample_rates, target_sr):
+    # Build kernels up-front (e.g. in DataModule.setup) so that workers fork with them already in memory
+    for sr in set(sample_rates):
+        if sr != target_sr:
+            get_resampler(sr, target_sr)
+
+
+def resample(waveform, orig_sr, target_sr):
+    if orig_sr == target_sr:
+        return waveform
+    return get_resampler(orig_sr, target_sr)(waveform)
+
+
+# Loading telemetry -------------------------------------------------------------------------------------------------
+MAX_SKIPPED_FILES = 100  # per-process (bounded) record of the last skipped files
+
+
+class LoaderTelemetry:
+    """
+    Bounded loading telemetry, aggregated across DataLoader workers.
+    Counters and latency histograms live in a shared-memory array with one row per process (each process claims its
+    own row on first use and writes it lock-free), so the main process can summarize them at any time without
+    message passing, and memory use does not grow with the number of loaded items.
+    Rows of exited processes (e.g. workers re-spawned at each epoch) are reused, keeping their counts.
+
+    :param num_slots: Number of rows (i.e. live processes which can write concurrently without sharing a row).
+    :param mp_context: Multiprocessing start method of the DataLoaders using it (default: platform default).
+    """
+    COUNTERS = ("items", "load_failures", "cache_hits", "cache_misses",
+                "aug_add_noise", "aug_time_roll", "aug_polarity_inversion", "aug_rand_amp_scaling")
+    HISTOGRAMS = ("decode", "resample")
+    LATENCY_BINS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self, num_slots=64, mp_context=None):
+        self.num_slots = num_slots
+        # Row layout: [counters..., for each histogram: (bins counts..., overflow count, latency sum in sec.)]
+        self._hist_width = len(self.LATENCY_BINS_MS) + 2
+        self._width = len(self.COUNTERS) + len(self.HISTOGRAMS) * self._hist_width
+        ctx = mp.get_context(mp_context)
+        self._data = ctx.RawArray('d', num_slots * self._width)
+        self._owners = ctx.RawArray('i', num_slots)  # pid of the process writing each row (0: free)
+        self._lock = ctx.Lock()
+        self._slot = None
+        self._slot_pid = None
+
+    @staticmethod
+    def _alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _claim_slot(self):
+        pid = os.getpid()
+        with self._lock:
+            for slot, owner in enumerate(self._owners):
+                if owner in (0, pid) or not self._alive(owner):
+                    self._owners[slot] = pid
+                    return slot
+        warnings.warn(f"LoaderTelemetry: all {self.num_slots} rows are used by live processes, rows are now shared "
+                      f"(concurrent updates may be lost): increase num_slots.")
+        return pid % self.num_slots
+
+    def _row_offset(self):
+        if self._slot is None or self._slot_pid != os.getpid():
+            self._slot = self._claim_slot()
+            self._slot_pid = os.getpid()
+        return self._slot * self._width
+
+    def count(self, name, n=1):
+        self._data[self._row_offset() + self.COUNTERS.index(name)] += n
+
+    def observe(self, name, seconds):
+        offset = self._row_offset() + len(self.COUNTERS) + self.HISTOGRAMS.index(name) * self._hist_width
+        milliseconds = seconds * 1000.0
+        bin_idx = len(self.LATENCY_BINS_MS)
+        for i, upper in enumerate(self.LATENCY_BINS_MS):
+            if milliseconds <= upper:
+                bin_idx = i
+                break
+        self._data[offset + bin_idx] += 1
+        self._data[offset + self._hist_width - 1] += seconds
+
+    def count_augmentations(self, applied):
+        # applied: {augmentation name: (B,) boolean mask}, as returned by WaveformAugmenter
+        for name, mask in applied.items():
+            self.count(f"aug_{name}", int(mask.sum()))
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        yield
+        self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        for i in range(len(self._data)):
+            self._data[i] = 0.0
+
+    def summary(self):
+        """
+        Aggregate all the processes rows.
+
+        :return: {"counters": {name: count},
+                  "histograms": {name: {"count": int, "mean_ms": float, "bins_ms": {"<=1": count, ..., ">5000": count}}}}
+        """
+        totals = [0.0] * self._width
+        for slot in range(self.num_slots):
+            row = self._data[slot * self._width:(slot + 1) * self._width]
+            totals = [t + v for t, v in zip(totals, row)]
+
+        counters = {name: int(totals[i]) for i, name in enumerate(self.COUNTERS)}
+        bin_names = [f"<={upper}" for upper in self.LATENCY_BINS_MS] + [f">{self.LATENCY_BINS_MS[-1]}"]
+        histograms = {}
+        for h, name in enumerate(self.HISTOGRAMS):
+            offset = len(self.COUNTERS) + h * self._hist_width
+            bins = [int(v) for v in totals[offset:offset + len(bin_names)]]
+            count = sum(bins)
+            mean_ms = 1000.0 * totals[offset + self._hist_width - 1] / count if count else 0.0
+            histograms[name] = {"count": count,
+                                "mean_ms": mean_ms,
+                                "bins_ms": dict(zip(bin_names, bins))}
+        return {"counters": counters, "histograms": histograms}
+
+
+# Fast WAV decoding -------------------------------------------------------------------------------------------------
+WavHeader = namedtuple("WavHeader", ["sample_rate", "channels", "dtype", "scale", "data_offset", "frames"])
+_WAV_DTYPES = {(1, 16): ("<i2", 1.0 / 32768.0), (1, 32): ("<i4", 1.0 / 2147483648.0), (3, 32): ("<f4", None)}
+RESAMPLE_MARGIN = 64  # extra source frames read before resampling a truncated waveform (resampling kernel overlap)
+
+
+def read_wav_header(file_path):
+    """
+    Parse the RIFF header of a PCM (16/32-bit integer or 32-bit float) WAV file.
+    Raises ValueError for any other file or sample format (i.e. to be decoded by torchaudio).
+    """
+    with open(file_path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"{file_path} is not a RIFF/WAVE file")
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{file_path} has no data chunk")
+            chunk_id, chunk_size = chunk[:4], int.from_bytes(chunk[4:], "little")
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                data_offset = f.tell()
+                break
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)  # chunks are word-aligned
+
+    if fmt is None or len(fmt) < 16:
+        raise ValueError(f"{file_path} has no valid fmt chunk")
+    format_tag = int.from_bytes(fmt[0:2], "little")
+    channels = int.from_bytes(fmt[2:4], "little")
+    sample_rate = int.from_bytes(fmt[4:8], "little")
+    bits = int.from_bytes(fmt[14:16], "little")
+    if format_tag == 0xFFFE and len(fmt) >= 26:
+        format_tag = int.from_bytes(fmt[24:26], "little")  # WAVE_FORMAT_EXTENSIBLE sub-format
+    if (format_tag, bits) not in _WAV_DTYPES:
+        raise ValueError(f"{file_path}: unsupported WAV sample format (tag {format_tag}, {bits} bits)")
+
+    dtype, scale = _WAV_DTYPES[(format_tag, bits)]
+    # Data size is clipped to the file size (e.g. streamed files with a placeholder data chunk size)
+    data_size = min(chunk_size, os.path.getsize(file_path) - data_offset)
+    return WavHeader(sample_rate, channels, dtype, scale, data_offset, data_size // (channels * bits // 8))
+
+
+def read_wav(file_path, num_frames=None, header=None):
+    """
+    Read (at most num_frames frames of) a PCM WAV file into a (channels, samples) float32 tensor: the data chunk
+    is memory-mapped, so that only the requested frames are read, and converted to float32 in a single step.
+
+    :return: tuple (waveform, sample_rate)
+    """
+    header = header or read_wav_header(file_path)
+    frames = header.frames if num_frames is None else min(num_frames, header.frames)
+    if frames == 0:
+        return torch.zeros(header.channels, 0), header.sample_rate
+
+    data = np.memmap(file_path, dtype=header.dtype, mode='r', offset=header.data_offset,
+                     shape=(frames, header.channels))
+    waveform = np.empty((header.channels, frames), dtype=np.float32)
+    if header.scale is None:
+        np.copyto(waveform, data.T)
+    else:
+        np.multiply(data.T, header.scale, out=waveform, dtype=np.float32)
+    del data
+    return torch.from_numpy(waveform), header.sample_rate
+
+
+# Compressed audio decoding (e.g. StandardDownloader FLAC/Opus outputs) --------------------------------------------
+SOUNDFILE_EXTENSIONS = (".flac", ".opus", ".ogg")
+AUDIO_EXTENSIONS = (".wav",) + SOUNDFILE_EXTENSIONS
+
+
+def source_frames(num_frames, sample_rate, target_sr=None):
+    # Source frames needed for num_frames output frames, after resampling to target_sr
+    if num_frames is None or target_sr is None or sample_rate == target_sr:
+        return num_frames
+    return math.ceil(num_frames * sample_rate / target_sr) + RESAMPLE_MARGIN
+
+
+def read_soundfile(file_path, num_frames=None, target_sr=None):
+    """
+    Decode (the source frames needed for num_frames output frames at target_sr of) a FLAC/Ogg file with libsndfile
+    into a (channels, samples) float32 tensor: decoding stops after the requested frames.
+
+    :return: tuple (waveform, sample_rate)
+    """
+    with sf.SoundFile(file_path) as f:
+        frames = source_frames(num_frames, f.samplerate, target_sr)
+        data = f.read(-1 if frames is None else frames, dtype='float32', always_2d=True)
+        return torch.from_numpy(np.ascontiguousarray(data.T)), f.samplerate
+
+
+# Decoded audio cache -----------------------------------------------------------------------------------------------
+class DecodedAudioCache:
+    """
+    Opt-in cache of decoded (and resampled) waveforms, shared by all the DataLoader workers and by successive
+    evaluations (e.g. of several checkpoints) on the same test set, so that each file is decoded once.
+    Entries are float32 .npy files in a shared-memory (tmpfs) folder; their total size is bounded by max_bytes,
+    evicting the least recently used entries first (modification times are refreshed on each hit).
+    Only resampled loads (i.e. with a target sample rate) are cached, and any cache I/O error is a cache miss.
+
+    The total size is tracked in shared memory by the processes of this cache instance (DataLoader workers), and
+    rebuilt from the cache folder (under a file lock, i.e. across instances and processes) at creation, before any
+    eviction, and after each max_bytes / 16 bytes of new entries: concurrent instances (e.g. of several DataModules
+    or processes) may thus exceed the budget by at most max_bytes / 16 each, between two folder scans.
+
+    :param cache_dir: Cache folder (default: a per-user folder in /dev/shm, or in the temporary folder).
+    :param max_bytes: Cache byte budget.
+    """
+    LOCK_FILE = ".lock"
+
+    def __init__(self, cache_dir=None, max_bytes=2 * 1024 ** 3, mp_context=None):
+        if cache_dir is None:
+            root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            cache_dir = os.path.join(root, f"ev-benchmark-audio-cache-{os.getuid() if hasattr(os, 'getuid') else 0}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.rescan_bytes = max(1, max_bytes // 16)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Total entries size (at the last folder scan, plus the entries added since by this instance processes)
+        ctx = mp_context or mp.get_context()
+        self._total_bytes = ctx.Value('q', 0)
+        self._added_bytes = ctx.RawValue('q', 0)  # since the last folder scan, guarded by the _total_bytes lock
+        with self._total_bytes.get_lock():
+            self._rescan()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npy"):
+                try:
+                    entries.append((entry.path, entry.stat().st_size, entry.stat().st_mtime))
+                except FileNotFoundError:
+                    continue  # evicted meanwhile
+        return entries
+
+    @contextmanager
+    def _folder_lock(self):
+        # Cross-process (and cross-instance) lock of the cache folder, where fcntl is available
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        with open(os.path.join(self.cache_dir, self.LOCK_FILE), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def key(self, file_path, target_sr, mono=False, num_frames=None):
+        # Source files are identified by path, size and modification time
+        st = os.stat(file_path)
+        source = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}|{target_sr}|{int(mono)}|{num_frames}"
+        return hashlib.sha1(source.encode()).hexdigest()
+
+    def get(self, key):
+        path = os.path.join(self.cache_dir, key + ".npy")
+        try:
+            waveform = np.load(path)
+            os.utime(path)
+        except (OSError, ValueError, EOFError):
+            return None  # missing, being evicted, partially written or unreadable
+        return torch.from_numpy(waveform)
+
+    def put(self, key, waveform):
+        nbytes = waveform.numel() * 4
+        if nbytes > self.max_bytes:
+            return
+
+        path = os.path.join(self.cache_dir, key + ".npy")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, waveform.numpy().astype(np.float32, copy=False))
+                size = f.tell()
+            os.link(tmp_path, path)  # atomic, and fails if another worker cached it meanwhile
+        except OSError:
+            return  # already cached, or no space left: loading does not depend on caching
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+        try:
+            with self._total_bytes.get_lock():
+                self._total_bytes.value += size
+                self._added_bytes.value += size
+                if self._total_bytes.value > self.max_bytes or self._added_bytes.value >= self.rescan_bytes:
+                    self._rescan()
+        except OSError as e:
+            print(f"Decoded audio cache {self.cache_dir} not updated: {e}")
+
+    def _rescan(self, target_bytes=None):
+        """
+        Rebuild the total size from the cache folder and, if over budget (or if target_bytes is given), evict the
+        least recently used entries down to target_bytes (default: 90% of the budget).
+        Called with the total size lock held.
+        """
+        with self._folder_lock():
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            if target_bytes is not None or total > self.max_bytes:
+                target_bytes = int(0.9 * self.max_bytes) if target_bytes is None else target_bytes
+                for path, size, _ in entries:
+                    if total <= target_bytes:
+                        break
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    total -= size
+        self._total_bytes.value = total
+        self._added_bytes.value = 0
+
+    def size(self):
+        return self._total_bytes.value
+
+    def clear(self):
+        with self._total_bytes.get_lock():
+            self._rescan(0)
+
+
+def load_waveform(file_path, target_sr=None, mono=False, telemetry=None, cache=None, num_frames=None):
+    """
+    Decode an audio file into a (channels, samples) float tensor, optionally down-mixed to mono and resampled
+    to target_sr. Decode and resample latencies are recorded in telemetry (if given).
+    PCM WAV files are read with read_wav, FLAC/Ogg files with read_soundfile (other files or formats with
+    torchaudio.load).
+    If a DecodedAudioCache is given, resampled waveforms are read from (or written to) it.
+
+    :param num_frames: Only decode the source frames needed for num_frames output frames (i.e. after resampling).
+    """
+    key = None
+    if cache is not None and target_sr is not None:
+        key = cache.key(file_path, target_sr, mono, num_frames)
+        waveform = cache.get(key)
+        if telemetry is not None:
+            telemetry.count("cache_hits" if waveform is not None else "cache_misses")
+        if waveform is not None:
+            return waveform, target_sr
+
+    start = time.perf_counter()
+    try:
+        header = read_wav_header(file_path)
+    except ValueError:
+        header = None
+    if header is not None:
+        waveform, sr = read_wav(file_path, source_frames(num_frames, header.sample_rate, target_sr), header)
+    elif str(file_path).lower().endswith(SOUNDFILE_EXTENSIONS):
+        waveform, sr = read_soundfile(file_path, num_frames, target_sr)
+    else:
+        waveform, sr = torchaudio.load(file_path)
+        if num_frames is not None and (target_sr is None or sr == target_sr):
+            waveform = waveform[:, :num_frames]
+    if telemetry is not None:
+        telemetry.observe("decode", time.perf_counter() - start)
+
+    # Stereo to mono: average channels
+    if mono and waveform.size(0) > 1:
+        waveform = waveform.mean(dim=0, keepdim=True)
+
+    if target_sr is not None and sr != target_sr:
+        start = time.perf_counter()
+        waveform = resample(waveform, sr, target_sr)
+        sr = target_sr
+        if num_frames is not None:
+            waveform = waveform[:, :num_frames]
+        if telemetry is not None:
+            telemetry.observe("resample", time.perf_counter() - start)
+
+    if key is not None:
+        cache.put(key, waveform)
+    return waveform, sr
+
+
+# Audio manifests (header-only scan) & length bucketing -------------------------------------------------------------
+MANIFEST_CACHE = ".manifest.csv"
+MANIFEST_COLUMNS = ["path", "size", "mtime", "sample_rate", "channels", "frames"]
+
+
+def _read_header(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    try:
+        info = sf.info(file_path)
+    except Exception as e:
+        # Unreadable files are cached as well, to not re-scan them at every run
+        print(f"Skipping Error reading header {file_path}: {e}")
+        return file_path, stat.st_size, stat.st_mtime, float("nan"), float("nan"), 0
+    return file_path, stat.st_size, stat.st_mtime, info.samplerate, info.channels, info.frames
+
+
+def scan_audio_headers(file_paths, cache_file=None, num_threads=None):
+    """
+    Read (sample_rate, channels, frames) for each audio file from its header only (no decoding), in a thread pool.
+    Results are cached to a CSV file and only new or modified files are re-scanned.
+    Unreadable files are reported with NaN sample_rate and 0 frames.
+    """
+    cached = pd.DataFrame(columns=MANIFEST_COLUMNS)
+    if cache_file is not None and os.path.exists(cache_file):
+        try:
+            cached = pd.read_csv(cache_file)
+            if list(cached.columns) != MANIFEST_COLUMNS:
+                raise ValueError(f"unexpected columns {list(cached.columns)}")
+        except (OSError, ValueError, pd.errors.ParserError) as e:
+            # Unreadable/corrupt cache: rebuilt (i.e. all files re-scanned)
+            print(f"Manifest cache {cache_file} ignored: {e}")
+            cached = pd.DataFrame(columns=MANIFEST_COLUMNS)
+    cached = cached.drop_duplicates("path", keep="last").set_index("path")
+
+    # Cache entries are valid if file size & modification time are unchanged
+    to_scan = []
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        if (file_path not in cached.index or cached.at[file_path, "size"] != stat.st_size or
+                cached.at[file_path, "mtime"] != stat.st_mtime):
+            to_scan.append(file_path)
+
+    if to_scan:
+        with ThreadPoolExecutor(max_workers=num_threads or min(32, 4 * (os.cpu_count() or 1))) as pool:
+            rows = [row for row in pool.map(_read_header, to_scan) if row is not None]
+        scanned = pd.DataFrame(rows, columns=MANIFEST_COLUMNS).set_index("path")
+        cached = pd.concat([cached.drop(scanned.index, errors="ignore"), scanned])
+        if cache_file is not None:
+            try:
+                tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+                cached.reset_index().to_csv(tmp_file, index=False)
+                os.replace(tmp_file, cache_file)
+            except OSError as e:
+                # e.g. read-only data folder: the manifest is only kept in memory
+                print(f"Manifest cache not saved to {cache_file}: {e}")
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+
+    headers = cached.reindex(list(file_paths))[["sample_rate", "channels", "frames"]].astype("float64")
+    headers["frames"] = headers["frames"].fillna(0).astype("int64")
+    return headers
+
+
+def build_manifest(file_paths, labels, cache_file=None, num_threads=None):
+    """
+    Build a Dataset manifest: one row per item with path, label, native sample_rate, channels and frames.
+    """
+    headers = scan_audio_headers(file_paths, cache_file, num_threads)
+    return pd.DataFrame({"path": list(file_paths),
+                         "label": list(labels),
+                         "sample_rate": headers["sample_rate"].to_numpy(),
+                         "channels": headers["channels"].to_numpy(),
+                         "frames": headers["frames"].to_numpy()})
+
+
+class ManifestMixin:
+    """
+    Header-only manifest support for benchmark Datasets.
+    Datasets implement manifest_items() -> (file_paths, labels) and output_length(sample_rate, frames).
+    """
+    _manifest = None
+
+    def manifest(self, cache_file=None, num_threads=None):
+        if self._manifest is None:
+            file_paths, labels = self.manifest_items()
+            cache_file = cache_file or os.path.join(self.folder_path, MANIFEST_CACHE)
+            self._manifest = build_manifest(file_paths, labels, cache_file, num_threads)
+        return self._manifest
+
+    def item_lengths(self):
+        # Per-item output length (in samples, after resampling/padding/truncation)
+        manifest = self.manifest()
+        return [self.output_length(sr, frames) if sr == sr else self.output_length(self.target_sr, 0)
+                for sr, frames in zip(manifest["sample_rate"], manifest["frames"])]
+
+    def sample_rates(self):
+        # Distinct native sample rates (unreadable files excluded), e.g. to warm the resamplers in DataModule.setup
+        return sorted(int(sr) for sr in self.manifest()["sample_rate"].dropna().unique())
+
+
+def dataset_manifest(dataset):
+    """
+    Resolve a (nested) Subset/ConcatDataset of benchmark Datasets into a single manifest,
+    with an additional per-item output 'length' column.
+    """
+    if isinstance(dataset, Subset):
+        return dataset_manifest(dataset.dataset).iloc[list(dataset.indices)].reset_index(drop=True)
+    if isinstance(dataset, ConcatDataset):
+        return pd.concat([dataset_manifest(d) for d in dataset.datasets], ignore_index=True)
+    manifest = dataset.manifest().copy()
+    manifest["length"] = dataset.item_lengths()
+    return manifest
+
+
+def resampled_length(frames, orig_sr, target_sr):
+    # Same output length as torchaudio.functional.resample
+    return int(math.ceil(frames * target_sr / orig_sr))
+
+
+class BucketBatchSampler(Sampler):
+    """
+    Batch sampler grouping items of similar length, to minimize padding in variable-length collate functions.
+
+    :param lengths: Length (in samples, after any resampling/padding) of each item of the dataset.
+    :param batch_size: Maximum number of items per batch.
+    :param max_batch_samples: If given, also caps the padded batch size (longest item * batch items).
+    :param shuffle: If True, items are shuffled within pools of similar length and batches order is shuffled.
+    :param pool_size: Number of batches per sorting pool when shuffling (trade-off between randomness and padding).
+    :param seed: Seed for the per-epoch shuffling.
+    :param drop_last: Drop the last batch (of each pool) if smaller than batch_size.
+    """
+    def __init__(self, lengths, batch_size=32, max_batch_samples=None, shuffle=False, pool_size=50, seed=0, drop_last=False):
+        self.lengths = list(lengths)
+        self.batch_size = batch_size
+        self.max_batch_samples = max_batch_samples
+        self.shuffle = shuffle
+        self.pool_size = pool_size
+        self.seed = seed
+        self.drop_last = drop_last
+        self.epoch = 0
+        self._batches = None
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+        self._batches = None
+
+    def _split(self, indices):
+        # indices are sorted by ascending length: the last added item is always the longest one
+        batches, batch = [], []
+        for idx in indices:
+            if batch and (len(batch) == self.batch_size or
+                          (self.max_batch_samples is not None and
+                           self.lengths[idx] * (len(batch) + 1) > self.max_batch_samples)):
+                batches.append(batch)
+                batch = []
+            batch.append(idx)
+        if batch and not (self.drop_last and len(batch) < self.batch_size):
+            batches.append(batch)
+        return batches
+
+    def _make_batches(self):
+        indices = list(range(len(self.lengths)))
+        if not self.shuffle:
+            return self._split(sorted(indices, key=self.lengths.__getitem__))
+
+        rng = random.Random(self.seed + self.epoch)
+        rng.shuffle(indices)
+        pool = self.batch_size * self.pool_size
+        batches = []
+        for start in range(0, len(indices), pool):
+            batches.extend(self._split(sorted(indices[start:start + pool], key=self.lengths.__getitem__)))
+        rng.shuffle(batches)
+        return batches
+
+    def __iter__(self):
+        if self._batches is None:
+            self._batches = self._make_batches()
+        batches, self._batches = self._batches, None
+        if self.shuffle:
+            self.epoch += 1
+        return iter(batches)
+
+    def __len__(self):
+        if self._batches is None:
+            self._batches = self._make_batches()
+        return len(self._batches)
+
+
+# DataLoader factory ------------------------------------------------------------------------------------------------
+def default_num_workers(max_workers=8):
+    """Number of DataLoader workers from the CPUs available to this process (one CPU is left to the main process)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return max(0, min(max_workers, cpus - 1))
+
+
+def _init_worker(worker_id):
+    # One intra-op thread per worker: N workers x N threads would oversubscribe the CPUs
+    torch.set_num_threads(1)
+
+
+def make_dataloader(dataset, batch_size=1, shuffle=False, collate_fn=None, batch_sampler=None, generator=None,
+                    num_workers=None, pin_memory=None, persistent_workers=True, prefetch_factor=2, loader_class=DataLoader,
+                    **kwargs):
+    """
+    Shared DataLoader factory of the benchmark DataModules.
+
+    :param num_workers: Number of worker processes (default: default_num_workers()).
+    :param pin_memory: Page-locked batches for faster host-to-GPU copies (default: whether CUDA is available).
+    :param persistent_workers: Keep workers (and their resample kernels, file handles, ...) alive across epochs,
+                               instead of re-spawning them at each epoch (ignored without workers).
+    :param prefetch_factor: Batches loaded in advance by each worker (ignored without workers).
+    :param loader_class: DataLoader (sub)class, e.g. EpochDataLoader.
+    :param kwargs: Any other DataLoader argument (e.g. drop_last, timeout, multiprocessing_context).
+    """
+    num_workers = default_num_workers() if num_workers is None else num_workers
+    pin_memory = torch.cuda.is_available() if pin_memory is None else pin_memory
+
+    if batch_sampler is not None:
+        kwargs["batch_sampler"] = batch_sampler
+    else:
+        kwargs.update(batch_size=batch_size, shuffle=shuffle)
+    if num_workers > 0:
+        kwargs.setdefault("worker_init_fn", _init_worker)
+        kwargs.update(persistent_workers=persistent_workers, prefetch_factor=prefetch_factor)
+
+    return loader_class(dataset,
+                        collate_fn=collate_fn,
+                        generator=generator,
+                        num_workers=num_workers,
+                        pin_memory=pin_memory,
+                        **kwargs)
+
+
 # AudioSet_EV Dataset ------------------------------------------------------------------------------------------------
-class AudioSetEV_Dataset(Dataset):
-    def __init__(self, file_path, folder_path, target_size=320000, binary_label=1):
+class AudioSetEV_Dataset(ManifestMixin, Dataset):
+    def __init__(self, file_path, folder_path, target_size=320000, binary_label=1, telemetry=None, filenames=None):
         self.cwd = os.getcwd()
         self.file_path = os.path.abspath(os.path.join(self.cwd, file_path))
         self.folder_path = os.path.abspath(os.path.join(self.cwd, folder_path))
-        self.filenames = self.get_filenames(self.folder_path)
+        self.filenames = list(filenames) if filenames is not None else self.get_filenames(self.folder_path)
         self.target_size = target_size
-        self.skipped_files = []
+        self.skipped_files = deque(maxlen=MAX_SKIPPED_FILES)
+        self.telemetry = telemetry
         self.label = binary_label
 
     def __len__(self):
         return len(self.filenames)
     
     def get_filenames(self, path):
-        return [os.path.join(path, f) for f in os.listdir(path) if f.endswith('.wav')]
+        return [os.path.join(path, f) for f in os.listdir(path) if f.endswith(AUDIO_EXTENSIONS)]
+
+    def manifest_items(self):
+        return self.filenames, [self.label] * len(self.filenames)
+
+    def output_length(self, sample_rate, frames):
+        return self.target_size
 
     def __getitem__(self, idx):
         file_path = self.filenames[idx]
         try:
-            waveform_tensor, _ = torchaudio.load(file_path)
+            waveform_tensor, _ = load_waveform(file_path, telemetry=self.telemetry, num_frames=self.target_size)
         except Exception as e:
             self.skipped_files.append((idx, file_path))
+            if self.telemetry is not None:
+                self.telemetry.count("load_failures")
             print(f"Skipping Error loading {file_path}: {e}")
             return None
+        if self.telemetry is not None:
+            self.telemetry.count("items")
 
         # Pad or truncate waveform_tensor to target_size
         current_size = waveform_tensor.size(1)
@@ -45,60 +736,118 @@ class AudioSetEV_Dataset(Dataset):
         return waveform_tensor, self.label
 
 
-class AudioSetEV_Aug_Dataset(Dataset):
-    def __init__(self, file_path, folder_path, target_size=320000, binary_label=1, aug_p=0.7):
+class WaveformAugmenter:
+    """
+    Vectorized waveform augmentations over (B, C, T) batches.
+    Each augmentation is applied to a random subset of rows (each row with probability p), and the augmentations
+    order is shuffled per batch. Random draws come from a torch.Generator seeded once per DataLoader worker:
+    runs are reproducible given the DataLoader generator (or the seed, when loading in the main process).
+
+    :param p: Probability of applying each augmentation to each waveform.
+    :param noise_scale: Additive noise scale (before peak normalization).
+    :param seed: Generator seed used when augmenting in the main process (default: torch.initial_seed()).
+    """
+    AUGMENTATIONS = ("add_noise", "time_roll", "polarity_inversion", "rand_amp_scaling")
+
+    def __init__(self, p=0.7, noise_scale=0.1, seed=None):
+        self.p = p
+        self.noise_scale = noise_scale
+        self.seed = seed
+        self._generator = None
+        self._generator_pid = None
+
+    def generator(self):
+        # (Re-)create the generator in each process: worker seeds are base_seed + worker_id of the DataLoader
+        if self._generator is None or self._generator_pid != os.getpid():
+            worker_info = torch.utils.data.get_worker_info()
+            if worker_info is not None:
+                seed = worker_info.seed
+            else:
+                seed = self.seed if self.seed is not None else torch.initial_seed()
+            self._generator = torch.Generator().manual_seed(seed)
+            self._generator_pid = os.getpid()
+        return self._generator
+
+    def add_noise(self, waveforms, rows, g):
+        # waveform + noise * scale / max(|waveform + noise * scale|)
+        selected = waveforms.index_select(0, rows)
+        noise = torch.randn(selected.shape, generator=g).mul_(self.noise_scale)
+        peak = torch.add(selected, noise).abs_().amax(dim=(1, 2), keepdim=True).clamp_min_(1e-12)
+        waveforms.index_copy_(0, rows, selected.add_(noise.div_(peak)))
+
+    def time_roll(self, waveforms, rows, g):
+        shifts = torch.randint(1, waveforms.size(2) + 1, (rows.numel(),), generator=g)
+        for row, shift in zip(rows.tolist(), shifts.tolist()):
+            waveforms[row] = torch.roll(waveforms[row], shifts=shift, dims=1)
+
+    def polarity_inversion(self, waveforms, rows, g):
+        signs = torch.ones((waveforms.size(0), 1, 1), dtype=waveforms.dtype)
+        signs[rows] = -1
+        waveforms.mul_(signs)
+
+    def rand_amp_scaling(self, waveforms, rows, g):
+        # Per row (50/50): a scalar gain in [0.1, 1.0[ or a random gain vector in [0, 1[ (shared by channels)
+        scalar = torch.rand(rows.numel(), generator=g) > 0.5
+        gains = torch.ones((waveforms.size(0), 1, 1), dtype=waveforms.dtype)
+        gains[rows[scalar]] = torch.empty((int(scalar.sum()), 1, 1)).uniform_(0.1, 1.0, generator=g)
+        waveforms.mul_(gains)
+
+        vector_rows = rows[~scalar]
+        envelopes = torch.rand((vector_rows.numel(), 1, waveforms.size(2)), generator=g)
+        for row, envelope in zip(vector_rows.tolist(), envelopes):
+            waveforms[row].mul_(envelope)
+
+    def __call__(self, waveforms):
+        """
+        Augment a (B, C, T) batch in-place.
+
+        :return: tuple (waveforms, applied) where applied maps each augmentation name to a (B,) boolean mask.
+        """
+        g = self.generator()
+        masks = torch.rand((len(self.AUGMENTATIONS), waveforms.size(0)), generator=g) < self.p
+        applied = {}
+        for op in torch.randperm(len(self.AUGMENTATIONS), generator=g).tolist():
+            name = self.AUGMENTATIONS[op]
+            rows = masks[op].nonzero().squeeze(1)
+            if rows.numel() > 0:
+                getattr(self, name)(waveforms, rows, g)
+            applied[name] = masks[op]
+        return waveforms, applied
+
+
+class AudioSetEV_Aug_Dataset(ManifestMixin, Dataset):
+    """
+    AudioSet-EV dataset with waveform augmentations. With batch_augment=True, items are returned un-augmented
+    and augmentations are expected to run after collation (see AugmentedCollate), which is much faster.
+    """
+    def __init__(self, file_path, folder_path, target_size=320000, binary_label=1, aug_p=0.7, batch_augment=False, seed=None,
+                 telemetry=None, filenames=None):
         self.cwd = os.getcwd()
         self.file_path = os.path.abspath(os.path.join(self.cwd, file_path))
         self.folder_path = os.path.abspath(os.path.join(self.cwd, folder_path))
-        self.filenames = self.get_filenames(self.folder_path)
+        self.filenames = list(filenames) if filenames is not None else self.get_filenames(self.folder_path)
         self.target_size = target_size
-        self.skipped_files = []
+        self.skipped_files = deque(maxlen=MAX_SKIPPED_FILES)
+        self.telemetry = telemetry
         self.label = binary_label
         self.augment_p = aug_p
-        self.augmentations = self.define_augmentations()
-        self.applied_augmentations = []
+        self.batch_augment = batch_augment
+        self.augmenter = WaveformAugmenter(p=aug_p, seed=seed)
 
     def get_filenames(self, path):
-        return [os.path.join(path, f) for f in os.listdir(path) if f.endswith('.wav')]
-
-    def define_augmentations(self):
-        return {"add_noise": self.add_random_noise,
-                "time_roll": self.time_roll,
-                "polarity_inversion": self.polarity_inversion,
-                "rand_amp_scaling": self.random_amplification,}
-
-    def add_random_noise(self, waveform, scale=0.1):
-        noise_type = random.choice(["white", "gaussian"])
-        noise = torch.randn_like(waveform) if noise_type == "white" else torch.normal(0, 1, size=waveform.shape)
-        return waveform + noise * scale / torch.max(torch.abs(waveform + noise * scale)) 
-
-    def time_roll(self, waveform):
-        shift = random.randint(1, waveform.size(1))
-        return torch.roll(waveform, shifts=shift, dims=1)
-
-    def polarity_inversion(self, waveform):
-        return waveform * -1
-
-    def random_amplification(self, waveform):
-        if random.random() > 0.5:
-            scalar = random.uniform(0.1, 1.0)
-            return waveform * scalar
-        else:
-            vector = torch.rand(waveform.size(1))
-            return waveform * vector.unsqueeze(0)
+        return [os.path.join(path, f) for f in os.listdir(path) if f.endswith(AUDIO_EXTENSIONS)]
+
+    def manifest_items(self):
+        return self.filenames, [self.label] * len(self.filenames)
+
+    def output_length(self, sample_rate, frames):
+        return self.target_size
 
     def apply_augmentations(self, waveform):
-        applied = []
-        augment_order = list(self.augmentations.keys())
-        
-        # Randomize order & apply augmentations
-        random.shuffle(augment_order)
-        for augment_name in augment_order:
-            if random.random() < self.augment_p:
-                waveform = self.augmentations[augment_name](waveform)
-                applied.append(augment_name)
-        
-        return waveform, applied
+        waveforms, applied = self.augmenter(waveform.unsqueeze(0))
+        if self.telemetry is not None:
+            self.telemetry.count_augmentations(applied)
+        return waveforms.squeeze(0), [name for name, mask in applied.items() if mask[0]]
 
     def __len__(self):
         return len(self.filenames)
@@ -106,11 +855,15 @@ class AudioSetEV_Aug_Dataset(Dataset):
     def __getitem__(self, idx):
         file_path = self.filenames[idx]
         try:
-            waveform_tensor, _ = torchaudio.load(file_path)
+            waveform_tensor, _ = load_waveform(file_path, telemetry=self.telemetry, num_frames=self.target_size)
         except Exception as e:
             self.skipped_files.append((idx, file_path))
+            if self.telemetry is not None:
+                self.telemetry.count("load_failures")
             print(f"Skipping Error loading {file_path}: {e}")
             return None
+        if self.telemetry is not None:
+            self.telemetry.count("items")
 
         # Pad or truncate waveform_tensor to target_size
         current_size = waveform_tensor.size(1)
@@ -120,12 +873,9 @@ class AudioSetEV_Aug_Dataset(Dataset):
         elif current_size > self.target_size:
             waveform_tensor = waveform_tensor[:, :self.target_size]
 
-        # Apply augmentations
-        waveform_tensor, applied = self.apply_augmentations(waveform_tensor)
-
-        # Track augmentations applied
-        self.applied_augmentations.append({"file_path": file_path,
-                                           "augmentations": applied})
+        # Apply augmentations (unless deferred to the batch level)
+        if not self.batch_augment:
+            waveform_tensor, _ = self.apply_augmentations(waveform_tensor)
 
         return waveform_tensor, self.label
 
@@ -133,13 +883,211 @@ class AudioSetEV_Aug_Dataset(Dataset):
 def custom_collate_fn(batch):
     batch = [item for item in batch if item is not None]
     if not batch:
-        return None, None
+        # Empty batch (rather than None, which breaks batch transfers and hooks)
+        return torch.empty(0), torch.empty(0, dtype=torch.long)
     
     return torch.utils.data.default_collate(batch)
 
 
+class FixedLengthCollate:
+    """
+    Collate function for fixed-length (waveform, label) items, writing batches into a ring of preallocated
+    (B, C, target_size) buffers instead of allocating a new batch tensor each time: each item is copied into its
+    slot (truncated, or zero-padded at the tail), and dropped (None) items are compacted away.
+    Buffers are allocated per process, in shared memory within DataLoader workers (so that batches are sent to the
+    main process without further copies) and pinned in the main process (if pin_memory and CUDA is available).
+
+    A buffer is overwritten num_buffers batches later (in the same process): num_buffers must exceed the batches
+    in flight (the DataLoader prefetch_factor, plus one being pinned and one being consumed), and batches kept
+    any longer must be cloned. Hence the DataModules only use it when ring_collate=True (custom_collate_fn otherwise).
+
+    :param target_size: Batch waveforms length.
+    :param num_buffers: Ring size.
+    :param pin_memory: Pin the main process buffers.
+    """
+    def __init__(self, target_size, num_buffers=4, pin_memory=False):
+        self.target_size = target_size
+        self.num_buffers = num_buffers
+        self.pin_memory = pin_memory
+        self._buffers = []
+        self._next = 0
+        self._pid = None
+
+    @classmethod
+    def for_loader(cls, target_size, loader_kwargs=None):
+        """Ring sized (and pinned) according to make_dataloader arguments."""
+        loader_kwargs = loader_kwargs or {}
+        pin_memory = loader_kwargs.get("pin_memory")
+        return cls(target_size,
+                   num_buffers=loader_kwargs.get("prefetch_factor", 2) + 2,
+                   pin_memory=torch.cuda.is_available() if pin_memory is None else pin_memory)
+
+    def __getstate__(self):
+        # Buffers are per process: never pickled to the workers
+        state = self.__dict__.copy()
+        state.update(_buffers=[], _next=0, _pid=None)
+        return state
+
+    def _allocate(self, batch_size, channels):
+        in_worker = torch.utils.data.get_worker_info() is not None
+        pin = self.pin_memory and not in_worker and torch.cuda.is_available()
+        self._buffers = []
+        for _ in range(self.num_buffers):
+            waveforms = torch.empty(batch_size, channels, self.target_size, pin_memory=pin)
+            labels = torch.empty(batch_size, dtype=torch.long, pin_memory=pin)
+            if in_worker:
+                waveforms.share_memory_()
+                labels.share_memory_()
+            self._buffers.append((waveforms, labels))
+        self._next = 0
+        self._pid = os.getpid()
+
+    def __call__(self, batch):
+        first = next((item for item in batch if item is not None), None)
+        channels = first[0].size(0) if first is not None else 1
+        if (self._pid != os.getpid() or not self._buffers or self._buffers[0][0].size(0) < len(batch)
+                or self._buffers[0][0].size(1) != channels):
+            self._allocate(max(len(batch), 1), channels)
+
+        waveforms, labels = self._buffers[self._next]
+        self._next = (self._next + 1) % self.num_buffers
+
+        n = 0
+        for item in batch:
+            if item is None:
+                continue
+            waveform, label = item
+            length = min(waveform.size(-1), self.target_size)
+            waveforms[n, :, :length].copy_(waveform[..., :length])
+            waveforms[n, :, length:].zero_()
+            labels[n] = label
+            n += 1
+
+        return waveforms[:n], labels[:n]
+
+
+def fixed_length_collate(target_size, loader_kwargs=None, ring=False):
+    """
+    DataModules collate function for fixed-length items: custom_collate_fn (new batch tensors), or with ring=True
+    (opt-in) a FixedLengthCollate, whose batches are reused buffers (see its docstring before enabling it).
+    """
+    return FixedLengthCollate.for_loader(target_size, loader_kwargs) if ring else custom_collate_fn
+
+
+class AugmentedCollate:
+    """
+    Collate function applying WaveformAugmenter on the whole collated (B, C, T) batch, in the DataLoader workers.
+    """
+    def __init__(self, augmenter, collate_fn=custom_collate_fn, telemetry=None):
+        self.augmenter = augmenter
+        self.collate_fn = collate_fn
+        self.telemetry = telemetry
+
+    def __call__(self, batch):
+        waveforms, labels = self.collate_fn(batch)
+        if len(waveforms) > 0:
+            waveforms, applied = self.augmenter(waveforms)
+            if self.telemetry is not None:
+                self.telemetry.count_augmentations(applied)
+        return waveforms, labels
+
+
+# AudioSet_EV splits ------------------------------------------------------------------------------------------------
+SPLITS = ("train", "dev", "test")
+CHANNEL_SUFFIXES = ("Original", "Reduced", "Left", "Right")
+
+
+def audioset_ev_yt_id(file_path):
+    # Downloaded files are named <yt_id>_<Original|Reduced|Left|Right>.<wav|flac|opus> (see StandardDownloader.process_audio)
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    yt_id, _, suffix = stem.rpartition('_')
+    return yt_id if yt_id and suffix in CHANNEL_SUFFIXES else stem
+
+
+def create_audioset_ev_splits(sources, split_ratios=(0.8, 0.1, 0.1), seed=42):
+    """
+    Seeded Train/Dev/Test split of AudioSet-EV files, grouped by yt_id (e.g. '_Left'/'_Right' files of the same
+    video always fall in the same split) and stratified by label.
+
+    :param sources: List of (csv_file, folder_path, label) tuples. Only files whose yt_id is listed in csv_file are kept.
+    :param split_ratios: Train/Dev/Test ratios (computed over yt_id groups, per label).
+    :param seed: Shuffling seed.
+    :return: DataFrame with columns path, label, yt_id, split
+    """
+    rng = random.Random(seed)
+    items = []
+    assigned = {}
+    for csv_file, folder_path, label in sources:
+        yt_ids = set(pd.read_csv(csv_file, skipinitialspace=True, usecols=["yt_id"])["yt_id"].astype(str))
+
+        groups = {}
+        skipped = 0
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(AUDIO_EXTENSIONS):
+                    yt_id = audioset_ev_yt_id(entry.name)
+                    if yt_id in yt_ids:
+                        groups.setdefault(yt_id, []).append(os.path.abspath(entry.path))
+                    else:
+                        skipped += 1
+        if skipped:
+            print(f"{skipped} files in {folder_path} not listed in {csv_file}: excluded from splits.")
+
+        # Per-label (stratified) split of yt_id groups, independent from the file system listing order
+        group_ids = sorted(groups)
+        rng.shuffle(group_ids)
+        train_size = int(split_ratios[0] * len(group_ids))
+        dev_size = int(split_ratios[1] * len(group_ids))
+        for i, yt_id in enumerate(group_ids):
+            split = "train" if i < train_size else "dev" if i < train_size + dev_size else "test"
+            split = assigned.setdefault(yt_id, split)  # yt_ids shared by sources keep their first split
+            items.extend((path, label, yt_id, split) for path in sorted(groups[yt_id]))
+
+    return pd.DataFrame(items, columns=["path", "label", "yt_id", "split"])
+
+
+def load_or_create_splits(split_file, sources, split_ratios=(0.8, 0.1, 0.1), seed=42):
+    """
+    Load the split manifest from split_file if it was created with the same sources, ratios and seed,
+    otherwise create (and persist) it with create_audioset_ev_splits.
+    """
+    params = {"sources": [[os.path.abspath(csv_file), os.path.abspath(folder_path), int(label)]
+                          for csv_file, folder_path, label in sources],
+              "split_ratios": list(split_ratios),
+              "seed": seed}
+
+    if os.path.exists(split_file):
+        try:
+            with open(split_file, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get("params") == params:
+                return pd.DataFrame(manifest["items"])
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            # Unreadable/corrupt manifest (e.g. truncated, hand-edited): regenerated, as with different params
+            print(f"Split manifest {split_file} ignored: {e}")
+
+    splits = create_audioset_ev_splits(params["sources"], split_ratios, seed)
+    tmp_file = f"{split_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump({"params": params, "items": splits.to_dict(orient="list")}, f)
+        os.replace(tmp_file, split_file)
+    except OSError as e:
+        # e.g. read-only data folder: the (seeded, reproducible) splits are only kept in memory
+        print(f"Split manifest not saved to {split_file}: {e}")
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return splits
+
+
+def default_split_file(TP_file):
+    return os.path.join(os.path.dirname(os.path.abspath(TP_file)), "AudioSetEV_splits.json")
+
+
 class AudioSetEV_DataModule(pl.LightningDataModule):
-    def __init__(self, TP_file, TP_folder, TN_file, TN_folder, batch_size=32, split_ratios=(0.8, 0.1, 0.1), shuffle=True):
+    def __init__(self, TP_file, TP_folder, TN_file, TN_folder, batch_size=32, split_ratios=(0.8, 0.1, 0.1), shuffle=True,
+                 split_seed=42, split_file=None, loader_kwargs=None, target_size=320000, ring_collate=False):
         super().__init__()
         self.pos_folder = TP_folder
         self.neg_folder = TN_folder
@@ -148,53 +1096,65 @@ class AudioSetEV_DataModule(pl.LightningDataModule):
         self.batch_size = batch_size
         self.split_ratios = split_ratios
         self.train_shuffle = shuffle
+        self.split_seed = split_seed
+        self.split_file = split_file or default_split_file(TP_file)
+        self.loader_kwargs = loader_kwargs or {}
+        self.target_size = target_size
+        self.collate_fn = fixed_length_collate(target_size, self.loader_kwargs, ring_collate)
 
+        self.telemetry = LoaderTelemetry()
         self.train_dataset = None
         self.dev_dataset = None
         self.test_dataset = None
 
     def setup(self, stage=None):
-        # Load the full datasets for TP and TN
-        pos_dataset = AudioSetEV_Dataset(self.pos_file, self.pos_folder, binary_label=1)
-        neg_dataset = AudioSetEV_Dataset(self.neg_file, self.neg_folder, binary_label=0)
-
-        # Combine datasets
-        combined_dataset = ConcatDataset([pos_dataset, neg_dataset])
-
-        # Compute split sizes
-        total_size = len(combined_dataset)
-        train_size = int(self.split_ratios[0] * total_size)
-        dev_size = int(self.split_ratios[1] * total_size)
-        test_size = total_size - train_size - dev_size
-
-        # Train/Dev/Test split
-        self.train_dataset, self.dev_dataset, self.test_dataset = random_split(combined_dataset,
-                                                                               [train_size, dev_size, test_size])
+        # Load (or create once) the Train/Dev/Test split manifest, shared with AudioSetEV_Aug_DataModule
+        splits = load_or_create_splits(self.split_file,
+                                       [(self.pos_file, self.pos_folder, 1), (self.neg_file, self.neg_folder, 0)],
+                                       self.split_ratios,
+                                       self.split_seed)
+
+        # Combine TP and TN datasets (per split)
+        datasets = {}
+        for split in SPLITS:
+            items = splits[splits["split"] == split]
+            pos_dataset = AudioSetEV_Dataset(self.pos_file, self.pos_folder, target_size=self.target_size, binary_label=1,
+                                             telemetry=self.telemetry, filenames=items["path"][items["label"] == 1])
+            neg_dataset = AudioSetEV_Dataset(self.neg_file, self.neg_folder, target_size=self.target_size, binary_label=0,
+                                             telemetry=self.telemetry, filenames=items["path"][items["label"] == 0])
+            datasets[split] = ConcatDataset([pos_dataset, neg_dataset])
+
+        self.train_dataset, self.dev_dataset, self.test_dataset = datasets["train"], datasets["dev"], datasets["test"]
+
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
 
     def train_dataloader(self):
-        return DataLoader(self.train_dataset,
-                          batch_size=self.batch_size,
-                          collate_fn=custom_collate_fn,
-                          shuffle=self.train_shuffle,
-                          num_workers=2)
+        return make_dataloader(self.train_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               shuffle=self.train_shuffle,
+                               **self.loader_kwargs)
 
     def val_dataloader(self):
-        return DataLoader(self.dev_dataset,
-                          batch_size=self.batch_size,
-                          collate_fn=custom_collate_fn,
-                          shuffle=False,
-                          num_workers=2)
+        return make_dataloader(self.dev_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               shuffle=False,
+                               **self.loader_kwargs)
 
     def test_dataloader(self):
-        return DataLoader(self.test_dataset,
-                          batch_size=self.batch_size,
-                          collate_fn=custom_collate_fn,
-                          shuffle=False,
-                          num_workers=2)
+        return make_dataloader(self.test_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               shuffle=False,
+                               **self.loader_kwargs)
 
 
 class AudioSetEV_Aug_DataModule(pl.LightningDataModule):
-    def __init__(self, TP_file, TP_folder, TN_file, TN_folder, batch_size=32, split_ratios=(0.8, 0.1, 0.1), shuffle=True, aug_prob=0.7):
+    def __init__(self, TP_file, TP_folder, TN_file, TN_folder, batch_size=32, split_ratios=(0.8, 0.1, 0.1), shuffle=True, aug_prob=0.7, seed=None,
+                 split_seed=42, split_file=None, loader_kwargs=None, target_size=320000, ring_collate=False):
         super().__init__()
         self.pos_folder = TP_folder
         self.neg_folder = TN_folder
@@ -204,96 +1164,448 @@ class AudioSetEV_Aug_DataModule(pl.LightningDataModule):
         self.split_ratios = split_ratios
         self.train_shuffle = shuffle
         self.aug_prob = aug_prob
+        self.seed = seed
+        self.split_seed = split_seed
+        self.split_file = split_file or default_split_file(TP_file)
+        self.loader_kwargs = loader_kwargs or {}
+
+        # Augmentations are applied per batch, after collation (in the DataLoader workers)
+        self.telemetry = LoaderTelemetry()
+        self.target_size = target_size
+        self.collate_fn = AugmentedCollate(WaveformAugmenter(p=aug_prob, seed=seed),
+                                           collate_fn=fixed_length_collate(target_size, self.loader_kwargs, ring_collate),
+                                           telemetry=self.telemetry)
 
         self.train_dataset = None
         self.dev_dataset = None
         self.test_dataset = None
 
     def setup(self, stage=None):
-        # Load the full datasets for TP and TN
-        pos_dataset = AudioSetEV_Aug_Dataset(self.pos_file, self.pos_folder, binary_label=1, aug_p=self.aug_prob)
-        neg_dataset = AudioSetEV_Aug_Dataset(self.neg_file, self.neg_folder, binary_label=0, aug_p=self.aug_prob)
+        # Load (or create once) the Train/Dev/Test split manifest, shared with AudioSetEV_DataModule
+        splits = load_or_create_splits(self.split_file,
+                                       [(self.pos_file, self.pos_folder, 1), (self.neg_file, self.neg_folder, 0)],
+                                       self.split_ratios,
+                                       self.split_seed)
+
+        # Combine TP and TN datasets (per split)
+        datasets = {}
+        for split in SPLITS:
+            items = splits[splits["split"] == split]
+            pos_dataset = AudioSetEV_Aug_Dataset(self.pos_file, self.pos_folder, self.target_size, binary_label=1, aug_p=self.aug_prob,
+                                                 batch_augment=True, telemetry=self.telemetry,
+                                                 filenames=items["path"][items["label"] == 1])
+            neg_dataset = AudioSetEV_Aug_Dataset(self.neg_file, self.neg_folder, self.target_size, binary_label=0, aug_p=self.aug_prob,
+                                                 batch_augment=True, telemetry=self.telemetry,
+                                                 filenames=items["path"][items["label"] == 0])
+            datasets[split] = ConcatDataset([pos_dataset, neg_dataset])
+
+        self.train_dataset, self.dev_dataset, self.test_dataset = datasets["train"], datasets["dev"], datasets["test"]
+
+    def _loader_generator(self):
+        # Seeds the DataLoader shuffling and its workers base seed (hence the augmentations)
+        return torch.Generator().manual_seed(self.seed) if self.seed is not None else None
+
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
+
+    def train_dataloader(self):
+        return make_dataloader(self.train_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               shuffle=self.train_shuffle,
+                               generator=self._loader_generator(),
+                               **self.loader_kwargs)
+
+    def val_dataloader(self):
+        return make_dataloader(self.dev_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               shuffle=False,
+                               generator=self._loader_generator(),
+                               **self.loader_kwargs)
+
+    def test_dataloader(self):
+        return make_dataloader(self.test_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               shuffle=False,
+                               generator=self._loader_generator(),
+                               **self.loader_kwargs)
+
+
+# AudioSet_EV Streaming (sharded) Datasets --------------------------------------------------------------------------
+SHARDS_INDEX = "index.json"
+SHARD_ARRAYS = ("waveforms", "labels", "lengths")
+PCM_SCALE = 32768.0
+
+
+def shard_array_path(shard_path, name):
+    # Shards are written as one .npy file per array: <shard>_<waveforms|labels|lengths>.npy
+    return f"{shard_path}_{name}.npy"
+
+
+def write_audioset_ev_shards(items, out_dir, target_size=320000, shard_size=64, seed=42, num_threads=None):
+    """
+    Pack AudioSet-EV files into sequentially readable shards, for AudioSetEV_IterableDataset.
+    Each shard is written as uncompressed .npy arrays (memory-mapped when read, so that only the consumed items are
+    paged in): 'waveforms' (N, C, target_size) int16, 'labels' (N,) int64 and 'lengths' (N,) original lengths.
+    Items are shuffled (seeded) before packing, so that each shard mixes both labels.
+
+    :param items: DataFrame with (at least) columns path, label (e.g. a split of load_or_create_splits).
+    :param out_dir: Output folder (an index.json listing shards and their sizes is written as well).
+    :param target_size: Waveforms are padded or truncated to target_size samples.
+    :param shard_size: Number of items per shard (64 x 10 sec. 32 kHz mono items: ~41 MB).
+    :param seed: Items shuffling seed.
+    :param num_threads: Number of decoding threads.
+    :return: List of written shard paths (without the array suffixes, see shard_array_path).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    items = items.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+    def decode(path):
+        try:
+            waveform, _ = load_waveform(path, num_frames=target_size)
+        except Exception as e:
+            print(f"Skipping Error loading {path}: {e}")
+            return None
+        length = min(waveform.size(1), target_size)
+        pcm = np.zeros((waveform.size(0), target_size), dtype=np.int16)
+        pcm[:, :length] = np.clip(waveform[:, :length].numpy() * PCM_SCALE, -PCM_SCALE, PCM_SCALE - 1)
+        return pcm, length
+
+    shards = []
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        for start in range(0, len(items), shard_size):
+            chunk = items.iloc[start:start + shard_size]
+            decoded = list(pool.map(decode, chunk["path"]))
+            valid = [i for i, d in enumerate(decoded) if d is not None]
+            if not valid:
+                continue
+            shard_path = os.path.join(out_dir, f"shard_{len(shards):05d}")
+            arrays = {"waveforms": np.stack([decoded[i][0] for i in valid]),
+                      "labels": chunk["label"].to_numpy(dtype=np.int64)[valid],
+                      "lengths": np.array([decoded[i][1] for i in valid], dtype=np.int64)}
+            for name in SHARD_ARRAYS:
+                np.save(shard_array_path(shard_path, name), arrays[name])
+            shards.append((os.path.basename(shard_path), len(valid)))
+
+    with open(os.path.join(out_dir, SHARDS_INDEX), 'w') as f:
+        json.dump({"target_size": target_size, "format": "npy", "shards": shards}, f, indent=4)
+    return [os.path.join(out_dir, name) for name, _ in shards]
+
+
+class AudioSetEV_IterableDataset(IterableDataset):
+    """
+    Streaming AudioSet-EV dataset over shards written by write_audioset_ev_shards: shards are memory-mapped and
+    read sequentially (instead of per-item random access), and the next shard is read ahead by the kernel.
+    Items (not whole shards) are split across distributed ranks and DataLoader workers, so that every rank serves
+    the same number of items (len(dataset)): with drop_last=False, the last ranks wrap around to the first items
+    (as DistributedSampler).
+    Items are shuffled through a buffer bounded in bytes, and the shards order changes at each epoch: the epoch is
+    shared with the DataLoader workers (see set_epoch), and advanced at each new iteration by EpochDataLoader.
+
+    :param shards_dir: Folder containing the shards and their index.json.
+    :param shuffle: Shuffle shards order and items (within the shuffle buffer).
+    :param shuffle_buffer_bytes: Shuffle buffer size (bytes of float32 waveforms), per DataLoader worker.
+    :param seed: Shuffling seed.
+    :param prefetch: Ask the kernel to read the next shard ahead (posix_fadvise, where available).
+    :param drop_last: Drop the items left over by the equal split across ranks, instead of padding.
+    :param mp_context: Multiprocessing start method of the DataLoaders using it (default: platform default).
+    """
+    def __init__(self, shards_dir, shuffle=True, shuffle_buffer_bytes=128 * 1024 ** 2, seed=42, prefetch=True,
+                 telemetry=None, drop_last=False, mp_context=None):
+        self.shards_dir = os.path.abspath(shards_dir)
+        with open(os.path.join(self.shards_dir, SHARDS_INDEX), 'r') as f:
+            index = json.load(f)
+        self.target_size = index["target_size"]
+        self.shards = [os.path.join(self.shards_dir, name) for name, _ in index["shards"]]
+        self.shard_sizes = [size for _, size in index["shards"]]
+        self.num_items = sum(self.shard_sizes)
+        self.shuffle = shuffle
+        self.shuffle_buffer_bytes = shuffle_buffer_bytes
+        self.seed = seed
+        self.prefetch = prefetch
+        self.telemetry = telemetry
+        self.drop_last = drop_last
+        # Shared with the DataLoader workers, persistent or not (set in the main process, read by the workers)
+        self._epoch = mp.get_context(mp_context).RawValue('q', 0)
+
+    @property
+    def epoch(self):
+        return self._epoch.value
+
+    def set_epoch(self, epoch):
+        self._epoch.value = epoch
+
+    @staticmethod
+    def _rank():
+        if dist.is_available() and dist.is_initialized():
+            return dist.get_rank(), dist.get_world_size()
+        return 0, 1
+
+    def _rank_size(self, world_size):
+        return self.num_items // world_size if self.drop_last else -(-self.num_items // world_size)
+
+    def __len__(self):
+        # Items served by this rank (across its workers), the same for all ranks
+        return self._rank_size(self._rank()[1])
+
+    def _partition(self):
+        """Global item positions [start, stop) served by this worker (of this rank)."""
+        rank, world_size = self._rank()
+        worker_info = torch.utils.data.get_worker_info()
+        worker_id, num_workers = (worker_info.id, worker_info.num_workers) if worker_info is not None else (0, 1)
+        rank_size = self._rank_size(world_size)
+        start = rank * rank_size
+        return start + rank_size * worker_id // num_workers, start + rank_size * (worker_id + 1) // num_workers
+
+    @staticmethod
+    def _segments(shards, sizes, start, stop):
+        """(shard, first item, last item + 1) segments of the global item positions [start, stop), wrapping around."""
+        total = sum(sizes)
+        offsets = np.cumsum([0] + list(sizes))
+        segments = []
+        while total and start < stop:
+            position = start % total
+            i = int(np.searchsorted(offsets, position, side='right')) - 1
+            first = position - int(offsets[i])
+            count = min(sizes[i] - first, stop - start)
+            segments.append((shards[i], first, first + count))
+            start += count
+        return segments
+
+    def load_shard(self, shard_path):
+        """Memory-mapped shard arrays (waveforms, labels); legacy .npz shards are loaded at once."""
+        if shard_path.endswith(".npz"):
+            with np.load(shard_path) as shard:
+                return shard["waveforms"], shard["labels"]
+        return (np.load(shard_array_path(shard_path, "waveforms"), mmap_mode='r'),
+                np.load(shard_array_path(shard_path, "labels"), mmap_mode='r'))
+
+    @staticmethod
+    def _read_ahead(shard_path):
+        # Asynchronous kernel read-ahead (page cache, i.e. no process memory)
+        if not hasattr(os, "posix_fadvise") or shard_path.endswith(".npz"):
+            return
+        try:
+            fd = os.open(shard_array_path(shard_path, "waveforms"), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    def iter_shards(self, segments):
+        """(waveforms, labels) of each (shard, first, last) segment, read from the memory-mapped shards."""
+        for i, (shard_path, first, last) in enumerate(segments):
+            if self.prefetch and i + 1 < len(segments) and segments[i + 1][0] != shard_path:
+                self._read_ahead(segments[i + 1][0])
+            start = time.perf_counter()
+            waveforms, labels = self.load_shard(shard_path)
+            waveforms, labels = np.array(waveforms[first:last]), np.array(labels[first:last])
+            if self.telemetry is not None:
+                self.telemetry.observe("decode", time.perf_counter() - start)
+            yield waveforms, labels
+
+    def process(self, waveform, label):
+        return waveform, label
+
+    def __iter__(self):
+        epoch = self.epoch
+        order = list(range(len(self.shards)))
+        if self.shuffle:
+            random.Random(self.seed + epoch).shuffle(order)  # same order in all workers/ranks
+        start, stop = self._partition()
+        segments = self._segments([self.shards[i] for i in order], [self.shard_sizes[i] for i in order], start, stop)
+
+        worker_info = torch.utils.data.get_worker_info()
+        rng = random.Random(f"{self.seed}-{epoch}-{start}-{worker_info.seed if worker_info else 0}")
+        buffer, capacity = [], None
+        for waveforms, labels in self.iter_shards(segments):
+            for pcm, label in zip(waveforms, labels):
+                waveform = torch.from_numpy(pcm.astype(np.float32)).mul_(1.0 / PCM_SCALE)
+                item = self.process(waveform, int(label))
+                if self.telemetry is not None:
+                    self.telemetry.count("items")
+                if not self.shuffle:
+                    yield item
+                    continue
+                # Shuffle buffer bounded in bytes: yield a random buffered item once full
+                if capacity is None:
+                    capacity = max(1, self.shuffle_buffer_bytes // (waveform.numel() * waveform.element_size()))
+                if len(buffer) < capacity:
+                    buffer.append(item)
+                    continue
+                idx = rng.randrange(len(buffer))
+                buffer[idx], item = item, buffer[idx]
+                yield item
+
+        rng.shuffle(buffer)
+        yield from buffer
+
+
+class EpochDataLoader(DataLoader):
+    """
+    DataLoader advancing its dataset epoch (set_epoch, in the main process) at each new iteration but the first:
+    workers see the new epoch whether they are persistent or re-spawned at each epoch.
+    """
+    _iterated = False
+
+    def __iter__(self):
+        if self._iterated:
+            self.dataset.set_epoch(self.dataset.epoch + 1)
+        self._iterated = True
+        return super().__iter__()
+
+
+class AudioSetEV_Aug_IterableDataset(AudioSetEV_IterableDataset):
+    """
+    Streaming AudioSet-EV dataset with waveform augmentations (see AudioSetEV_Aug_Dataset and AugmentedCollate).
+    """
+    def __init__(self, shards_dir, shuffle=True, shuffle_buffer_bytes=128 * 1024 ** 2, seed=42, prefetch=True,
+                 telemetry=None, drop_last=False, mp_context=None, aug_p=0.7, batch_augment=False):
+        super().__init__(shards_dir, shuffle, shuffle_buffer_bytes, seed, prefetch, telemetry, drop_last, mp_context)
+        self.augment_p = aug_p
+        self.batch_augment = batch_augment
+        self.augmenter = WaveformAugmenter(p=aug_p, seed=seed)
+
+    def process(self, waveform, label):
+        if not self.batch_augment:
+            waveforms, applied = self.augmenter(waveform.unsqueeze(0))
+            if self.telemetry is not None:
+                self.telemetry.count_augmentations(applied)
+            waveform = waveforms.squeeze(0)
+        return waveform, label
+
+
+class AudioSetEV_Shards_DataModule(pl.LightningDataModule):
+    """
+    AudioSet-EV DataModule streaming from <shards_root>/{train,dev,test} shards folders
+    (see pack_audioset_ev_splits). If aug_prob is given, training batches are augmented after collation.
+    """
+    def __init__(self, shards_root, batch_size=32, shuffle_buffer_bytes=128 * 1024 ** 2, seed=42, aug_prob=None,
+                 loader_kwargs=None, ring_collate=False):
+        super().__init__()
+        self.shards_root = shards_root
+        self.batch_size = batch_size
+        self.shuffle_buffer_bytes = shuffle_buffer_bytes
+        self.seed = seed
+        self.aug_prob = aug_prob
+        self.loader_kwargs = loader_kwargs or {}
+        self.ring_collate = ring_collate
 
-        # Combine datasets
-        combined_dataset = ConcatDataset([pos_dataset, neg_dataset])
+        self.telemetry = LoaderTelemetry()
+        self.collate_fn = None
+        self.train_collate_fn = None
 
-        # Compute split sizes
-        total_size = len(combined_dataset)
-        train_size = int(self.split_ratios[0] * total_size)
-        dev_size = int(self.split_ratios[1] * total_size)
-        test_size = total_size - train_size - dev_size
+        self.train_dataset = None
+        self.dev_dataset = None
+        self.test_dataset = None
 
-        # Train/Dev/Test split
-        self.train_dataset, self.dev_dataset, self.test_dataset = random_split(combined_dataset, 
-                                                                               [train_size, dev_size, test_size])
+    def setup(self, stage=None):
+        self.train_dataset = AudioSetEV_IterableDataset(os.path.join(self.shards_root, "train"), shuffle=True,
+                                                        shuffle_buffer_bytes=self.shuffle_buffer_bytes, seed=self.seed,
+                                                        telemetry=self.telemetry,
+                                                        mp_context=self.loader_kwargs.get("multiprocessing_context"))
+        self.dev_dataset = AudioSetEV_IterableDataset(os.path.join(self.shards_root, "dev"), shuffle=False,
+                                                      telemetry=self.telemetry)
+        self.test_dataset = AudioSetEV_IterableDataset(os.path.join(self.shards_root, "test"), shuffle=False,
+                                                       telemetry=self.telemetry)
+
+        # Shards waveforms all have the same (packing) length
+        self.collate_fn = fixed_length_collate(self.train_dataset.target_size, self.loader_kwargs, self.ring_collate)
+        self.train_collate_fn = self.collate_fn
+        if self.aug_prob is not None:
+            self.train_collate_fn = AugmentedCollate(WaveformAugmenter(p=self.aug_prob, seed=self.seed),
+                                                     collate_fn=self.collate_fn, telemetry=self.telemetry)
+
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
 
     def train_dataloader(self):
-        return DataLoader(self.train_dataset,
-                          batch_size=self.batch_size,
-                          collate_fn=custom_collate_fn,
-                          shuffle=self.train_shuffle,
-                          num_workers=2)
+        # Reloaded train loaders (reload_dataloaders_every_n_epochs) restart from the current epoch shards order,
+        # then the epoch is advanced at each iteration of the loader
+        self.train_dataset.set_epoch(self.trainer.current_epoch if self.trainer is not None else 0)
+        return make_dataloader(self.train_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.train_collate_fn,
+                               loader_class=EpochDataLoader,
+                               **self.loader_kwargs)
 
     def val_dataloader(self):
-        return DataLoader(self.dev_dataset,
-                          batch_size=self.batch_size,
-                          collate_fn=custom_collate_fn,
-                          shuffle=False,
-                          num_workers=2)
+        return make_dataloader(self.dev_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               **self.loader_kwargs)
 
     def test_dataloader(self):
-        return DataLoader(self.test_dataset,
-                          batch_size=self.batch_size,
-                          collate_fn=custom_collate_fn,
-                          shuffle=False,
-                          num_workers=2)
+        return make_dataloader(self.test_dataset,
+                               batch_size=self.batch_size,
+                               collate_fn=self.collate_fn,
+                               **self.loader_kwargs)
+
+
+def pack_audioset_ev_splits(split_file, out_root, target_size=320000, shard_size=64, seed=42):
+    """
+    Pack each split of an AudioSet-EV split manifest (see load_or_create_splits) into <out_root>/<split>/ shards.
+    """
+    with open(split_file, 'r') as f:
+        splits = pd.DataFrame(json.load(f)["items"])
+    for split in SPLITS:
+        shards = write_audioset_ev_shards(splits[splits["split"] == split], os.path.join(out_root, split),
+                                          target_size=target_size, shard_size=shard_size, seed=seed)
+        print(f"{split}: {len(shards)} shards written to {os.path.join(out_root, split)}")
 
 
 # ESC-50 Dataset ------------------------------------------------------------------------------------------------
-class ESC50_TestDataset(Dataset):
-    def __init__(self, file_path, folder_path, target_size=160000, target_sr=32000):
+class ESC50_TestDataset(ManifestMixin, Dataset):
+    def __init__(self, file_path, folder_path, target_size=160000, target_sr=32000, telemetry=None):
         self.cwd = os.getcwd()
         self.file_path = os.path.abspath(os.path.join(self.cwd, file_path))
         self.folder_path = os.path.abspath(os.path.join(self.cwd, folder_path))
         self.target_size = target_size
         self.target_sr = target_sr
-        self.filenames, self.labels = self.filter_filenames()
-        self.skipped_files = []
+        self.filenames, self.labels, self.folds = self.filter_filenames()
+        self.skipped_files = deque(maxlen=MAX_SKIPPED_FILES)
+        self.telemetry = telemetry
 
     def __len__(self):
         return len(self.filenames)
 
     def filter_filenames(self):
-        df = pd.read_csv(self.file_path)
+        df = pd.read_csv(self.file_path, usecols=["filename", "fold", "category"])
 
-        # Filter relevant categories and assign binary labels
+        # Filter relevant categories and assign binary labels (siren: 1, others: 0)
         relevant_labels = ["siren", "helicopter", "chainsaw", "car_horn", "engine", "train", "church_bells", "airplane", "clock_alarm"]
-        siren_label = 1
-        other_labels = 0
-        filenames = []
-        labels = []
+        df = df[df["category"].isin(relevant_labels)]
+        filenames = (self.folder_path + os.sep + "fold_" + df["fold"].astype(str) + os.sep + df["filename"]).tolist()
+        labels = (df["category"] == "siren").astype(int).tolist()
+
+        return filenames, labels, df["fold"].to_numpy()
 
-        for _, row in df.iterrows():
-            if row["category"] == "siren":
-                filenames.append(os.path.join(self.folder_path, f"fold_{row['fold']}", row["filename"]))
-                labels.append(siren_label)
-            elif row["category"] in relevant_labels:
-                filenames.append(os.path.join(self.folder_path, f"fold_{row['fold']}", row["filename"]))
-                labels.append(other_labels)
+    def fold_indices(self):
+        """
+        :return: dict {fold: dataset indices array}
+        """
+        return {fold: indices.to_numpy() for fold, indices in pd.Series(np.arange(len(self.folds))).groupby(self.folds)}
 
-        return filenames, labels
+    def manifest_items(self):
+        return self.filenames, self.labels
+
+    def output_length(self, sample_rate, frames):
+        return self.target_size
 
     def __getitem__(self, idx):
         file_path = self.filenames[idx]
         label = self.labels[idx]
 
         try:
-            waveform, sr = torchaudio.load(file_path)
-
-            # Resample to target sample rate if necessary
-            if sr != self.target_sr:
-                resampler = torchaudio.transforms.Resample(orig_freq=sr, new_freq=self.target_sr)
-                waveform = resampler(waveform)
+            # Load & resample to target sample rate if necessary
+            waveform, _ = load_waveform(file_path, self.target_sr, telemetry=self.telemetry,
+                                        num_frames=self.target_size)
 
             # Pad or truncate waveform to target_size
             current_size = waveform.size(1)
@@ -304,46 +1616,63 @@ class ESC50_TestDataset(Dataset):
                 waveform = waveform[:, :self.target_size]
         except Exception as e:
             self.skipped_files.append((idx, file_path))
+            if self.telemetry is not None:
+                self.telemetry.count("load_failures")
             print(f"Skipping Error loading {file_path}: {e}")
             return None
+        if self.telemetry is not None:
+            self.telemetry.count("items")
 
         return waveform, label
 
 
 class ESC50_DataModule(pl.LightningDataModule):
-    def __init__(self, file_path, folder_path, target_size=160000, target_sr=32000, batch_size=32):
+    def __init__(self, file_path, folder_path, target_size=160000, target_sr=32000, batch_size=32, loader_kwargs=None,
+                 ring_collate=False):
         super().__init__()
         self.file_path = file_path
         self.folder_path = folder_path
         self.target_size = target_size
         self.target_sr = target_sr
         self.batch_size = batch_size
+        # One loader per fold, each iterated once: persistent workers would only pile up idle processes
+        self.loader_kwargs = {"persistent_workers": False, **(loader_kwargs or {})}
+        self.collate_fn = fixed_length_collate(target_size, self.loader_kwargs, ring_collate)
+        self.telemetry = LoaderTelemetry()
 
     def setup(self, stage=None):
         self.dataset = ESC50_TestDataset(file_path=self.file_path,
                                          folder_path=self.folder_path,
                                          target_size=self.target_size,
-                                         target_sr=self.target_sr)
+                                         target_sr=self.target_sr,
+                                         telemetry=self.telemetry)
+        warm_resamplers(self.dataset.sample_rates(), self.target_sr)
 
         # Prepare dataloaders for all folds
         self.test_loaders = {}
+        fold_indices = self.dataset.fold_indices()
         for fold in range(1, 6):
-            fold_indices = [i for i, file in enumerate(self.dataset.filenames) if f"fold_{fold}" in file]
-            fold_subset = torch.utils.data.Subset(self.dataset, fold_indices)
-            self.test_loaders[f"fold_{fold}"] = DataLoader(fold_subset, batch_size=self.batch_size, shuffle=False, num_workers=2)
+            fold_subset = torch.utils.data.Subset(self.dataset, fold_indices.get(fold, np.empty(0, dtype=np.int64)).tolist())
+            self.test_loaders[f"fold_{fold}"] = make_dataloader(fold_subset, batch_size=self.batch_size, shuffle=False,
+                                                                collate_fn=self.collate_fn, **self.loader_kwargs)
+
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
 
     def test_dataloader(self):
         return list(self.test_loaders.values())
 
 
 # sireNNet Dataset ------------------------------------------------------------------------------------------------
-class sireNNet_TestDataset(Dataset):
-    def __init__(self, folder_path, target_size=96000, target_sr=32000):
+class sireNNet_TestDataset(ManifestMixin, Dataset):
+    def __init__(self, folder_path, target_size=96000, target_sr=32000, telemetry=None):
         self.folder_path = os.path.abspath(folder_path)
         self.target_size = target_size
         self.target_sr = target_sr
         self.file_paths, self.labels = self._load_files()
-        self.skipped_files = []
+        self.skipped_files = deque(maxlen=MAX_SKIPPED_FILES)
+        self.telemetry = telemetry
 
     def __len__(self):
         return len(self.file_paths)
@@ -366,17 +1695,20 @@ class sireNNet_TestDataset(Dataset):
 
         return file_paths, labels
 
+    def manifest_items(self):
+        return self.file_paths, self.labels
+
+    def output_length(self, sample_rate, frames):
+        return self.target_size
+
     def __getitem__(self, idx):
         file_path = self.file_paths[idx]
         label = self.labels[idx]
 
         try:
-            waveform, sr = torchaudio.load(file_path)
-
-            # Resample to target_sr if necessary
-            if sr != self.target_sr:
-                resampler = torchaudio.transforms.Resample(orig_freq=sr, new_freq=self.target_sr)
-                waveform = resampler(waveform)
+            # Load & resample to target_sr if necessary
+            waveform, _ = load_waveform(file_path, self.target_sr, telemetry=self.telemetry,
+                                        num_frames=self.target_size)
 
             # Pad or truncate waveform to target_size
             current_size = waveform.size(1)
@@ -387,68 +1719,104 @@ class sireNNet_TestDataset(Dataset):
                 waveform = waveform[:, :self.target_size]
         except Exception as e:
             self.skipped_files.append((idx, file_path))
+            if self.telemetry is not None:
+                self.telemetry.count("load_failures")
             print(f"Skipping Error loading {file_path}: {e}")
             return None
+        if self.telemetry is not None:
+            self.telemetry.count("items")
 
         return waveform, label
 
 
+def nested_balanced_order(labels, seed=42):
+    """
+    Single seeded permutation of a binary-labelled dataset, alternating positives and negatives: every even-length
+    prefix is a balanced random subset, and smaller subsets are prefixes (i.e. nested into) larger ones.
+
+    :return: indices array of length 2 * min(positives, negatives)
+    """
+    labels = np.asarray(labels)
+    rng = np.random.default_rng(seed)
+    indices_1s = rng.permutation(np.flatnonzero(labels == 1))
+    indices_0s = rng.permutation(np.flatnonzero(labels == 0))
+
+    num_pairs = min(len(indices_1s), len(indices_0s))
+    order = np.empty(2 * num_pairs, dtype=np.int64)
+    order[0::2] = indices_1s[:num_pairs]
+    order[1::2] = indices_0s[:num_pairs]
+    return order
+
+
 class sireNNet_DataModule(pl.LightningDataModule):
-    def __init__(self, folder_path, batch_size=32, target_size=96000, target_sr=32000):
+    def __init__(self, folder_path, batch_size=32, target_size=96000, target_sr=32000, seed=42, loader_kwargs=None,
+                 ring_collate=False):
         super().__init__()
         self.folder_path = folder_path
         self.batch_size = batch_size
         self.target_size = target_size
         self.target_sr = target_sr
+        self.seed = seed
+        # One loader per subset, each iterated once: persistent workers would only pile up idle processes
+        self.loader_kwargs = {"persistent_workers": False, **(loader_kwargs or {})}
+        self.collate_fn = fixed_length_collate(target_size, self.loader_kwargs, ring_collate)
 
-        # Sizes for multiple random balanced subsets (fractions of the dataset)
+        # Sizes for multiple (nested) random balanced subsets (fractions of the dataset)
         self.sizes = [0.0025, 0.005, 0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, 1.0]
+        self.telemetry = LoaderTelemetry()
+        self.subset_order = None
 
     def setup(self, stage=None):
         self.dataset = sireNNet_TestDataset(folder_path=self.folder_path,
                                             target_size=self.target_size,
-                                            target_sr=self.target_sr)
+                                            target_sr=self.target_sr,
+                                            telemetry=self.telemetry)
+        warm_resamplers(self.dataset.sample_rates(), self.target_sr)
+        # All the subsets are prefixes of a single (seeded) balanced permutation
+        self.subset_order = nested_balanced_order(self.dataset.labels, self.seed)
 
-    def get_balanced_subset(self, fraction):
-        # Find indices of positive (1) and negative (0) samples
-        indices_1s = [i for i, label in enumerate(self.dataset.labels) if label == 1]
-        indices_0s = [i for i, label in enumerate(self.dataset.labels) if label == 0]
-
-        # Determine the number of samples per class for the given fraction
-        num_samples_per_class = int(len(self.dataset) * fraction // 2)
-
-        # Shuffle and select the required number of samples
-        random.shuffle(indices_1s)
-        random.shuffle(indices_0s)
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
 
-        selected_indices_1s = indices_1s[:num_samples_per_class]
-        selected_indices_0s = indices_0s[:num_samples_per_class]
+    def subset_size(self, fraction):
+        # Samples per class for the given fraction (capped by the minority class)
+        num_samples_per_class = min(int(len(self.dataset) * fraction // 2), len(self.subset_order) // 2)
+        return 2 * num_samples_per_class
 
-        # Combine and shuffle the selected indices
-        balanced_indices = selected_indices_1s + selected_indices_0s
-        random.shuffle(balanced_indices)
-
-        # Create a subset
-        return Subset(self.dataset, balanced_indices)
+    def get_balanced_subset(self, fraction):
+        return Subset(self.dataset, self.subset_order[:self.subset_size(fraction)].tolist())
 
     def test_dataloader(self):
         dataloaders = []
         for fraction in self.sizes:
             subset = self.get_balanced_subset(fraction)
-            loader = DataLoader(subset, batch_size=self.batch_size, shuffle=True, num_workers=2)
+            loader = make_dataloader(subset, batch_size=self.batch_size, shuffle=False, collate_fn=self.collate_fn,
+                                     **self.loader_kwargs)
             dataloaders.append(loader)
 
         return dataloaders
 
+    def prefix_dataloader(self):
+        """
+        Single loader over the largest subset: every other subset is one of its prefixes (of subset_size(fraction)
+        items), so that all the fractions can be evaluated at once, decoding each file once.
+        """
+        subset = self.get_balanced_subset(max(self.sizes))
+        return make_dataloader(subset, batch_size=self.batch_size, shuffle=False, collate_fn=self.collate_fn,
+                               **self.loader_kwargs)
+
 
 # LSSiren Dataset ------------------------------------------------------------------------------------------------
-class LSSiren_TestDataset(Dataset):
-    def __init__(self, folder_path, target_sr=32000, min_length=32000):
+class LSSiren_TestDataset(ManifestMixin, Dataset):
+    def __init__(self, folder_path, target_sr=32000, min_length=32000, telemetry=None, cache=None):
         self.folder_path = os.path.abspath(folder_path)
         self.target_sr = target_sr
         self.min_length = min_length
         self.file_paths, self.labels = self._load_files()
-        self.skipped_files = []
+        self.skipped_files = deque(maxlen=MAX_SKIPPED_FILES)
+        self.telemetry = telemetry
+        self.cache = cache
 
     def _load_files(self):
         labels_map = {"Ambulance_data": 1, "Road_Noises": 0}
@@ -465,6 +1833,12 @@ class LSSiren_TestDataset(Dataset):
 
         return file_paths, labels
 
+    def manifest_items(self):
+        return self.file_paths, self.labels
+
+    def output_length(self, sample_rate, frames):
+        return max(self.min_length, resampled_length(frames, sample_rate, self.target_sr))
+
     def __len__(self):
         return len(self.file_paths)
 
@@ -473,16 +1847,8 @@ class LSSiren_TestDataset(Dataset):
         label = self.labels[idx]
 
         try:
-            waveform, sr = torchaudio.load(file_path)
-
-            # Stereo 2 mono: sum channels and normalize
-            if waveform.size(0) > 1:  # More than 1 channel (stereo)
-                waveform = waveform.mean(dim=0, keepdim=True)
-
-            # Resample to target sample rate if necessary
-            if sr != self.target_sr:
-                resampler = torchaudio.transforms.Resample(orig_freq=sr, new_freq=self.target_sr)
-                waveform = resampler(waveform)
+            # Load, stereo 2 mono & resample to target sample rate if necessary
+            waveform, _ = load_waveform(file_path, self.target_sr, mono=True, telemetry=self.telemetry, cache=self.cache)
 
             # Zero-pad if waveform is shorter than 1 second
             current_size = waveform.size(1)
@@ -493,8 +1859,12 @@ class LSSiren_TestDataset(Dataset):
         except Exception as e:
             # Log and skip problematic files
             self.skipped_files.append((idx, file_path))
+            if self.telemetry is not None:
+                self.telemetry.count("load_failures")
             print(f"Skipping Error loading {file_path}: {e}")
             return None
+        if self.telemetry is not None:
+            self.telemetry.count("items")
 
         return waveform, label
 
@@ -521,53 +1891,85 @@ def lssiren_custom_collate_fn(batch):
 
 
 class LSSiren_DataModule(pl.LightningDataModule):
-    def __init__(self, folder_path, batch_size=32, target_sr=32000, min_length=32000):
+    def __init__(self, folder_path, batch_size=32, target_sr=32000, min_length=32000, bucketing=False, max_batch_samples=None,
+                 loader_kwargs=None, audio_cache=None):
         super().__init__()
         self.folder_path = folder_path
         self.batch_size = batch_size
         self.target_sr = target_sr
         self.min_length = min_length
+        self.bucketing = bucketing
+        self.max_batch_samples = max_batch_samples
+        self.loader_kwargs = loader_kwargs or {}
+        self.telemetry = LoaderTelemetry()
+        # Decoded audio cache (True for a default DecodedAudioCache), e.g. shared by several checkpoints evaluations
+        self.audio_cache = DecodedAudioCache() if audio_cache is True else audio_cache
 
     def setup(self, stage=None):
         self.dataset = LSSiren_TestDataset(folder_path=self.folder_path,
                                            target_sr=self.target_sr,
-                                           min_length=self.min_length)
+                                           min_length=self.min_length,
+                                           telemetry=self.telemetry,
+                                           cache=self.audio_cache)
+        warm_resamplers(self.dataset.sample_rates(), self.target_sr)
+
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
 
     def test_dataloader(self):
-        return DataLoader(self.dataset, batch_size=self.batch_size, shuffle=False, num_workers=2, collate_fn=lssiren_custom_collate_fn)
+        if self.bucketing:
+            # Group clips of similar duration to minimize zero-padding
+            batch_sampler = BucketBatchSampler(self.dataset.item_lengths(), self.batch_size, self.max_batch_samples)
+            return make_dataloader(self.dataset, batch_sampler=batch_sampler, collate_fn=lssiren_custom_collate_fn,
+                                   **self.loader_kwargs)
+
+        return make_dataloader(self.dataset, batch_size=self.batch_size, shuffle=False, collate_fn=lssiren_custom_collate_fn,
+                               **self.loader_kwargs)
 
 
 # UrbanSound8K Dataset ------------------------------------------------------------------------------------------------
-class UrbanSound8K_TestDataset(Dataset):
-    def __init__(self, folder_path, metadata_path, target_sr=32000, min_length=32000, fold=None):
+def read_urbansound8k_metadata(metadata_path):
+    return pd.read_csv(metadata_path, usecols=["slice_file_name", "fold", "class"])
+
+
+class UrbanSound8K_TestDataset(ManifestMixin, Dataset):
+    """
+    :param metadata: Already loaded (see read_urbansound8k_metadata) metadata DataFrame, e.g. shared by the
+                     per-fold datasets of a DataModule, instead of re-reading metadata_path.
+    """
+    def __init__(self, folder_path, metadata_path, target_sr=32000, min_length=32000, fold=None, telemetry=None,
+                 metadata=None):
         self.folder_path = os.path.abspath(folder_path)
         self.metadata_path = os.path.abspath(metadata_path)
         self.target_sr = target_sr
         self.min_length = min_length
         self.fold = fold
-        self.file_paths, self.labels = self._load_files()
-        self.skipped_files = []
+        self.file_paths, self.labels = self._load_files(metadata)
+        self.skipped_files = deque(maxlen=MAX_SKIPPED_FILES)
+        self.telemetry = telemetry
 
-    def _load_files(self):
+    def _load_files(self, metadata=None):
         # Load metadata CSV
-        metadata = pd.read_csv(self.metadata_path)
+        if metadata is None:
+            metadata = read_urbansound8k_metadata(self.metadata_path)
 
         # Filter by fold if specified
         if self.fold is not None:
             metadata = metadata[metadata["fold"] == self.fold]
 
-        # Assign labels
-        file_paths = []
-        labels = []
-
-        for _, row in metadata.iterrows():
-            file_path = os.path.join(self.folder_path, f"fold{row['fold']}", row["slice_file_name"])
-            label = 1 if row["class"] == "siren" else 0
-            file_paths.append(file_path)
-            labels.append(label)
+        # Assign labels (siren: 1, others: 0)
+        file_paths = (self.folder_path + os.sep + "fold" + metadata["fold"].astype(str) + os.sep + metadata["slice_file_name"]).tolist()
+        labels = (metadata["class"] == "siren").astype(int).tolist()
 
         return file_paths, labels
 
+    def manifest_items(self):
+        return self.file_paths, self.labels
+
+    def output_length(self, sample_rate, frames):
+        return max(self.min_length, resampled_length(frames, sample_rate, self.target_sr))
+
     def __len__(self):
         return len(self.file_paths)
 
@@ -576,16 +1978,8 @@ class UrbanSound8K_TestDataset(Dataset):
         label = self.labels[idx]
 
         try:
-            waveform, sr = torchaudio.load(file_path)
-
-            # Stereo to mono: Sum channels and normalize
-            if waveform.size(0) > 1:
-                waveform = waveform.mean(dim=0, keepdim=True)
-
-            # Resample to target sample rate if necessary
-            if sr != self.target_sr:
-                resampler = torchaudio.transforms.Resample(orig_freq=sr, new_freq=self.target_sr)
-                waveform = resampler(waveform)
+            # Load, stereo to mono & resample to target sample rate if necessary
+            waveform, _ = load_waveform(file_path, self.target_sr, mono=True, telemetry=self.telemetry)
 
             # Zero-pad if waveform is shorter than 1 second
             current_size = waveform.size(1)
@@ -595,8 +1989,12 @@ class UrbanSound8K_TestDataset(Dataset):
 
         except Exception as e:
             self.skipped_files.append((idx, file_path))
+            if self.telemetry is not None:
+                self.telemetry.count("load_failures")
             print(f"Skipping Error loading {file_path}: {e}")
             return None
+        if self.telemetry is not None:
+            self.telemetry.count("items")
 
         return waveform, label
 
@@ -622,26 +2020,51 @@ def urbansound8k_collate_fn(batch):
 
 
 class UrbanSound8K_DataModule(pl.LightningDataModule):
-    def __init__(self, folder_path, metadata_path, batch_size=32, target_sr=32000, min_length=32000):
+    def __init__(self, folder_path, metadata_path, batch_size=32, target_sr=32000, min_length=32000, bucketing=False,
+                 max_batch_samples=None, loader_kwargs=None):
         super().__init__()
         self.folder_path = folder_path
         self.metadata_path = metadata_path
         self.batch_size = batch_size
         self.target_sr = target_sr
         self.min_length = min_length
+        self.bucketing = bucketing
+        self.max_batch_samples = max_batch_samples
+        # One loader per fold, each iterated once: persistent workers would only pile up idle processes
+        self.loader_kwargs = {"persistent_workers": False, **(loader_kwargs or {})}
+        self.telemetry = LoaderTelemetry()
 
     def setup(self):
+        # Read the metadata once, and split it by fold
+        metadata = read_urbansound8k_metadata(self.metadata_path)
+        folds = dict(tuple(metadata.groupby("fold")))
         self.datasets = {fold: UrbanSound8K_TestDataset(folder_path=self.folder_path,
                                                         metadata_path=self.metadata_path,
                                                         target_sr=self.target_sr,
                                                         min_length=self.min_length,
-                                                        fold=fold) for fold in range(1, 11)}
-        
-        self.test_loaders = {fold: DataLoader(dataset,
-                                         batch_size=self.batch_size,
-                                         shuffle=False,
-                                         num_workers=2,
-                                         collate_fn=urbansound8k_collate_fn) for fold, dataset in self.datasets.items()}
+                                                        fold=fold,
+                                                        telemetry=self.telemetry,
+                                                        metadata=folds.get(fold, metadata.iloc[:0])) for fold in range(1, 11)}
+        warm_resamplers([sr for dataset in self.datasets.values() for sr in dataset.sample_rates()], self.target_sr)
+
+        if self.bucketing:
+            # Group clips of similar duration to minimize zero-padding
+            self.test_loaders = {fold: make_dataloader(dataset,
+                                                       batch_sampler=BucketBatchSampler(dataset.item_lengths(),
+                                                                                        self.batch_size,
+                                                                                        self.max_batch_samples),
+                                                       collate_fn=urbansound8k_collate_fn,
+                                                       **self.loader_kwargs) for fold, dataset in self.datasets.items()}
+        else:
+            self.test_loaders = {fold: make_dataloader(dataset,
+                                                       batch_size=self.batch_size,
+                                                       shuffle=False,
+                                                       collate_fn=urbansound8k_collate_fn,
+                                                       **self.loader_kwargs) for fold, dataset in self.datasets.items()}
+
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
 
     def test_dataloaders(self):
         return list(self.test_loaders.values())
@@ -661,50 +2084,81 @@ def fsd50k_collate_fn(batch):
     return padded_waveforms, labels
 
 
-class FSD50K_TestDataset(Dataset):
-    def __init__(self, csv_file, folder_path, target_sr=16000, label=1):
+class FSD50K_TestDataset(ManifestMixin, Dataset):
+    def __init__(self, csv_file, folder_path, target_sr=16000, label=1, telemetry=None, cache=None):
         self.folder_path = os.path.abspath(folder_path)
         self.data = pd.read_csv(csv_file)
+        self.file_paths = [os.path.join(self.folder_path, f"{fname}.wav") for fname in self.data.iloc[:, 0]]
         self.target_sr = target_sr
         self.label = label
-        self.skipped_files = []
-        self.resampler = torchaudio.transforms.Resample(orig_freq=44100, new_freq=self.target_sr)  # Will set dynamically
+        self.skipped_files = deque(maxlen=MAX_SKIPPED_FILES)
+        self.telemetry = telemetry
+        self.cache = cache
     
     def __len__(self):
         return len(self.data)
+
+    def manifest_items(self):
+        return self.file_paths, [self.label] * len(self.file_paths)
+
+    def output_length(self, sample_rate, frames):
+        return resampled_length(frames, sample_rate, self.target_sr)
     
     def __getitem__(self, idx):
-        file_name = str(self.data.iloc[idx, 0]) + ".wav"
-        file_path = os.path.join(self.folder_path, file_name)
+        file_path = self.file_paths[idx]
         
         try:
-            waveform, sample_rate = torchaudio.load(file_path)
-            if sample_rate != self.target_sr:
-                self.resampler.orig_freq = sample_rate
-                waveform = self.resampler(waveform)
+            waveform, _ = load_waveform(file_path, self.target_sr, telemetry=self.telemetry, cache=self.cache)
         except Exception as e:
             self.skipped_files.append((idx, file_path))
+            if self.telemetry is not None:
+                self.telemetry.count("load_failures")
             print(f"Skipping file {file_path} due to error: {e}")
             return None
+        if self.telemetry is not None:
+            self.telemetry.count("items")
         
         return waveform, self.label
 
 
 class FSD50K_DataModule(pl.LightningDataModule):
-    def __init__(self, pos_file, neg_file, folder_path, batch_size=32, target_sr=16000):
+    def __init__(self, pos_file, neg_file, folder_path, batch_size=32, target_sr=16000, bucketing=False, max_batch_samples=None,
+                 loader_kwargs=None, audio_cache=None):
         super().__init__()
         self.pos_csv = pos_file
         self.neg_csv = neg_file
         self.folder_path = folder_path
         self.batch_size = batch_size
         self.target_sr = target_sr
+        self.bucketing = bucketing
+        self.max_batch_samples = max_batch_samples
+        self.loader_kwargs = loader_kwargs or {}
+        self.telemetry = LoaderTelemetry()
+        # Decoded audio cache (True for a default DecodedAudioCache), e.g. shared by several checkpoints evaluations
+        self.audio_cache = DecodedAudioCache() if audio_cache is True else audio_cache
         self.test_dataset = None
     
     def setup(self, stage=None):
-        pos_dataset = FSD50K_TestDataset(self.pos_csv, self.folder_path, target_sr=self.target_sr, label=1)
-        neg_dataset = FSD50K_TestDataset(self.neg_csv, self.folder_path, target_sr=self.target_sr, label=0)
-        
+        pos_dataset = FSD50K_TestDataset(self.pos_csv, self.folder_path, target_sr=self.target_sr, label=1,
+                                         telemetry=self.telemetry, cache=self.audio_cache)
+        neg_dataset = FSD50K_TestDataset(self.neg_csv, self.folder_path, target_sr=self.target_sr, label=0,
+                                         telemetry=self.telemetry, cache=self.audio_cache)
+        # FSD50K clips are distributed at 44.1kHz
+        warm_resamplers([44100] + pos_dataset.sample_rates() + neg_dataset.sample_rates(), self.target_sr)
+
         self.test_dataset = torch.utils.data.ConcatDataset([pos_dataset, neg_dataset])
     
+    def telemetry_summary(self):
+        """Loading telemetry (items, failures, augmentations, decode/resample latencies) aggregated across workers."""
+        return self.telemetry.summary()
+
     def test_dataloader(self):
-        return DataLoader(self.test_dataset, batch_size=self.batch_size, collate_fn=fsd50k_collate_fn, shuffle=False, num_workers=2)
+        if self.bucketing:
+            # Group clips of similar duration to minimize zero-padding (FSD50K clips range from 0.3 to 30 sec.)
+            lengths = [length for dataset in self.test_dataset.datasets for length in dataset.item_lengths()]
+            batch_sampler = BucketBatchSampler(lengths, self.batch_size, self.max_batch_samples)
+            return make_dataloader(self.test_dataset, batch_sampler=batch_sampler, collate_fn=fsd50k_collate_fn,
+                                   **self.loader_kwargs)
+
+        return make_dataloader(self.test_dataset, batch_size=self.batch_size, collate_fn=fsd50k_collate_fn, shuffle=False,
+                               **self.loader_kwargs)
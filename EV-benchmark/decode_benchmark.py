@@ -0,0 +1,90 @@
+############################################################################################################
+#
+#  This script benchmarks the decoding of 10 sec. clips (as written by StandardDownloader.process_audio) per
+#  output codec (WAV PCM_16, FLAC, Opus): bytes on disk, encoding time, and decoding time of torchaudio.load vs.
+#  the dataloaders readers (memory-mapped read_wav, libsndfile read_soundfile), full clips and only the first
+#  target_size frames.
+#
+#  Usage (from the repository root):
+#  >>> python EV-benchmark/decode_benchmark.py
+#  >>> python EV-benchmark/decode_benchmark.py --num_files 200 --sample_rate 48000 --codecs wav flac opus
+#
+############################################################################################################
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+import numpy as np
+import torchaudio
+from dataloaders import read_wav, read_soundfile
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from audioset_tools.downloaders import CODECS, encode_audio
+
+
+def make_clips(num_files=100, sample_rate=32000, duration=10.0, channels=1, seed=0):
+    # Noise plus tones (white noise alone is not compressible, i.e. a FLAC worst case)
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    clips = []
+    for _ in range(num_files):
+        tones = sum(np.sin(2 * np.pi * rng.uniform(100, 4000) * t) for _ in range(3))
+        noise = 0.05 * rng.standard_normal((len(t), channels))
+        clips.append(np.clip(0.2 * tones[:, None] + noise, -1, 1))
+    return clips
+
+
+def write_clips(folder_path, clips, sample_rate, codec='wav', compression_level=None):
+    """Encode clips with StandardDownloader encode_audio: (file paths, mean encoding time in ms/file)."""
+    file_paths = [Path(folder_path) / f"clip_{i:05d}{CODECS[codec][0]}" for i in range(len(clips))]
+    seconds = sum(encode_audio(file_path, clip, sample_rate, codec, compression_level)
+                  for file_path, clip in zip(file_paths, clips))
+    return [str(file_path) for file_path in file_paths], 1000.0 * seconds / len(clips)
+
+
+def time_decoder(decode, file_paths, repeats=3):
+    """Best (over repeats) per-file decode time in ms."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for file_path in file_paths:
+            decode(file_path)
+        best = min(best, time.perf_counter() - start)
+    return 1000.0 * best / len(file_paths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audio codecs microbenchmark (bytes on disk, encoding and decoding time).")
+    parser.add_argument('--num_files', type=int, default=100)
+    parser.add_argument('--sample_rate', type=int, default=32000)
+    parser.add_argument('--channels', type=int, default=1)
+    parser.add_argument('--codecs', nargs='+', default=['wav', 'flac'], choices=list(CODECS),
+                        help="Opus requires a 8, 12, 16, 24 or 48 kHz sample_rate.")
+    parser.add_argument('--compression_level', type=int, default=5, help="FLAC/Opus compression level (0-8).")
+    parser.add_argument('--target_size', type=int, default=160000, help="Frames read by the truncated readers.")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    clips = make_clips(args.num_files, args.sample_rate, channels=args.channels)
+    print(f"{args.num_files} x 10 sec. clips ({args.sample_rate} Hz, {args.channels} channel(s)), "
+          f"compression level {args.compression_level}")
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for codec in args.codecs:
+            codec_dir = os.path.join(tmp_dir, codec)
+            os.makedirs(codec_dir)
+            file_paths, encode_ms = write_clips(codec_dir, clips, args.sample_rate, codec, args.compression_level)
+            size = sum(os.path.getsize(file_path) for file_path in file_paths) / len(file_paths)
+            reader = read_wav if codec == 'wav' else read_soundfile
+            decoders = {"torchaudio.load": torchaudio.load,
+                        reader.__name__: reader,
+                        f"{reader.__name__} (num_frames={args.target_size})":
+                            lambda path, reader=reader: reader(path, args.target_size)}
+            results = {name: time_decoder(decode, file_paths, args.repeats) for name, decode in decoders.items()}
+            reference = reference or (size, results[reader.__name__])
+
+            print(f"\n{codec}: {size / 1024:.1f} KB/file (x{reference[0] / size:.2f} vs. {args.codecs[0]}), "
+                  f"encoding {encode_ms:.3f} ms/file")
+            for name, ms in results.items():
+                print(f"  {name:<36} {ms:8.3f} ms/file  ({1000.0 / ms:8.1f} files/s, x{reference[1] / ms:.2f} vs. {args.codecs[0]})")
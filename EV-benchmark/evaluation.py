@@ -0,0 +1,244 @@
+############################################################################################################
+#
+#  This script evaluates binary EV classifiers (checkpoints) on the multi-loader benchmarks (ESC-50 folds,
+#  UrbanSound8K folds, sireNNet fractions), distributing the (loader, checkpoint) jobs over a local process
+#  pool, or over distributed ranks (each loader being split across ranks with a DistributedSampler).
+#  Per-loader confusion counts are gathered back into a single report (.csv). sireNNet nested fractions are
+#  evaluated in a single pass over the largest one (each file is decoded once).
+#
+#  Usage (from the repository root):
+#  >>> python EV-benchmark/evaluation.py --checkpoints model_a.pt model_b.pt --num_procs 8
+#  >>> torchrun --nproc_per_node 4 EV-benchmark/evaluation.py --checkpoints model_a.pt --distributed
+#
+#  Checkpoints are loaded with torch.jit.load (TorchScript), unless a '--model_fn module:function' is given,
+#  which must return a torch.nn.Module from a checkpoint path. Models output either one logit or 2 class scores.
+#
+############################################################################################################
+import os
+import time
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import torch
+import torch.distributed as dist
+from torch.utils.data import DistributedSampler
+from dataloaders import make_dataloader, ESC50_DataModule, sireNNet_DataModule, UrbanSound8K_DataModule
+
+
+# Multi-loader benchmarks (as used in data_demo.py)
+BENCHMARKS = {"ESC-50": (ESC50_DataModule, {"file_path": "./EV-benchmark/ESC-50/esc50.csv",
+                                            "folder_path": "./EV-benchmark/ESC-50/cross_val_folds/",
+                                            "target_size": 160000,
+                                            "target_sr": 32000}),
+              "sireNNet": (sireNNet_DataModule, {"folder_path": "./EV-benchmark/sireNNet/",
+                                                 "target_size": 96000,
+                                                 "target_sr": 32000}),
+              "UrbanSound8K": (UrbanSound8K_DataModule, {"folder_path": "./EV-benchmark/UrbanSound8K/audio",
+                                                         "metadata_path": "./EV-benchmark/UrbanSound8K/metadata/UrbanSound8K.csv",
+                                                         "target_sr": 32000,
+                                                         "min_length": 32000})}
+COUNTS = ["tp", "fp", "tn", "fn"]
+
+
+def benchmark_loaders(benchmark, batch_size=32, seed=42, loader_kwargs=None):
+    """
+    Build a multi-loader benchmark DataModule and name its test loaders (e.g. fold_1, ..., fold_10).
+    sireNNet nested fractions are served by a single loader, evaluated on its prefixes (see evaluate_loader).
+
+    :return: dict {loader name: (DataLoader, {report row name: prefix size} or None)}
+    """
+    datamodule_cls, kwargs = BENCHMARKS[benchmark]
+    if datamodule_cls is sireNNet_DataModule:
+        kwargs = {**kwargs, "seed": seed}
+    datamodule = datamodule_cls(batch_size=batch_size, loader_kwargs=loader_kwargs, **kwargs)
+    datamodule.setup()
+    if isinstance(datamodule, UrbanSound8K_DataModule):
+        return {f"fold_{fold}": (loader, None) for fold, loader in datamodule.test_loaders.items()}
+    if isinstance(datamodule, sireNNet_DataModule):
+        prefixes = {f"fraction_{size}": datamodule.subset_size(size) for size in datamodule.sizes}
+        return {"fractions": (datamodule.prefix_dataloader(), prefixes)}
+    return {name: (loader, None) for name, loader in datamodule.test_loaders.items()}
+
+
+def load_model(checkpoint, model_fn=None):
+    """Load a checkpoint (TorchScript, or through a 'module:function' model factory) in eval mode."""
+    if model_fn is None:
+        model = torch.jit.load(checkpoint, map_location="cpu")
+    else:
+        module_name, function_name = model_fn.split(":")
+        model = getattr(importlib.import_module(module_name), function_name)(checkpoint)
+    return model.eval()
+
+
+def binary_predictions(outputs, threshold=0.5):
+    """Positive class predictions from (B,)/(B, 1) logits or (B, 2) class scores."""
+    outputs = outputs.reshape(outputs.size(0), -1)
+    if outputs.size(1) == 2:
+        return outputs.argmax(dim=1)
+    return (torch.sigmoid(outputs[:, 0]) > threshold).long()
+
+
+def evaluate_loader(model, loader, prefix_sizes=None, rank=0, world_size=1):
+    """
+    :param prefix_sizes: Also count the loader prefixes of these sizes, within the same pass (e.g. nested subsets).
+    :param rank: Loader items are the rank::world_size items of the (global) evaluated sequence.
+    :return: confusion counts array [[tp, fp, tn, fn]] (one row per prefix size, or a single row for all the items)
+    """
+    sizes = np.asarray(prefix_sizes if prefix_sizes is not None else [np.iinfo(np.int64).max], dtype=np.int64)
+    counts = np.zeros((len(sizes), len(COUNTS)), dtype=np.int64)
+    position = rank  # global position of the next item
+    with torch.inference_mode():
+        for waveforms, labels in loader:
+            if len(waveforms) == 0:
+                continue
+            predictions = binary_predictions(model(waveforms)).numpy()
+            labels = labels.reshape(-1).numpy()
+            # Outcome index (tp, fp, tn, fn) of each item
+            outcomes = np.where(predictions == 1, np.where(labels == 1, 0, 1), np.where(labels == 0, 2, 3))
+            positions = position + world_size * np.arange(len(outcomes))
+            position += world_size * len(outcomes)
+            # Each item is counted in the prefixes it belongs to
+            in_prefix = (positions[None, :] < sizes[:, None]).astype(np.int64)
+            counts += in_prefix @ np.eye(len(COUNTS), dtype=np.int64)[outcomes]
+    return counts
+
+
+def metrics_report(rows, counts):
+    """
+    Per-loader report from the rows (benchmark, loader name, checkpoint) and their confusion counts.
+    """
+    report = pd.DataFrame(rows, columns=["benchmark", "loader", "checkpoint"])
+    report[COUNTS] = np.asarray(counts, dtype=np.int64).reshape(len(rows), len(COUNTS))
+    tp, fp, tn, fn = (report[c].astype("float64") for c in COUNTS)
+    report["samples"] = report[COUNTS].sum(axis=1)
+    report["accuracy"] = (tp + tn) / report["samples"].where(report["samples"] > 0)
+    report["precision"] = tp / (tp + fp).where(tp + fp > 0)
+    report["recall"] = tp / (tp + fn).where(tp + fn > 0)
+    report["f1"] = 2 * tp / (2 * tp + fp + fn).where(2 * tp + fp + fn > 0)
+    return report
+
+
+# Local process pool ------------------------------------------------------------------------------------------------
+_WORKER_CACHE = {}
+
+
+def _init_pool_worker(num_threads):
+    torch.set_num_threads(num_threads)
+
+
+def _run_job(job):
+    benchmark, loader_name, checkpoint, model_fn, batch_size, seed = job
+    # Each pool process builds a benchmark loaders (and loads a checkpoint) at most once
+    if ("loaders", benchmark) not in _WORKER_CACHE:
+        # The pool processes are the parallelism: no DataLoader workers nested into them
+        _WORKER_CACHE[("loaders", benchmark)] = benchmark_loaders(benchmark, batch_size, seed, {"num_workers": 0})
+    if ("model", checkpoint) not in _WORKER_CACHE:
+        _WORKER_CACHE[("model", checkpoint)] = load_model(checkpoint, model_fn)
+    loader, prefixes = _WORKER_CACHE[("loaders", benchmark)][loader_name]
+    return evaluate_loader(_WORKER_CACHE[("model", checkpoint)], loader, prefixes and list(prefixes.values()))
+
+
+def evaluate_pool(benchmarks, checkpoints, model_fn=None, num_procs=None, batch_size=32, seed=42):
+    """
+    Evaluate every (loader, checkpoint) job of the benchmarks in a local process pool.
+    Jobs are submitted largest loaders first, so that the pool does not idle on a single long job at the end.
+
+    :param num_procs: Number of pool processes (default: all CPUs).
+    :return: metrics_report DataFrame
+    """
+    num_procs = num_procs or os.cpu_count()
+    jobs, sizes, row_names = [], [], []
+    for benchmark in benchmarks:
+        for loader_name, (loader, prefixes) in benchmark_loaders(benchmark, batch_size, seed, {"num_workers": 0}).items():
+            for checkpoint in checkpoints:
+                jobs.append((benchmark, loader_name, checkpoint))
+                sizes.append(len(loader.dataset))
+                row_names.append(list(prefixes) if prefixes else [loader_name])
+    order = sorted(range(len(jobs)), key=lambda i: -sizes[i])
+
+    counts = [None] * len(jobs)
+    threads = max(1, os.cpu_count() // num_procs)
+    with ProcessPoolExecutor(max_workers=num_procs, initializer=_init_pool_worker, initargs=(threads,)) as pool:
+        futures = {i: pool.submit(_run_job, (*jobs[i], model_fn, batch_size, seed)) for i in order}
+        for i, future in futures.items():
+            counts[i] = future.result()
+
+    rows = [(benchmark, name, checkpoint) for (benchmark, _, checkpoint), names in zip(jobs, row_names) for name in names]
+    return metrics_report(rows, np.concatenate(counts))
+
+
+# Distributed ranks -------------------------------------------------------------------------------------------------
+class UnpaddedDistributedSampler(DistributedSampler):
+    """
+    DistributedSampler over a fixed (non-shuffled) dataset, without the padding samples: every item is evaluated
+    by exactly one rank, so that the gathered counts are exact.
+    """
+    def __init__(self, dataset, num_replicas=None, rank=None):
+        super().__init__(dataset, num_replicas=num_replicas, rank=rank, shuffle=False)
+
+    def __iter__(self):
+        return iter(range(self.rank, len(self.dataset), self.num_replicas))
+
+    def __len__(self):
+        return len(range(self.rank, len(self.dataset), self.num_replicas))
+
+
+def evaluate_distributed(benchmarks, checkpoints, model_fn=None, batch_size=32, seed=42, loader_kwargs=None):
+    """
+    Evaluate every (loader, checkpoint) job of the benchmarks on all the ranks of the (initialized) process group:
+    each loader is split across ranks, and the confusion counts are summed over ranks.
+
+    :return: metrics_report DataFrame (on every rank)
+    """
+    rows, counts = [], []
+    # Rank loaders are dropped after their loader jobs: no persistent workers
+    rank_loader_kwargs = {**(loader_kwargs or {}), "persistent_workers": False}
+    models = {checkpoint: load_model(checkpoint, model_fn) for checkpoint in checkpoints}
+    for benchmark in benchmarks:
+        for loader_name, (loader, prefixes) in benchmark_loaders(benchmark, batch_size, seed, loader_kwargs).items():
+            sampler = UnpaddedDistributedSampler(loader.dataset)
+            rank_loader = make_dataloader(loader.dataset,
+                                          batch_size=batch_size,
+                                          collate_fn=loader.collate_fn,
+                                          sampler=sampler,
+                                          **rank_loader_kwargs)
+            for checkpoint, model in models.items():
+                rows += [(benchmark, name, checkpoint) for name in (prefixes or [loader_name])]
+                counts.append(evaluate_loader(model, rank_loader, prefixes and list(prefixes.values()),
+                                              sampler.rank, sampler.num_replicas))
+
+    totals = torch.from_numpy(np.concatenate(counts))
+    dist.all_reduce(totals, op=dist.ReduceOp.SUM)
+    return metrics_report(rows, totals.numpy())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed evaluation of the multi-loader EV benchmarks.")
+    parser.add_argument('--checkpoints', nargs='+', required=True)
+    parser.add_argument('--model_fn', default=None, help="'module:function' building a model from a checkpoint path.")
+    parser.add_argument('--benchmarks', nargs='+', choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--num_procs', type=int, default=None, help="Local process pool size.")
+    parser.add_argument('--distributed', action='store_true', help="Split loaders across ranks (e.g. with torchrun).")
+    parser.add_argument('--output', default="./EV-benchmark/evaluation_report.csv")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.distributed:
+        if not dist.is_initialized():
+            dist.init_process_group("gloo")  # CPU evaluation (counts are all-reduced as CPU tensors)
+        report = evaluate_distributed(args.benchmarks, args.checkpoints, args.model_fn, args.batch_size, args.seed)
+        is_main = dist.get_rank() == 0
+        dist.destroy_process_group()
+    else:
+        report = evaluate_pool(args.benchmarks, args.checkpoints, args.model_fn, args.num_procs, args.batch_size, args.seed)
+        is_main = True
+
+    if is_main:
+        report.to_csv(args.output, index=False)
+        summary = report.groupby(["checkpoint", "benchmark"])[["accuracy", "precision", "recall", "f1"]].agg(["mean", "std"])
+        print(summary.to_string())
+        print(f"{len(report)} evaluations in {time.perf_counter() - start:.1f} sec. (report: {args.output})")
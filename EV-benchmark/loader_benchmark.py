@@ -0,0 +1,87 @@
+############################################################################################################
+#
+#  This script benchmarks DataLoader configurations (see make_dataloader) on synthetic WAV fixtures, reporting
+#  samples/sec and time-to-first-batch at each epoch (i.e. the workers start-up cost, paid once with
+#  persistent workers).
+#
+#  Usage (from the repository root):
+#  >>> python EV-benchmark/loader_benchmark.py
+#  >>> python EV-benchmark/loader_benchmark.py --num_files 512 --epochs 3 --workers 0 2 4
+#
+############################################################################################################
+import os
+import time
+import argparse
+import itertools
+import tempfile
+import numpy as np
+import soundfile as sf
+from dataloaders import LSSiren_TestDataset, lssiren_custom_collate_fn, make_dataloader, default_num_workers
+
+
+def write_fixtures(folder_path, num_files=256, sample_rates=(16000, 22050, 44100, 48000), min_sec=1.0, max_sec=10.0,
+                   seed=0):
+    """
+    Write synthetic WAV files (noise bursts of random duration and sample rate) with the LSSiren folder layout.
+    """
+    rng = np.random.default_rng(seed)
+    for i in range(num_files):
+        category = "Ambulance_data" if i % 2 == 0 else "Road_Noises"
+        os.makedirs(os.path.join(folder_path, category), exist_ok=True)
+        sr = int(rng.choice(sample_rates))
+        channels = int(rng.integers(1, 3))
+        samples = int(sr * rng.uniform(min_sec, max_sec))
+        data = (0.1 * rng.standard_normal((samples, channels))).astype(np.float32)
+        sf.write(os.path.join(folder_path, category, f"clip_{i:05d}.wav"), data, sr, subtype='PCM_16')
+
+
+def benchmark(dataset, config, batch_size=32, epochs=2):
+    """
+    Iterate the dataset for some epochs with a DataLoader built from config (make_dataloader arguments).
+
+    :return: list of per-epoch (time-to-first-batch in sec., samples/sec)
+    """
+    loader = make_dataloader(dataset, batch_size=batch_size, shuffle=False, collate_fn=lssiren_custom_collate_fn,
+                             **config)
+    results = []
+    for _ in range(epochs):
+        start = time.perf_counter()
+        first_batch, samples = None, 0
+        for waveforms, _ in loader:
+            if first_batch is None:
+                first_batch = time.perf_counter() - start
+            samples += waveforms.size(0)
+        results.append((first_batch, samples / (time.perf_counter() - start)))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DataLoader configurations on synthetic WAV fixtures.")
+    parser.add_argument('--fixtures', default=None, help="Fixtures folder (default: a temporary folder).")
+    parser.add_argument('--num_files', type=int, default=256)
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--target_sr', type=int, default=32000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, default_num_workers()])
+    parser.add_argument('--prefetch_factors', type=int, nargs='+', default=[2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixtures = args.fixtures or tmp_dir
+        if not os.path.isdir(os.path.join(fixtures, "Ambulance_data")):
+            write_fixtures(fixtures, args.num_files)
+        dataset = LSSiren_TestDataset(fixtures, target_sr=args.target_sr)
+
+        configs = []
+        for num_workers in sorted(set(args.workers)):
+            if num_workers == 0:
+                configs.append({"num_workers": 0})
+                continue
+            for persistent, prefetch in itertools.product((False, True), args.prefetch_factors):
+                configs.append({"num_workers": num_workers, "persistent_workers": persistent, "prefetch_factor": prefetch})
+
+        print(f"{len(dataset)} files, batch size {args.batch_size}, {args.epochs} epochs")
+        print(f"{'configuration':<75} {'epoch':>5} {'first batch (s)':>16} {'samples/s':>10}")
+        for config in configs:
+            for epoch, (first_batch, throughput) in enumerate(benchmark(dataset, config, args.batch_size, args.epochs)):
+                print(f"{str(config):<75} {epoch:>5} {first_batch:>16.3f} {throughput:>10.1f}")
@@ -0,0 +1,124 @@
+############################################################################################################
+#
+#  This script materializes benchmark datasets at the target sample rate (offline pre-resampling), so that
+#  dataloaders read already-resampled audio instead of resampling every item at every epoch.
+#
+#  Usage (from the repository root):
+#  >>> python EV-benchmark/preprocess.py --dataset FSD50K --target_sr 32000
+#  >>> python EV-benchmark/preprocess.py --src ./path/to/wavs/ --dst ./path/to/wavs_32k/ --target_sr 32000
+#
+#  The source folder tree is mirrored in the destination folder: point the DataModule's folder_path to it.
+#
+#  AudioSet-EV splits can also be packed into sequentially readable shards (see AudioSetEV_Shards_DataModule):
+#  >>> python EV-benchmark/preprocess.py --pack_splits ./path/to/AudioSetEV_splits.json --dst ./path/to/shards/
+#
+############################################################################################################
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import soundfile as sf
+import torch
+from tqdm import tqdm
+from dataloaders import resample, pack_audioset_ev_splits
+
+
+# Benchmark audio folders (as used in data_demo.py)
+DATASETS = {"ESC-50": "./EV-benchmark/ESC-50/cross_val_folds/",
+            "sireNNet": "./EV-benchmark/sireNNet/",
+            "LSSiren": "./EV-benchmark/LSSiren/",
+            "UrbanSound8K": "./EV-benchmark/UrbanSound8K/audio/",
+            "FSD50K": "./EV-benchmark/FSD50K/FSD50K.eval_audio/"}
+
+
+def resample_file(src_path, dst_path, target_sr, subtype='PCM_16'):
+    """
+    Resample a single audio file to target_sr and write it as WAV.
+    Files already materialized (and newer than their source) are skipped.
+    """
+    if os.path.exists(dst_path) and os.path.getmtime(dst_path) >= os.path.getmtime(src_path):
+        return False
+
+    data, sr = sf.read(src_path, dtype='float32', always_2d=True)
+    waveform = resample(torch.from_numpy(data.T.copy()), sr, target_sr)
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    tmp_path = dst_path + '.part'
+    sf.write(tmp_path, waveform.numpy().T, target_sr, subtype=subtype, format='WAV')
+    os.replace(tmp_path, dst_path)
+    return True
+
+
+def _resample_job(job):
+    src_path, dst_path, target_sr, subtype = job
+    try:
+        return resample_file(src_path, dst_path, target_sr, subtype), None
+    except Exception as e:
+        return False, f"{src_path}: {e}"
+
+
+def resample_tree(src_dir, dst_dir, target_sr, num_workers=None, subtype='PCM_16'):
+    """
+    Mirror every .wav file found under src_dir into dst_dir, resampled to target_sr.
+
+    :param src_dir: Source dataset folder.
+    :param dst_dir: Destination folder (the source tree structure is preserved).
+    :param target_sr: Target sampling rate.
+    :param num_workers: Number of worker processes (default: all available CPUs).
+    :param subtype: Output WAV subtype (see soundfile.available_subtypes('WAV')).
+    :return: tuple (written, skipped, errors)
+    """
+    src_dir = os.path.abspath(src_dir)
+    dst_dir = os.path.abspath(dst_dir)
+
+    jobs = []
+    for root, _, files in os.walk(src_dir):
+        if os.path.commonpath([root, dst_dir]) == dst_dir:
+            continue  # never re-process a destination nested into the source tree
+        for f in files:
+            if f.endswith('.wav'):
+                src_path = os.path.join(root, f)
+                dst_path = os.path.join(dst_dir, os.path.relpath(src_path, src_dir))
+                jobs.append((src_path, dst_path, target_sr, subtype))
+
+    written, skipped, errors = 0, 0, []
+    # Each worker keeps its own resample kernels cache: one kernel per (orig_sr, target_sr) per worker
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=torch.set_num_threads, initargs=(1,)) as pool:
+        for done, error in tqdm(pool.map(_resample_job, jobs, chunksize=16), total=len(jobs), desc="Resampling"):
+            if error is not None:
+                errors.append(error)
+            elif done:
+                written += 1
+            else:
+                skipped += 1
+
+    return written, skipped, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize benchmark datasets at the target sample rate.")
+    parser.add_argument('--dataset', choices=sorted(DATASETS), default=None, help="Benchmark dataset preset.")
+    parser.add_argument('--src', default=None, help="Source folder (overrides the dataset preset).")
+    parser.add_argument('--dst', default=None, help="Destination folder (default: <src>_<target_sr/1000>k).")
+    parser.add_argument('--target_sr', type=int, default=32000)
+    parser.add_argument('--num_workers', type=int, default=None)
+    parser.add_argument('--subtype', default='PCM_16')
+    parser.add_argument('--pack_splits', default=None, help="AudioSet-EV split file to pack into shards (in --dst).")
+    parser.add_argument('--shard_size', type=int, default=64)
+    parser.add_argument('--target_size', type=int, default=320000)
+    args = parser.parse_args()
+
+    if args.pack_splits is not None:
+        if args.dst is None:
+            parser.error("--dst is required with --pack_splits.")
+        pack_audioset_ev_splits(args.pack_splits, args.dst, target_size=args.target_size, shard_size=args.shard_size)
+        raise SystemExit(0)
+
+    src = args.src or DATASETS.get(args.dataset)
+    if src is None:
+        parser.error("either --dataset or --src is required.")
+    dst = args.dst or f"{os.path.normpath(src)}_{args.target_sr // 1000}k"
+
+    written, skipped, errors = resample_tree(src, dst, args.target_sr, args.num_workers, args.subtype)
+    print(f"Resampled files written to {dst}: {written} (up-to-date: {skipped}, errors: {len(errors)})")
+    for error in errors:
+        print(f"  Skipping Error {error}")
@@ -1,16 +1,176 @@
 from pathlib import Path
+import io
+import sys
 import csv
 import ast
 import subprocess
 import os
 import time
 import random
+import uuid
 import soundfile as sf
 import numpy as np
 import yt_dlp
 import resampy
 from tqdm import tqdm
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+from audioset_tools.utils import LiveStats
+from audioset_tools.leases import LeaseCoordinator
+from audioset_tools.metrics import DownloadMetrics
+
+
+# Output codecs: file extension, libsndfile format and subtype
+CODECS = {'wav': ('.wav', 'WAV', 'PCM_16'),
+          'flac': ('.flac', 'FLAC', 'PCM_16'),
+          'opus': ('.opus', 'OGG', 'OPUS')}
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def encode_audio(path: Path, data: np.ndarray, sr: int, codec: str = 'wav', compression_level: int = None) -> float:
+    """
+    Encode audio to path, through a temporary file atomically renamed (i.e. no partial output files).
+
+    :param codec: Output codec (see CODECS).
+    :param compression_level: FLAC/Opus compression level, from 0 (fastest, or highest Opus bitrate) to 8.
+    :return: Encoding time (sec.).
+    """
+    start = time.perf_counter()
+    _, file_format, subtype = CODECS[codec]
+    options = {} if compression_level is None or codec == 'wav' else {'compression_level': compression_level / 8.0}
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        sf.write(tmp_path, data, sr, format=file_format, subtype=subtype, **options)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return time.perf_counter() - start
+
+
+class Sample:
+    """Parsed CSV row (see SampleTable.record)."""
+    __slots__ = ('yt_id', 'start_seconds', 'end_seconds', 'labels')
+
+    def __init__(self, yt_id: str, start_seconds: float, end_seconds: float, labels: tuple):
+        self.yt_id = yt_id
+        self.start_seconds = start_seconds
+        self.end_seconds = end_seconds
+        self.labels = labels
+
+
+class SampleTable:
+    def __init__(self, data_file: Path):
+        """
+        Compact in-memory AudioSet CSV: raw row bytes (without the 'downloaded' column) in a single buffer with their
+        line offsets, and downloaded flags in a boolean array. Rows are parsed on access only (see record()), label
+        tuples being interned, and the CSV is written back as raw bytes (plus flags).
+        Rows must fit on one line each (as in AudioSet CSVs).
+
+        :param data_file: Path to the CSV file.
+        """
+        raw = data_file.read_bytes()
+        header_end = raw.find(b'\n') + 1 or len(raw)
+        header = next(csv.reader([raw[:header_end].decode('utf-8')]), [])
+        self.has_downloaded = 'downloaded' in header
+        if self.has_downloaded and header[-1] != 'downloaded':
+            raw = raw[:header_end] + self._move_downloaded_last(raw[header_end:], header.index('downloaded'))
+            header = [name for name in header if name != 'downloaded'] + ['downloaded']
+        self.fieldnames = header if self.has_downloaded else header + ['downloaded']
+        self.columns = {name: header.index(name) for name in header}
+        self.buffer = raw
+
+        # Data lines offsets (in buffer, excluding line endings and blank lines)
+        data = np.frombuffer(raw, dtype=np.uint8)
+        ends = np.flatnonzero(data == ord('\n'))
+        ends = ends[ends >= header_end]
+        if len(data) > header_end and data[-1] != ord('\n'):
+            ends = np.append(ends, len(data))
+        starts = np.concatenate([[header_end], ends[:-1] + 1]).astype(np.int64)[:len(ends)]
+        ends = ends.astype(np.int64)
+        ends -= (ends > starts) & (data[np.maximum(ends - 1, 0)] == ord('\r'))
+        keep = ends > starts
+        self.starts, self.ends = starts[keep], ends[keep]
+
+        # Downloaded flags (last column), excluded from the rows bytes
+        self.downloaded = np.zeros(len(self.starts), dtype=bool)
+        if self.has_downloaded and len(self.starts):
+            def ends_with(suffix):
+                suffix = np.frombuffer(suffix, dtype=np.uint8)
+                idx = np.maximum(self.ends[:, None] - len(suffix) + np.arange(len(suffix)), 0)
+                return (self.ends - self.starts >= len(suffix)) & (data[idx] == suffix).all(axis=1)
+
+            self.downloaded = ends_with(b',True')
+            not_downloaded = ends_with(b',False')
+            self.ends = self.ends - np.where(self.downloaded, len(b',True'), np.where(not_downloaded, len(b',False'), 0))
+            for i in np.flatnonzero(~(self.downloaded | not_downloaded)):
+                # Any other flag value (e.g. empty) stands for not downloaded
+                self.ends[i] = self.buffer.rfind(b',', int(self.starts[i]), int(self.ends[i]))
+
+        self._label_sets = {}
+
+
+    @staticmethod
+    def _move_downloaded_last(data: bytes, idx: int) -> bytes:
+        """Re-serialize rows with the 'downloaded' column (at index idx) moved last."""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        for row in csv.reader(data.decode('utf-8').splitlines()):
+            if row:
+                writer.writerow(row[:idx] + row[idx + 1:] + row[idx:idx + 1])
+        return out.getvalue().encode('utf-8')
+
+
+    def __len__(self):
+        return len(self.starts)
+
+
+    def row(self, idx: int) -> bytes:
+        """Raw row bytes (without the 'downloaded' column)."""
+        return self.buffer[self.starts[idx]:self.ends[idx]]
+
+
+    def fields(self, idx: int) -> list:
+        return next(csv.reader([self.row(idx).decode('utf-8')]))
+
+
+    def yt_id(self, idx: int) -> str:
+        return self.fields(idx)[self.columns['yt_id']]
+
+
+    def record(self, idx: int) -> Sample:
+        """Parse a row (labels are parsed once per distinct labels field, as interned label-id tuples)."""
+        fields = self.fields(idx)
+        labels_field = fields[self.columns['positive_labels']]
+        labels = self._label_sets.get(labels_field)
+        if labels is None:
+            labels = self._label_sets[labels_field] = tuple(sys.intern(label)
+                                                            for label in ast.literal_eval(labels_field))
+        return Sample(fields[self.columns['yt_id']],
+                      float(fields[self.columns['start_seconds']]),
+                      float(fields[self.columns['end_seconds']]),
+                      labels)
+
+
+    def dicts(self):
+        """Generator of rows as dicts (csv.DictReader-like)."""
+        names = self.fieldnames[:-1]
+        for idx in range(len(self)):
+            row = dict(zip(names, self.fields(idx)))
+            row['downloaded'] = 'True' if self.downloaded[idx] else 'False'
+            yield row
+
+
+    def write(self, file):
+        """Write the CSV (with the 'downloaded' column) to a binary file object."""
+        out = io.StringIO()
+        csv.writer(out).writerow(self.fieldnames)
+        file.write(out.getvalue().encode('utf-8'))
+        flags = (b',False\r\n', b',True\r\n')
+        buffer = self.buffer
+        file.write(b''.join(chunk for start, end, downloaded in zip(self.starts.tolist(), self.ends.tolist(),
+                                                                    self.downloaded.tolist())
+                            for chunk in (buffer[start:end], flags[downloaded])))
 
 
 class StandardDownloader:
@@ -21,6 +181,18 @@ class StandardDownloader:
                  channels_proc: str = 'stereo',
                  normalize: bool = False,
                  cookies_file = None,
+                 live_stats_interval: float = None,
+                 lease_chunk_size: int = None,
+                 lease_timeout: float = 900.0,
+                 lease_retry_failed: bool = False,
+                 events_file: str = None,
+                 prometheus_file: str = None,
+                 sleep_range: tuple = (5.0, 20.0),
+                 sleep_requests: float = 1.25,
+                 codec: str = 'wav',
+                 compression_level: int = None,
+                 encode_workers: int = 0,
+                 output_dir: str = None,
                  verbose: bool = False):
         """
         AudioSet standard dataset downloader with support for download tracking.
@@ -31,6 +203,28 @@ class StandardDownloader:
         :param channels_proc: Channel processing mode ('stereo', 'mono_split', or 'mono_red').
         :param normalize: Normalize audio to a peak amplitude of 1.0 if True.
         :param cookies_file: Path to cookies file for YouTibe user authentication.
+        :param live_stats_interval: If given, downloaded statistics are maintained incrementally and checkpointed to
+                                    "<data_file>_stats.json" every live_stats_interval seconds (see utils.LiveStats).
+                                    With leases, "<data_file>_stats.json" holds the committed results of all the
+                                    workers, and each worker checkpoints its own progress to
+                                    "<data_file>_stats.<worker_id>.json".
+        :param lease_chunk_size: If given, rows are shared with the other processes downloading the same CSV (e.g. on
+                                 other machines) in leases of lease_chunk_size rows (see leases.LeaseCoordinator).
+        :param lease_timeout: Lease expiry time (sec.) since its last renewal (renewed after each sample).
+        :param lease_retry_failed: If True, the committed chunks with failed rows are reopened at startup, for these rows
+                                   to be retried (see leases.LeaseCoordinator.reopen_failed).
+        :param events_file: If given, per-sample stage timings and errors are logged to this JSONL file.
+        :param prometheus_file: If given, throughput, error rates and ETA are exported to this Prometheus text file
+                                (see metrics.DownloadMetrics).
+        :param sleep_range: Range (sec.) of the random sleep between two samples.
+        :param sleep_requests: yt-dlp sleep (sec.) between the requests of a download.
+        :param codec: Output audio codec: 'wav' (PCM_16), 'flac' (lossless PCM_16) or 'opus' (lossy, e.g. for preview
+                      sets, target_sr must be 8, 12, 16, 24 or 48 kHz).
+        :param compression_level: FLAC (or Opus) compression level, from 0 to 8 (default: libsndfile's).
+        :param encode_workers: If given, outputs are encoded by a pool of encode_workers threads (libsndfile releases
+                               the GIL), overlapping with the next downloads. Otherwise they are encoded inline.
+        :param output_dir: Folder of the downloads folder and of the yt-dlp temporary files (default: current working
+                           directory).
         :param verbose: Enable debug logging if True.
         """
         self.data_file = Path(data_file)
@@ -39,21 +233,51 @@ class StandardDownloader:
         self.channels_proc = channels_proc
         self.normalize = normalize
         self.verbose = verbose
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported codec '{codec}' (supported: {', '.join(CODECS)}).")
+        if codec == 'opus' and target_sr not in OPUS_SAMPLE_RATES:
+            raise ValueError(f"Opus does not support a {target_sr}Hz sampling rate (supported: {OPUS_SAMPLE_RATES}).")
+        self.codec = codec
+        self.compression_level = compression_level
+        self.encode_workers = encode_workers
+        self.encoder = ThreadPoolExecutor(max_workers=encode_workers) if encode_workers else None
+        self._encodings = {}  # {pending encoding future: (row index, video id)}
+        self._sample_idx = None  # row being processed
         self.cookies_file = cookies_file
+        self.live_stats_interval = live_stats_interval
+        self.live_stats = None
+        self.committed_stats = None  # multi-node mode: CSV and committed chunks statistics
+        self.lease_chunk_size = lease_chunk_size
+        self.lease_timeout = lease_timeout
+        self.lease_retry_failed = lease_retry_failed
+        self.coordinator = None
+        self._leased_chunk = None
+        self._lease_renewed = 0.0
+        self.metrics = DownloadMetrics(events_file, prometheus_file)
+        self.sleep_range = sleep_range
+        # Download backend and clock (replaced in simulation mode, see simulation.SimulatedDownloader)
+        self.youtube_dl = yt_dlp.YoutubeDL
+        self.clock = time.perf_counter
+        self.sleep = time.sleep
+        self._extract_seconds = 0.0
+        self._extract_start = None
+        self._last_sample = None
 
         # Attributes for processing and reports tracking
         self.missing_samples = []
         self.downloaded_samples = []
         self.labels_counter = Counter()
+        self.output_dir = Path(output_dir).resolve() if output_dir else Path.cwd()
         self.download_folder = self.create_output_folder()
 
         # yt-dlp options
         self.ydl_opts = {'quiet': not verbose,
                          'no_warnings': not verbose,
                          'format': 'bestaudio/best',
-                         'outtmpl': '%(id)s.%(ext)s',
+                         'outtmpl': self._output_template('%(id)s'),
                          'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'wav'}],
-                         'sleep_requests': 1.25}
+                         'sleep_requests': sleep_requests,
+                         'postprocessor_hooks': [self._postprocessor_hook]}
         if self.cookies_file:
             self.ydl_opts['cookiefile'] = self.cookies_file
 
@@ -68,42 +292,60 @@ class StandardDownloader:
         """Context manager entry point: load data and labels."""
         self.load_data()
         self.load_labels()
+        if self.lease_chunk_size is not None:
+            self.coordinator = LeaseCoordinator(self.data_file, len(self.data), self.lease_chunk_size, self.lease_timeout)
+            if self.lease_retry_failed:
+                self._log(f"{self.coordinator.reopen_failed()} chunks with failed rows reopened.")
+        if self.live_stats_interval is not None:
+            if self.coordinator is None:
+                self.live_stats = LiveStats(self.data_file, self.labels_file, self.data, self.live_stats_interval)
+            else:
+                worker_json = self.data_file.parent / f"{self.data_file.stem}_stats.{self.coordinator.worker_id}.json"
+                self.live_stats = LiveStats(self.data_file, self.labels_file, self.data, self.live_stats_interval,
+                                            json_path=worker_json)
+                self.committed_stats = self.live_stats.copy(self.data_file.parent / f"{self.data_file.stem}_stats.json")
+                self._checkpoint_committed_stats()
+            self.live_stats.checkpoint(force=True)
         return self
 
 
     def __exit__(self, exc_type, exc_value, traceback):
-        """Context manager exit point: generate reports."""
+        """Context manager exit point: wait for the pending encodings, generate reports (and final statistics checkpoint)."""
+        if self.encoder is not None:
+            self._collect_encodings(ALL_COMPLETED)
+            self.encoder.shutdown()
         self.generate_reports()
+        if self.live_stats is not None:
+            self.live_stats.checkpoint(force=True)
+        if self.committed_stats is not None:
+            self._checkpoint_committed_stats()
+        self.metrics.close()
 
 
     def load_data(self):
-        """Load dataset from CSV file and check for 'downloaded' column."""
+        """Load dataset from CSV file (as a compact SampleTable) and check for 'downloaded' column."""
         if self.data_file.suffix != '.csv':
             raise TypeError("Unsupported dataset format. CSV required.")
 
         try:
-            with self.data_file.open('r', newline='') as file:
-                csv_reader = csv.DictReader(file)
-                self.data = [row for row in csv_reader]
-
-                # Ensure 'downloaded' column exists
-                if 'downloaded' not in csv_reader.fieldnames:
-                    for row in self.data:
-                        row['downloaded'] = 'False'
-                    self._save_data_to_csv()
-                    self._log(f"Added 'downloaded' column to {self.data_file.name} with default 'False' values.")
+            self.data = SampleTable(self.data_file)
         except FileNotFoundError:
             raise FileNotFoundError(f"File '{self.data_file}' not found.")
         except Exception as e:
             raise RuntimeError(f"Error reading the file: {str(e)}")
 
+        # Ensure 'downloaded' column exists
+        if not self.data.has_downloaded:
+            self._save_data_to_csv()
+            self._log(f"Added 'downloaded' column to {self.data_file.name} with default 'False' values.")
+
 
     def _save_data_to_csv(self):
-        """Save the updated dataset back to the CSV file."""
-        with self.data_file.open('w', newline='') as file:
-            csv_writer = csv.DictWriter(file, fieldnames=self.data[0].keys())
-            csv_writer.writeheader()
-            csv_writer.writerows(self.data)
+        """Save the updated dataset back to the CSV file (atomically replaced, other processes may be reading it)."""
+        tmp_path = self.data_file.with_name(f".{self.data_file.name}.{uuid.uuid4().hex}.tmp")
+        with tmp_path.open('wb') as file:
+            self.data.write(file)
+        os.replace(tmp_path, self.data_file)
 
 
     def load_labels(self):
@@ -122,7 +364,7 @@ class StandardDownloader:
     def create_output_folder(self) -> Path:
         """Create a folder for downloads based on data filename."""
         folder_name = f"AudioSet_{self.data_file.stem}_downloads"
-        download_folder = Path.cwd() / folder_name
+        download_folder = self.output_dir / folder_name
         download_folder.mkdir(exist_ok=True)
         self._log(f"Downloads folder created: {download_folder}")
         return download_folder
@@ -131,55 +373,195 @@ class StandardDownloader:
     def download_and_process(self):
         """Download and process each audio sample with retry logic."""
         global_start_time = time.time()
+        if self.coordinator is not None:
+            self._download_with_leases()
+            self._log(f"Dataset processed in {time.time() - global_start_time:.2f} seconds.")
+            return
+
+        pending = self.pending()
+        self.metrics.start(total=len(pending))
+        for idx in tqdm(pending.tolist(), desc="Dataset download & processing"):
+            if not self._process_sample(idx):
+                self._sample_done()
+                return  # Stop the entire downloading process
+
+            # Save the updated data back to the CSV file
+            with self.metrics.stage('commit'):
+                self._save_data_to_csv()
+                if self.live_stats is not None:
+                    self.live_stats.update(idx, bool(self.data.downloaded[idx]))
+                    self.live_stats.checkpoint()
+            self._sample_done()
+
+            self._relax()
+
+        self._log(f"Dataset processed in {time.time() - global_start_time:.2f} seconds.")
 
-        for idx, sample in enumerate(tqdm(self.data, desc="Dataset download & processing")):
-            video_id = sample.get('yt_id')
-            labels = ast.literal_eval(sample.get('positive_labels'))
-            start_sec = float(sample.get('start_seconds'))
-            end_sec = float(sample.get('end_seconds'))
-            downloaded = sample.get('downloaded') == 'True'
 
-            # Check if any .wav file containing the yt_id exists in the downloads folder
-            audio_files = list(self.download_folder.glob(f"*{video_id}*.wav"))
+    def pending(self, rows=None) -> np.ndarray:
+        """
+        Indices of the rows to download: not flagged as downloaded (not parsed), or without audio files in the
+        downloads folder (listed once).
 
-            # Continue only if both the downloaded flag is True and audio files exist
-            if downloaded and audio_files:
+        :param rows: Rows indices to consider (default: all).
+        """
+        extensions = {extension for extension, _, _ in CODECS.values()}
+        downloaded_ids = {path.stem.rsplit('_', 1)[0] for path in self.download_folder.iterdir()
+                          if path.suffix in extensions}
+        rows = np.arange(len(self.data)) if rows is None else np.asarray(rows, dtype=np.int64)
+        keep = ~self.data.downloaded[rows]
+        for i in np.flatnonzero(~keep):
+            video_id = self.data.yt_id(int(rows[i]))
+            if video_id in downloaded_ids:
                 self._log(f"Skipping already downloaded video ID: {video_id}.")
-                continue
+            else:
+                keep[i] = True
+        return rows[keep]
 
-            if video_id and labels:
-                label_names = [self.labels.get(label_id) for label_id in labels]
-                self._log(f'Processing video ID: {video_id} with labels {label_names}.')
-                while True:
-                    try:
-                        self.download_and_process_audio(video_id, label_names, start_sec, end_sec)
-                        sample['downloaded'] = 'True'  # Mark as downloaded
-                        break
-                    except Exception as e:
-                        error_message = str(e)
-                        shadow_ban_messages = ["This content isn't available, try again later.",
-                                               "Video unavailable. This content isn’t available.",
-                                               "The following content is not available on this app.. Watch on the latest version of YouTube."]
-                        if "Sign in to confirm you’re not a bot" in error_message:
-                            sample['downloaded'] = 'False'
-                            self._log(f"Authentication error for video ID '{video_id}'. Opening Firefox for manual cookie refresh.")
-                            self.refresh_cookies()
-                        elif any(msg in error_message for msg in shadow_ban_messages):
-                            self._log(f"YouTube shadow-ban detected for video ID '{video_id}'. Entire downloading process halted.")
-                            return  # Stop the entire downloading process
-                        self._log(f"Error downloading video ID '{video_id}': {e}")
-                        self.missing_samples.append({'video_id': video_id, 'labels': label_names})
-                        break
-            
-            # Save the updated data back to the CSV file
+
+    def _process_sample(self, idx: int) -> bool:
+        """
+        Download and process a sample (updating its downloaded flag).
+
+        :return: False if the downloading process must be halted (shadow-ban detected).
+        """
+        try:
+            self._sample_idx = idx
+            return self._process_record(idx)
+        finally:
+            self._sample_idx = None
+
+
+    def _process_record(self, idx: int) -> bool:
+        """_process_sample body (the row index being tracked for the pool encodings failures)."""
+        sample = self.data.record(idx)
+        self._last_sample = None
+        video_id = sample.yt_id
+        labels = sample.labels
+        start_sec = sample.start_seconds
+        end_sec = sample.end_seconds
+
+        if video_id and labels:
+            label_names = [self.labels.get(label_id) for label_id in labels]
+            self._log(f'Processing video ID: {video_id} with labels {label_names}.')
+            while True:
+                try:
+                    self.download_and_process_audio(video_id, label_names, start_sec, end_sec)
+                    self.data.downloaded[idx] = True  # Mark as downloaded
+                    self._last_sample = (video_id, end_sec - start_sec, None)
+                    break
+                except Exception as e:
+                    self._last_sample = (video_id, 0.0, e)
+                    error_message = str(e)
+                    shadow_ban_messages = ["This content isn't available, try again later.",
+                                           "Video unavailable. This content isn’t available.",
+                                           "The following content is not available on this app.. Watch on the latest version of YouTube."]
+                    if "Sign in to confirm you’re not a bot" in error_message:
+                        self.data.downloaded[idx] = False
+                        self._log(f"Authentication error for video ID '{video_id}'. Opening Firefox for manual cookie refresh.")
+                        self.refresh_cookies()
+                    elif any(msg in error_message for msg in shadow_ban_messages):
+                        self._log(f"YouTube shadow-ban detected for video ID '{video_id}'. Entire downloading process halted.")
+                        return False
+                    self._log(f"Error downloading video ID '{video_id}': {e}")
+                    self.missing_samples.append({'video_id': video_id, 'labels': label_names})
+                    break
+        return True
+
+
+    def _sample_done(self):
+        """Report the last processed sample outcome to the metrics."""
+        if self._last_sample is not None:
+            video_id, audio_seconds, error = self._last_sample
+            self.metrics.sample_done(video_id, audio_seconds, error)
+            self._last_sample = None
+
+
+    def _relax(self):
+        """Add random sleep to relax connections."""
+        sleep_time = random.uniform(*self.sleep_range)
+        self._log(f"Sleeping for {sleep_time:.2f} seconds to avoid IP ban.")
+        with self.metrics.stage('queue_wait'):
+            self.sleep(sleep_time)
+
+
+    def _download_with_leases(self):
+        """
+        Multi-node download: process the chunks of rows leased from the coordinator, committing their results to the
+        leases folder (instead of rewriting the shared CSV). Once all chunks are committed, the merged results are
+        saved to the CSV.
+        """
+        # Rows left in the uncommitted chunks (shared with the other workers: the ETA is an upper bound)
+        remaining = 0
+        for chunk in range(self.coordinator.num_chunks):
+            if not self.coordinator.is_done(chunk):
+                rows = self.coordinator.chunk_rows(chunk)
+                remaining += int((~self.data.downloaded[rows.start:rows.stop]).sum())
+        self.metrics.start(total=remaining)
+        for chunk in self.coordinator.claims():
+            self._leased_chunk, self._lease_renewed = chunk, time.monotonic()
+            rows = self.coordinator.chunk_rows(chunk)
+            # Rows of a reopened chunk downloaded by its previous commit are kept
+            retried = self.coordinator.retry_results(chunk)
+            for idx, downloaded in retried.items():
+                self.data.downloaded[idx] = self.data.downloaded[idx] or downloaded
+            lost = False
+            pending = self.pending([idx for idx in rows if not retried.get(idx)])
+            for idx in tqdm(pending.tolist(), desc=f"Chunk {chunk} download & processing"):
+                if not self._process_sample(idx):
+                    self._sample_done()
+                    self.coordinator.release(chunk)
+                    self._leased_chunk = None
+                    return  # Stop the entire downloading process
+                if self.live_stats is not None:
+                    with self.metrics.stage('commit'):
+                        self.live_stats.update(idx, bool(self.data.downloaded[idx]))
+                        if self.live_stats.checkpoint():
+                            self._checkpoint_committed_stats()
+                self._sample_done()
+                self._relax()
+                lost = not self._renew_lease()
+                if lost:
+                    break
+            self._leased_chunk = None
+            if self.encoder is not None:
+                self._collect_encodings(ALL_COMPLETED)
+            if lost:
+                self._log(f"Lease of chunk {chunk} lost (expired and reclaimed by another worker): chunk given up.")
+                continue
+            results = {idx: bool(self.data.downloaded[idx]) for idx in rows}
+            with self.metrics.stage('commit'):
+                committed = self.coordinator.commit(chunk, results)
+            if not committed:
+                self._log(f"Chunk {chunk} was already committed by another worker.")
+
+        if self.coordinator.all_done():
+            for idx, downloaded in self.coordinator.results().items():
+                self.data.downloaded[idx] = downloaded
+                if self.live_stats is not None:
+                    self.live_stats.update(idx, downloaded)
             self._save_data_to_csv()
+            self._log(f"All chunks committed: results saved to {self.data_file.name}.")
 
-            # Add random sleep to relax connections
-            sleep_time = random.uniform(5, 20)
-            self._log(f"Sleeping for {sleep_time:.2f} seconds to avoid IP ban.")
-            time.sleep(sleep_time)
 
-        self._log(f"Dataset processed in {time.time() - global_start_time:.2f} seconds.")
+    def _checkpoint_committed_stats(self):
+        """
+        Multi-node mode: checkpoint the statistics of the CSV updated with the committed results of all the workers
+        (the same for every worker, unlike the workers own progress).
+        """
+        for idx, downloaded in self.coordinator.results().items():
+            self.committed_stats.update(idx, downloaded)
+        self.committed_stats.checkpoint(force=True)
+
+
+    def _renew_lease(self) -> bool:
+        """
+        Renew the lease of the chunk being processed, if any (multi-node mode).
+
+        :return: False if the lease was lost (the chunk must be given up).
+        """
+        self._lease_renewed = time.monotonic()
+        return self._leased_chunk is None or self.coordinator.renew(self._leased_chunk)
 
 
     def refresh_cookies(self):
@@ -188,6 +570,8 @@ class StandardDownloader:
         self._log("Waiting for Firefox to close...")
         while "firefox" in subprocess.getoutput("pgrep firefox"):
             time.sleep(1)  # Wait until Firefox is closed
+            if time.monotonic() - self._lease_renewed > self.lease_timeout / 4:
+                self._renew_lease()  # keep the chunk leased (a lost lease is detected after the sample)
         self._log("Firefox closed. Reloading cookies.")
         if not self.cookies_file or not os.path.exists(self.cookies_file):
             raise FileNotFoundError("Cookies file not found. Please re-export the cookies file.")
@@ -198,11 +582,18 @@ class StandardDownloader:
     def download_and_process_audio(self, youtube_id: str, label_names: list, start_sec: float, end_sec: float):
         """Download and process a single audio sample."""
         try:
-            self.ydl_opts['outtmpl'] = f'{youtube_id}.%(ext)s'
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                ydl.download([youtube_id])
-
-            file_path = Path(f'{youtube_id}.wav')
+            self.ydl_opts['outtmpl'] = self._output_template(youtube_id)
+            self._extract_seconds = 0.0
+            start = self.clock()
+            try:
+                with self.youtube_dl(self.ydl_opts) as ydl:
+                    ydl.download([youtube_id])
+            finally:
+                # yt-dlp download time, ffmpeg audio extraction (post-processing) excluded
+                self.metrics.observe('extract', self._extract_seconds)
+                self.metrics.observe('fetch', self.clock() - start - self._extract_seconds)
+
+            file_path = self.output_dir / f'{youtube_id}.wav'
             self.process_audio(file_path, start_sec, end_sec)
             self.downloaded_samples.append({'video_id': youtube_id, 'labels': label_names})
             self.labels_counter.update(label_names)
@@ -211,13 +602,29 @@ class StandardDownloader:
             raise e
 
 
+    def _output_template(self, name: str) -> str:
+        """yt-dlp output template of a name (e.g. '%(id)s') in output_dir (whose '%' are escaped)."""
+        return os.path.join(str(self.output_dir).replace('%', '%%'), f'{name}.%(ext)s')
+
+
+    def _postprocessor_hook(self, d: dict):
+        """yt-dlp post-processors (ffmpeg audio extraction) timing."""
+        if d.get('status') == 'started':
+            self._extract_start = self.clock()
+        elif d.get('status') == 'finished' and self._extract_start is not None:
+            self._extract_seconds += self.clock() - self._extract_start
+            self._extract_start = None
+
+
     def process_audio(self, file_path: Path, start_sec: float, end_sec: float):
         """Apply DSP operations on audio file: resampling, trimming, normalization, and channel processing."""
-        data, sr = sf.read(file_path)
+        with self.metrics.stage('read'):
+            data, sr = sf.read(file_path)
 
         # Resampling
         if self.target_sr != sr:
-            data = resampy.resample(data, sr, self.target_sr)
+            with self.metrics.stage('resample'):
+                data = resampy.resample(data, sr, self.target_sr)
             self._log(f"{file_path} resampled to {self.target_sr}Hz.")
 
         # Trimming
@@ -230,20 +637,72 @@ class StandardDownloader:
 
         # Channels processing
         if self.channels_proc == 'mono_split' and data.ndim == 2 and data.shape[1] > 1:
-            left_channel = data[:, 0]
-            right_channel = data[:, 1]
-            sf.write(f"{self.download_folder}/{file_path.stem}_Left.wav", left_channel, self.target_sr)
-            sf.write(f"{self.download_folder}/{file_path.stem}_Right.wav", right_channel, self.target_sr)
+            outputs = {'Left': data[:, 0], 'Right': data[:, 1]}
         elif self.channels_proc == 'mono_red' and data.ndim == 2 and data.shape[1] > 1:
-            data = (data[:, 0] + data[:, 1]) / 2.0
-            sf.write(f"{self.download_folder}/{file_path.stem}_Reduced.wav", data, self.target_sr)
+            outputs = {'Reduced': (data[:, 0] + data[:, 1]) / 2.0}
         else:
-            sf.write(f"{self.download_folder}/{file_path.stem}_Original.wav", data, self.target_sr)
+            outputs = {'Original': data}
+
+        # Encoding
+        extension = CODECS[self.codec][0]
+        for suffix, output in outputs.items():
+            self._encode(file_path.stem, self.download_folder / f"{file_path.stem}_{suffix}{extension}", output)
 
         # Remove the original downloaded file
         file_path.unlink()
 
 
+    def _encode(self, video_id: str, path: Path, data: np.ndarray):
+        """Encode an output file, inline or in the encoder pool (at most 2 pending encodings per worker)."""
+        if self.encoder is None:
+            with self.metrics.stage('write'):
+                encode_audio(path, data, self.target_sr, self.codec, self.compression_level)
+            return
+        self._collect_encodings()
+        while len(self._encodings) >= 2 * self.encode_workers:
+            self._collect_encodings(FIRST_COMPLETED)
+        future = self.encoder.submit(encode_audio, path, data, self.target_sr, self.codec, self.compression_level)
+        self._encodings[future] = (self._sample_idx, video_id)
+
+
+    def _collect_encodings(self, return_when: str = None):
+        """
+        Collect the finished pool encodings (encoding times, failures), after waiting for the first or all of them.
+
+        :param return_when: None (no waiting), FIRST_COMPLETED or ALL_COMPLETED.
+        """
+        if return_when is not None and self._encodings:
+            wait(self._encodings, return_when=return_when)
+        for future in [future for future in self._encodings if future.done()]:
+            idx, video_id = self._encodings.pop(future)
+            try:
+                self.metrics.observe('write', future.result())
+            except Exception as e:
+                self._encoding_failed(idx, video_id, e)
+
+
+    def _encoding_failed(self, idx: int, video_id: str, error: Exception):
+        """A sample (row idx) whose (pool) encoding failed is reverted to not downloaded, and reported as missing."""
+        if idx == self._sample_idx:
+            raise error  # sample still being processed: it fails as with inline encoding
+        self._log(f"Error encoding video ID '{video_id}': {error}")
+        if not self.data.downloaded[idx]:
+            return  # already reverted (another output of the sample)
+        self.data.downloaded[idx] = False
+        if self.live_stats is not None:
+            self.live_stats.update(idx, False)
+        # The sample was reported a few (pending encodings) samples ago at most
+        for pos in range(len(self.downloaded_samples) - 1, -1, -1):
+            if self.downloaded_samples[pos]['video_id'] == video_id:
+                sample = self.downloaded_samples.pop(pos)
+                self.labels_counter.subtract(sample['labels'])
+                self.labels_counter = +self.labels_counter  # drop the zero counts
+                self.missing_samples.append(sample)
+                break
+        if self.coordinator is None:
+            self._save_data_to_csv()
+
+
     def generate_reports(self):
         """Generate reports for successful and failed downloads."""
         self._write_report("Missing_samples_report.txt", self.missing_samples)
@@ -252,7 +711,9 @@ class StandardDownloader:
 
 
     def _write_report(self, filename: str, content, count_report=False):
-        """Helper to write contents to TXT report files."""
+        """Helper to write contents to TXT report files (per worker, with leases)."""
+        if self.coordinator is not None:
+            filename = f"{self.coordinator.worker_id}_{filename}"
         path = self.download_folder / filename
         with path.open("w") as file:
             for item in content:
@@ -5,6 +5,8 @@ import csv
 from typing import List, Optional
 from collections import defaultdict, Counter
 import random
+import numpy as np
+from audioset_tools.utils import line_offsets, copy_byte_range
 
 
 # Original AudioSet CSV functions
@@ -158,15 +160,18 @@ def select_by_samp_idx(data_file: str,
                        start_idx: int,
                        end_idx: int,
                        out_filename: str,
-                       verbose: bool = False):
+                       verbose: bool = False,
+                       use_index: bool = True):
     """
-    AudioSet CSV segments filter: selection by specific row interval (works w. both Original and Processed-CSVs)
+    AudioSet CSV segments filter: selection by specific row interval (works w. both Original and Processed-CSVs).
+    Rows are located through a (cached) line-offset index and copied as raw bytes, without CSV parsing.
 
     :param data_file: Path to the CSV file containing video information.
     :param start_idx: Starting row index for the selection (0-based).
     :param end_idxx: Ending row index for the selection (0-based, exclusive).
     :param out_filename: Path to the output CSV file for filtered data.
     :param verbose: If True, enables debug printing. Default is False.
+    :param use_index: If True, load (or save) the cached line-offset index (see utils.line_offsets).
 
     Example:
     >>> from_2_to_10_samples_CSV -> select_by_indices(data_file='path/to/audioset_samples.csv', 
@@ -187,25 +192,75 @@ def select_by_samp_idx(data_file: str,
     if verbose:
         print(f"Selecting samples in [{start_idx}, {end_idx}[ interval.")
 
-    # Filtering routine
-    with open(dataset_file_path, 'r') as dataset_file, open(output_file_path, 'w', newline='') as output_file:
-        reader = csv.reader(dataset_file)
-        writer = csv.writer(output_file)
-
-        # Write header and process rows
-        for i, row in enumerate(reader):
-            if i == 0:  # Write the header
-                writer.writerow(row)
-                continue
-
-            # Write rows based on given interval
-            if start_idx <= i < end_idx:
-                writer.writerow(row)
+    # Filtering routine: header and rows interval raw copy (rows located by the line-offset index)
+    offsets = line_offsets(dataset_file_path, use_cache=use_index)
+    num_lines = len(offsets) - 1
+    first, last = max(start_idx, 1), min(end_idx, num_lines)
+    with open(dataset_file_path, 'rb') as dataset_file, open(output_file_path, 'wb') as output_file:
+        _copy_line(dataset_file, output_file, offsets, 0)
+        if first < last:
+            copy_byte_range(dataset_file, output_file, int(offsets[first]), int(offsets[last]))
 
     if verbose:
         print(f"Filtered dataset CSV saved to {output_file_path}")
 
 
+def _copy_line(src, dst, offsets, idx):
+    # Copy line idx (newline-terminated)
+    if idx >= len(offsets) - 1:
+        return
+    src.seek(int(offsets[idx]))
+    line = src.read(int(offsets[idx + 1] - offsets[idx]))
+    dst.write(line if line.endswith(b'\n') else line + b'\n')
+
+
+def split_into_shards(data_file: str,
+                      num_shards: int,
+                      out_folder: Optional[str] = None,
+                      use_index: bool = True,
+                      verbose: bool = False) -> List[Path]:
+    """
+    AudioSet CSV splitter: split rows into num_shards balanced (contiguous) shards, each with the CSV header
+    (e.g. to distribute downloads across machines). Works w. both Original and Processed-CSVs.
+
+    :param data_file: Path to the CSV file containing video information.
+    :param num_shards: Number of shards.
+    :param out_folder: Output folder (default: the data_file folder), shards being named
+                       "<data_file>_shard_<k>-of-<num_shards>.csv".
+    :param use_index: If True, load (or save) the cached line-offset index (see utils.line_offsets).
+    :param verbose: If True, enables debug printing. Default is False.
+    :return: List of shard paths.
+
+    Example:
+    >>> shards = split_into_shards(data_file='path/to/audioset_samples.csv', num_shards=8, out_folder='path/to/shards')
+    """
+    cwd = Path.cwd()
+    dataset_file_path = cwd / data_file
+    if not dataset_file_path.exists():
+        raise FileNotFoundError(f"Dataset file {data_file} not found.")
+    if num_shards < 1:
+        raise ValueError("num_shards must be >= 1.")
+    out_folder_path = cwd / out_folder if out_folder is not None else dataset_file_path.parent
+    out_folder_path.mkdir(parents=True, exist_ok=True)
+
+    offsets = line_offsets(dataset_file_path, use_cache=use_index)
+    num_lines = len(offsets) - 1
+    bounds = np.linspace(min(1, num_lines), num_lines, num_shards + 1).round().astype(np.int64)
+
+    shard_paths = []
+    with open(dataset_file_path, 'rb') as dataset_file:
+        for k in range(num_shards):
+            shard_path = out_folder_path / f"{dataset_file_path.stem}_shard_{k + 1:03d}-of-{num_shards:03d}.csv"
+            with open(shard_path, 'wb') as shard_file:
+                _copy_line(dataset_file, shard_file, offsets, 0)
+                copy_byte_range(dataset_file, shard_file, int(offsets[bounds[k]]), int(offsets[bounds[k + 1]]))
+            shard_paths.append(shard_path)
+            if verbose:
+                print(f"Rows [{bounds[k]}, {bounds[k + 1]}[ saved to {shard_path}")
+
+    return shard_paths
+
+
 # Processed AudioSet CSV functions
 def reselect_by_label(labels_file: str, 
                       data_file: str,
@@ -0,0 +1,275 @@
+from pathlib import Path
+import os
+import json
+import time
+import uuid
+import random
+import socket
+from typing import Optional
+
+
+class LeaseCoordinator:
+    def __init__(self,
+                 data_file: str,
+                 num_rows: int,
+                 chunk_size: int = 50,
+                 lease_timeout: float = 900.0,
+                 lease_dir: Optional[str] = None,
+                 worker_id: Optional[str] = None,
+                 poll_interval: float = 30.0):
+        """
+        Multi-node work-sharding coordinator for downloads (processes sharing the same CSV on shared storage).
+        Rows are partitioned into chunks, which workers claim through lease files, using lock-free atomic
+        filesystem operations only (also atomic on NFS):
+          - a chunk is claimed by hard-linking a complete (temporary) lease file as "chunk_<k>.lease": the link fails
+            if the chunk is already leased;
+          - the lease owner renews its expiry time while working, by renaming its lease away (only if it still holds it)
+            and re-creating it, so that a lease reclaimed in the meantime is never overwritten; a crashed worker lease
+            expires and the chunk can be reclaimed: the expired lease is first renamed away (only one worker succeeds);
+          - results are committed by hard-linking "chunk_<k>.done" (rows downloaded flags), the first commit wins;
+          - chunks with failed rows can be reopened for a retry round, by renaming their results to "chunk_<k>.retry".
+        A chunk may thus be processed twice (e.g. a worker stalling beyond its lease), but is committed once.
+
+        :param data_file: Path to the CSV file containing video information.
+        :param num_rows: Number of CSV rows.
+        :param chunk_size: Number of rows per lease.
+        :param lease_timeout: Lease duration (sec.) since the last renewal, before it can be reclaimed.
+        :param lease_dir: Leases folder (default: "<data_file>_leases" next to the CSV file).
+        :param worker_id: Unique worker name (default: <hostname>-<pid>-<random suffix>).
+        :param poll_interval: Waiting time (sec.) between claim attempts, while other workers hold the last leases.
+        """
+        self.data_file = Path(data_file)
+        self.lease_dir = Path(lease_dir) if lease_dir else self.data_file.parent / f"{self.data_file.stem}_leases"
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+
+        # The first worker publishes the chunks plan, the others must agree on it
+        plan = {"num_rows": num_rows, "chunk_size": chunk_size}
+        plan_path = self.lease_dir / "plan.json"
+        if not self._publish(plan_path, plan):
+            plan = self._read(plan_path)
+            if plan is None or plan["num_rows"] != num_rows:
+                raise ValueError(f"Leases plan {plan_path} does not match {self.data_file.name} ({num_rows} rows).")
+        self.num_rows = plan["num_rows"]
+        self.chunk_size = plan["chunk_size"]
+        self.num_chunks = -(-self.num_rows // self.chunk_size)
+
+
+    def _write_tmp(self, payload: dict) -> Path:
+        """Write payload to a worker-unique temporary file."""
+        tmp_path = self.lease_dir / f".{self.worker_id}.{uuid.uuid4().hex}.tmp"
+        with tmp_path.open('w') as file:
+            json.dump(payload, file)
+        return tmp_path
+
+
+    def _publish(self, path: Path, payload: dict) -> bool:
+        """Atomically create path with payload, if it does not exist yet."""
+        tmp_path = self._write_tmp(payload)
+        try:
+            os.link(tmp_path, path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            tmp_path.unlink()
+
+
+    @staticmethod
+    def _read(path: Path):
+        try:
+            with path.open('r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+
+    def _lease_path(self, chunk: int) -> Path:
+        return self.lease_dir / f"chunk_{chunk:06d}.lease"
+
+
+    def _done_path(self, chunk: int) -> Path:
+        return self.lease_dir / f"chunk_{chunk:06d}.done"
+
+
+    def _retry_path(self, chunk: int) -> Path:
+        return self.lease_dir / f"chunk_{chunk:06d}.retry"
+
+
+    def _lease(self) -> dict:
+        return {"owner": self.worker_id, "expires": time.time() + self.lease_timeout}
+
+
+    def chunk_rows(self, chunk: int) -> range:
+        """Rows (indices) of a chunk."""
+        return range(chunk * self.chunk_size, min((chunk + 1) * self.chunk_size, self.num_rows))
+
+
+    def is_done(self, chunk: int) -> bool:
+        return self._done_path(chunk).exists()
+
+
+    def try_claim(self, chunk: int) -> bool:
+        """Try to lease a chunk (not committed yet, and free or expired)."""
+        if self.is_done(chunk):
+            return False
+        lease_path = self._lease_path(chunk)
+        if self._publish(lease_path, self._lease()):
+            return self._check_claim(chunk)
+
+        lease = self._read(lease_path)
+        if lease is None or lease["expires"] > time.time():
+            return False
+
+        # Expired lease: move it away (a single worker succeeds), then claim the chunk
+        stale_path = lease_path.with_name(f"{lease_path.name}.{self.worker_id}.stale")
+        try:
+            os.rename(lease_path, stale_path)
+        except FileNotFoundError:
+            return False
+        moved = self._read(stale_path)
+        if moved != lease:
+            # A fresh lease (reclaimed in the meantime by another worker) was moved: put it back
+            try:
+                os.link(stale_path, lease_path)
+            except FileExistsError:
+                pass
+            stale_path.unlink()
+            return False
+        stale_path.unlink()
+        return self._publish(lease_path, self._lease()) and self._check_claim(chunk)
+
+
+    def _check_claim(self, chunk: int) -> bool:
+        """A chunk committed (and released) while being claimed is given up."""
+        if self.is_done(chunk):
+            self.release(chunk)
+            return False
+        return True
+
+
+    def _take(self, chunk: int) -> bool:
+        """Atomically remove a held lease (False, leaving the lease file in place, if held by another worker)."""
+        lease_path = self._lease_path(chunk)
+        taken_path = lease_path.with_name(f"{lease_path.name}.{self.worker_id}.taken")
+        try:
+            os.rename(lease_path, taken_path)
+        except FileNotFoundError:
+            return False
+        lease = self._read(taken_path)
+        if lease is None or lease["owner"] != self.worker_id:
+            # Another worker lease was moved: put it back
+            try:
+                os.link(taken_path, lease_path)
+            except FileExistsError:
+                pass
+            taken_path.unlink()
+            return False
+        taken_path.unlink()
+        return True
+
+
+    def renew(self, chunk: int) -> bool:
+        """
+        Extend a held lease expiry time.
+
+        :return: False if the lease was lost (i.e. expired and reclaimed): the chunk must be given up.
+        """
+        return self._take(chunk) and self._publish(self._lease_path(chunk), self._lease())
+
+
+    def release(self, chunk: int):
+        """Give up a held lease."""
+        self._take(chunk)
+
+
+    def commit(self, chunk: int, results: dict) -> bool:
+        """
+        Commit a chunk results and release its lease.
+
+        :param results: {row index: downloaded flag (bool)}.
+        :return: True if committed, False if the chunk was already committed (by a worker it was reclaimed by).
+        """
+        committed = self._publish(self._done_path(chunk), {"owner": self.worker_id,
+                                                           "results": {str(idx): flag for idx, flag in results.items()}})
+        self.release(chunk)
+        return committed
+
+
+    def claims(self, wait: bool = True):
+        """
+        Generator of claimed chunks, until all chunks are committed (or, if not wait, until none can be claimed).
+        Chunks are scanned from a random position, to limit contention between workers.
+        """
+        while True:
+            offset = random.randrange(self.num_chunks) if self.num_chunks else 0
+            claimed = False
+            for i in range(self.num_chunks):
+                chunk = (offset + i) % self.num_chunks
+                if self.try_claim(chunk):
+                    claimed = True
+                    yield chunk
+            if claimed:
+                continue
+            if self.all_done() or not wait:
+                return
+            time.sleep(self.poll_interval)
+
+
+    def reopen_failed(self) -> int:
+        """
+        Reopen the committed chunks with failed (not downloaded) rows, so that they can be claimed again: their
+        results are moved to "chunk_<k>.retry" (atomic rename, a single worker succeeds), see retry_results().
+
+        :return: Number of reopened chunks.
+        """
+        reopened = 0
+        for chunk in range(self.num_chunks):
+            done = self._read(self._done_path(chunk))
+            if done is None or all(done["results"].values()):
+                continue
+            try:
+                os.replace(self._done_path(chunk), self._retry_path(chunk))
+                reopened += 1
+            except FileNotFoundError:
+                pass
+        return reopened
+
+
+    def retry_results(self, chunk: int) -> dict:
+        """Results of a reopened chunk previous commit: {row index: downloaded flag} (empty if not reopened)."""
+        retry = self._read(self._retry_path(chunk))
+        return {int(idx): flag for idx, flag in retry["results"].items()} if retry is not None else {}
+
+
+    def all_done(self) -> bool:
+        return all(self.is_done(chunk) for chunk in range(self.num_chunks))
+
+
+    def results(self) -> dict:
+        """Committed results: {row index: downloaded flag} (of the last commit of reopened chunks)."""
+        results = {}
+        for chunk in range(self.num_chunks):
+            results.update(self.retry_results(chunk))
+            done = self._read(self._done_path(chunk))
+            if done is not None:
+                results.update({int(idx): flag for idx, flag in done["results"].items()})
+        return results
+
+
+    def status(self) -> dict:
+        """Chunks count per state: done, leased, expired (reclaimable) and pending."""
+        status = {"done": 0, "leased": 0, "expired": 0, "pending": 0}
+        now = time.time()
+        for chunk in range(self.num_chunks):
+            if self.is_done(chunk):
+                status["done"] += 1
+                continue
+            lease = self._read(self._lease_path(chunk))
+            if lease is None:
+                status["pending"] += 1
+            else:
+                status["leased" if lease["expires"] > now else "expired"] += 1
+        return status
@@ -0,0 +1,207 @@
+from pathlib import Path
+import os
+import json
+import time
+import tempfile
+from collections import Counter, deque
+from contextlib import contextmanager
+
+
+class DownloadMetrics:
+    STAGES = ('queue_wait', 'fetch', 'extract', 'read', 'resample', 'write', 'commit')
+    ERROR_CLASSES = {'bot_check': ["Sign in to confirm you’re not a bot"],
+                     'shadow_ban': ["This content isn't available, try again later.",
+                                    "This content isn’t available.",
+                                    "The following content is not available on this app."],
+                     'unavailable': ["Video unavailable", "This video is not available", "removed"],
+                     'private': ["Private video"],
+                     'age_restricted': ["confirm your age", "age-restricted"],
+                     'copyright': ["copyright"],
+                     'rate_limit': ["HTTP Error 429", "Too Many Requests"],
+                     'network': ["timed out", "Connection", "HTTP Error 5", "Unable to download webpage"],
+                     'audio': ["Error opening", "Format not recognised", "ffmpeg", "ffprobe"]}
+
+    def __init__(self,
+                 events_file: str = None,
+                 prometheus_file: str = None,
+                 prometheus_interval: float = 15.0,
+                 window: float = 3600.0,
+                 ewma_alpha: float = 0.05,
+                 clock=time.time):
+        """
+        Downloader instrumentation: per-stage timings (queue wait, yt-dlp fetch, ffmpeg extraction, reading,
+        resampling, writing and state commit), rolling throughput (samples/hour and audio-seconds/hour), error rates
+        per class, and ETA from an adaptive (exponentially weighted) per-sample time.
+        Samples are logged as JSONL events, and metrics optionally exported as a Prometheus text file (atomically
+        replaced, e.g. for node_exporter textfile collector).
+
+        :param events_file: JSONL events file path (appended to), if any.
+        :param prometheus_file: Prometheus text file path (e.g. "<collector_dir>/audioset_download.prom"), if any.
+        :param prometheus_interval: Minimum time (sec.) between two Prometheus file updates.
+        :param window: Rolling throughput window (sec.).
+        :param ewma_alpha: Smoothing factor of the per-sample time used for ETA.
+        :param clock: Wall clock function (sec.), e.g. a simulation.VirtualClock time.
+        """
+        self.events_file = Path(events_file) if events_file else None
+        self.prometheus_file = Path(prometheus_file) if prometheus_file else None
+        self.prometheus_interval = prometheus_interval
+        self.window = window
+        self.ewma_alpha = ewma_alpha
+        self.clock = clock
+
+        self.stage_seconds = Counter()
+        self.stage_counts = Counter()
+        self.samples = Counter()
+        self.errors = Counter()
+        self.audio_seconds = 0.0
+        self.remaining = None
+        self.recent = deque()  # (end time, audio seconds) of the successful samples within window
+        self.sample_time = None  # EWMA of the wall time per sample (sec.)
+        self.start_time = self.clock()
+        self.last_sample_end = None
+        self.last_export = 0.0
+        self.current = {}  # current sample stage timings
+        self._events = self.events_file.open('a', buffering=1) if self.events_file else None
+
+
+    def _emit(self, event: str, **fields):
+        if self._events is not None:
+            self._events.write(json.dumps({"ts": round(self.clock(), 3), "event": event, **fields}) + "\n")
+
+
+    @classmethod
+    def error_class(cls, error) -> str:
+        """Classify a download/processing error (exception or message)."""
+        message = str(error)
+        for name, patterns in cls.ERROR_CLASSES.items():
+            if any(pattern.lower() in message.lower() for pattern in patterns):
+                return name
+        return 'other'
+
+
+    def observe(self, stage: str, seconds: float):
+        """Record a stage duration (for the current sample)."""
+        self.stage_seconds[stage] += seconds
+        self.stage_counts[stage] += 1
+        self.current[stage] = self.current.get(stage, 0.0) + seconds
+
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Time a stage: with metrics.stage('write'): ..."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(stage, self.clock() - start)
+
+
+    def start(self, total: int):
+        """Start of a downloading run, with total samples to process."""
+        self.remaining = total
+        self.start_time = self.last_sample_end = self.clock()
+        self._emit("start", total=total)
+
+
+    def sample_done(self, video_id: str, audio_seconds: float = 0.0, error=None):
+        """
+        End of a sample processing (successful if error is None): updates throughput, error rates and ETA, logs
+        the sample event (with its stage timings) and exports metrics.
+        """
+        now = self.clock()
+        status = 'ok' if error is None else 'failed'
+        self.samples[status] += 1
+        if error is None:
+            self.audio_seconds += audio_seconds
+            self.recent.append((now, audio_seconds))
+        else:
+            self.errors[self.error_class(error)] += 1
+        if self.remaining:
+            self.remaining -= 1
+
+        # Adaptive per-sample time (queue wait included, i.e. the time between consecutive samples ends)
+        if self.last_sample_end is not None:
+            elapsed = now - self.last_sample_end
+            self.sample_time = elapsed if self.sample_time is None else \
+                self.ewma_alpha * elapsed + (1 - self.ewma_alpha) * self.sample_time
+        self.last_sample_end = now
+
+        self._emit("sample", video_id=video_id, status=status, audio_seconds=audio_seconds,
+                   error_class=None if error is None else self.error_class(error),
+                   error=None if error is None else str(error)[:300],
+                   stages={stage: round(seconds, 4) for stage, seconds in self.current.items()})
+        self.current = {}
+        self.export()
+
+
+    def throughput(self) -> dict:
+        """Rolling (window) throughput: samples/hour and audio-seconds/hour."""
+        now = self.clock()
+        while self.recent and self.recent[0][0] < now - self.window:
+            self.recent.popleft()
+        span = min(self.window, max(now - self.start_time, 1e-9))
+        return {"samples_per_hour": 3600.0 * len(self.recent) / span,
+                "audio_seconds_per_hour": 3600.0 * sum(seconds for _, seconds in self.recent) / span}
+
+
+    def eta(self) -> float:
+        """Estimated remaining time (sec.), None if unknown."""
+        if self.remaining is None or self.sample_time is None:
+            return None
+        return self.remaining * self.sample_time
+
+
+    def summary(self) -> dict:
+        processed = sum(self.samples.values())
+        return {"samples": dict(self.samples),
+                "remaining": self.remaining,
+                "audio_seconds": round(self.audio_seconds, 3),
+                "stage_seconds": {stage: round(self.stage_seconds[stage], 3) for stage in self.STAGES},
+                "stage_mean_seconds": {stage: round(self.stage_seconds[stage] / self.stage_counts[stage], 4)
+                                       for stage in self.STAGES if self.stage_counts[stage]},
+                "error_rates": {name: count / processed for name, count in self.errors.items()} if processed else {},
+                "sample_seconds_ewma": self.sample_time,
+                "eta_seconds": self.eta(),
+                **self.throughput()}
+
+
+    def prometheus_text(self) -> str:
+        prefix = "audioset_download"
+        summary = self.summary()
+        lines = [f"# TYPE {prefix}_samples_total counter"]
+        lines += [f'{prefix}_samples_total{{status="{status}"}} {self.samples[status]}' for status in ('ok', 'failed')]
+        lines += [f"# TYPE {prefix}_errors_total counter"]
+        lines += [f'{prefix}_errors_total{{class="{name}"}} {count}' for name, count in sorted(self.errors.items())]
+        lines += [f"# TYPE {prefix}_stage_seconds summary"]
+        for stage in self.STAGES:
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {self.stage_seconds[stage]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {self.stage_counts[stage]}')
+        lines += [f"# TYPE {prefix}_audio_seconds_total counter", f"{prefix}_audio_seconds_total {self.audio_seconds:.3f}"]
+        for name in ("samples_per_hour", "audio_seconds_per_hour"):
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {summary[name]:.3f}"]
+        if self.remaining is not None:
+            lines += [f"# TYPE {prefix}_remaining_samples gauge", f"{prefix}_remaining_samples {self.remaining}"]
+        if summary["eta_seconds"] is not None:
+            lines += [f"# TYPE {prefix}_eta_seconds gauge", f"{prefix}_eta_seconds {summary['eta_seconds']:.1f}"]
+        return "\n".join(lines) + "\n"
+
+
+    def export(self, force: bool = False):
+        """Write the Prometheus text file (atomically), at most every prometheus_interval seconds (unless force)."""
+        now = time.monotonic()
+        if self.prometheus_file is None or (not force and now - self.last_export < self.prometheus_interval):
+            return
+        with tempfile.NamedTemporaryFile('w', dir=self.prometheus_file.parent, prefix=f".{self.prometheus_file.name}.",
+                                         suffix='.tmp', delete=False) as file:
+            file.write(self.prometheus_text())
+        os.replace(file.name, self.prometheus_file)
+        self.last_export = now
+
+
+    def close(self):
+        """End of a downloading run: summary event and final export."""
+        self._emit("end", **self.summary())
+        self.export(force=True)
+        if self._events is not None:
+            self._events.close()
+            self._events = None
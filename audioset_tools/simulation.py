@@ -0,0 +1,365 @@
+from pathlib import Path
+import csv
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+from collections import deque
+from typing import Optional
+import numpy as np
+import soundfile as sf
+from yt_dlp.utils import DownloadError
+from audioset_tools.downloaders import StandardDownloader
+
+
+class VirtualClock:
+    def __init__(self):
+        """
+        Wall clock of a simulated downloading run: real elapsed time (i.e. DSP, I/O and state commits, actually
+        executed) plus the simulated waits (network latencies, sleeps, cookie refreshes), which are not slept.
+        """
+        self.epoch = time.time()
+        self.origin = time.perf_counter()
+        self.offset = 0.0
+
+
+    def time(self) -> float:
+        return self.epoch + time.perf_counter() - self.origin + self.offset
+
+
+    def sleep(self, seconds: float):
+        self.offset += max(seconds, 0.0)
+
+
+    def elapsed(self) -> float:
+        return self.time() - self.epoch
+
+
+class SyntheticBackend:
+    FAILURE_MESSAGES = {'unavailable': "Video unavailable",
+                        'private': "Private video. Sign in if you've been granted access to this video",
+                        'age_restricted': "Sign in to confirm your age. This video may be inappropriate for some users.",
+                        'copyright': "This video contains content from a rights holder, who has blocked it on copyright grounds.",
+                        'network': "Unable to download webpage: <urlopen error timed out>"}
+    BOT_CHECK_MESSAGE = "Sign in to confirm you’re not a bot. This helps protect our community."
+    SHADOW_BAN_MESSAGE = "This content isn't available, try again later."
+
+    def __init__(self,
+                 latency_median: float = 0.8,
+                 latency_sigma: float = 0.5,
+                 requests_per_download: int = 4,
+                 transfer_seconds_per_minute: float = 1.5,
+                 extract_seconds_per_minute: float = 0.4,
+                 failure_rates: Optional[dict] = None,
+                 rate_limit_requests: int = 600,
+                 rate_limit_window: float = 3600.0,
+                 shadow_ban_after: int = 3,
+                 cookie_refresh_seconds: float = 120.0,
+                 concurrency: int = 1,
+                 video_tail_mean: float = 60.0,
+                 sample_rates: tuple = (44100, 48000),
+                 channels: int = 2,
+                 clock: Optional[VirtualClock] = None,
+                 seed: int = 0):
+        """
+        Synthetic yt-dlp backend (yt_dlp.YoutubeDL compatible, see youtube_dl()) for offline downloading simulations:
+          - each download issues requests_per_download requests (separated by the yt-dlp 'sleep_requests' option),
+            with log-normal latencies, then transfers and extracts the audio in a time proportional to the video
+            duration (all simulated on the virtual clock);
+          - downloads fail at random with the given per-class probabilities (error messages as yt-dlp ones);
+          - more than rate_limit_requests requests within rate_limit_window trigger bot checks (cleared by a cookie
+            refresh), and more than shadow_ban_after bot checks within the window a (permanent) shadow-ban;
+          - successful downloads write a synthetic "<id>.wav" (noise and tones) of the whole video: AudioSet segment
+            end plus an exponentially distributed tail, at a random native sampling rate.
+        Concurrency is approximated: the other (concurrency - 1) workers behind the same IP address follow the same
+        policy, i.e. each request counts concurrency times towards the rate limit.
+
+        :param latency_median: Median request latency (sec.).
+        :param latency_sigma: Log-normal latency shape (standard deviation of the latency logarithm).
+        :param requests_per_download: Requests per download (webpage, player API, formats, media).
+        :param transfer_seconds_per_minute: Audio transfer time (sec.) per minute of video.
+        :param extract_seconds_per_minute: ffmpeg audio extraction time (sec.) per minute of video.
+        :param failure_rates: Failure probability per error class (see FAILURE_MESSAGES).
+        :param rate_limit_requests: Maximum number of requests (from all workers) within rate_limit_window.
+        :param rate_limit_window: Rate limit sliding window (sec.).
+        :param shadow_ban_after: Number of bot checks within rate_limit_window before a shadow-ban.
+        :param cookie_refresh_seconds: Time (sec.) of a (manual) cookies refresh.
+        :param concurrency: Number of workers sharing the same IP address (and policy).
+        :param video_tail_mean: Mean video duration (sec.) after the AudioSet segment end.
+        :param sample_rates: Native sampling rates of the videos audio (drawn uniformly).
+        :param channels: Native number of channels.
+        :param clock: Virtual clock (default: a new one).
+        :param seed: Random seed.
+        """
+        if failure_rates is None:
+            failure_rates = {'unavailable': 0.06, 'private': 0.02, 'age_restricted': 0.01, 'copyright': 0.005,
+                             'network': 0.01}
+        unknown = set(failure_rates) - set(self.FAILURE_MESSAGES)
+        if unknown:
+            raise ValueError(f"Unknown failure classes: {sorted(unknown)}.")
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.requests_per_download = requests_per_download
+        self.transfer_seconds_per_minute = transfer_seconds_per_minute
+        self.extract_seconds_per_minute = extract_seconds_per_minute
+        self.failure_rates = failure_rates
+        self.rate_limit_requests = rate_limit_requests
+        self.rate_limit_window = rate_limit_window
+        self.shadow_ban_after = shadow_ban_after
+        self.cookie_refresh_seconds = cookie_refresh_seconds
+        self.concurrency = concurrency
+        self.video_tail_mean = video_tail_mean
+        self.sample_rates = sample_rates
+        self.channels = channels
+        self.clock = clock or VirtualClock()
+        self.rng = np.random.default_rng(seed)
+
+        self.segment_ends = {}  # {video id: AudioSet segment end (sec.)}, see expect()
+        self.requests = deque()  # virtual times of the requests within the rate limit window
+        self.bot_checks = deque()  # virtual times of the bot checks within the rate limit window
+        self.flagged = False
+        self.banned = False
+        self.num_requests = 0
+        self.num_bot_checks = 0
+        self.cookie_refreshes = 0
+
+
+    def youtube_dl(self, opts: dict):
+        """yt_dlp.YoutubeDL replacement: with backend.youtube_dl(opts) as ydl: ydl.download([video_id])."""
+        return _SyntheticYoutubeDL(self, opts)
+
+
+    def expect(self, video_id: str, end_seconds: float):
+        """Register the AudioSet segment end of a video (its synthetic audio lasts at least as much)."""
+        self.segment_ends[video_id] = end_seconds
+
+
+    def refresh_cookies(self):
+        """Simulated manual cookies refresh: clears the bot check flag."""
+        self.clock.sleep(self.cookie_refresh_seconds)
+        self.flagged = False
+        self.cookie_refreshes += 1
+
+
+    def _expire(self, events: deque, now: float):
+        while events and events[0] <= now - self.rate_limit_window:
+            events.popleft()
+
+
+    def _request(self, video_id: str):
+        """Simulate a request (latency and rate limiting)."""
+        self.clock.sleep(self.rng.lognormal(np.log(self.latency_median), self.latency_sigma))
+        now = self.clock.time()
+        self.num_requests += 1
+        self.requests.append(now)
+        self._expire(self.requests, now)
+        self._expire(self.bot_checks, now)
+        if not self.banned and not self.flagged and \
+                len(self.requests) * self.concurrency > self.rate_limit_requests:
+            self.flagged = True
+            self.num_bot_checks += 1
+            self.bot_checks.append(now)
+            self.banned = len(self.bot_checks) > self.shadow_ban_after
+        if self.banned:
+            raise DownloadError(f"ERROR: [youtube] {video_id}: {self.SHADOW_BAN_MESSAGE}")
+        if self.flagged:
+            raise DownloadError(f"ERROR: [youtube] {video_id}: {self.BOT_CHECK_MESSAGE}")
+
+
+    def download(self, video_id: str, opts: dict):
+        """Simulate a yt-dlp download (and audio extraction) of a video, to "<outtmpl with ext='wav'>"."""
+        for i in range(self.requests_per_download):
+            if i:
+                self.clock.sleep(opts.get('sleep_requests', 0.0))
+            self._request(video_id)
+
+        for error_class, rate in self.failure_rates.items():
+            if self.rng.random() < rate:
+                raise DownloadError(f"ERROR: [youtube] {video_id}: {self.FAILURE_MESSAGES[error_class]}")
+
+        duration = self.segment_ends.get(video_id, 10.0) + self.rng.exponential(self.video_tail_mean)
+        self.clock.sleep(duration / 60.0 * self.transfer_seconds_per_minute)
+
+        hooks = opts.get('postprocessor_hooks', [])
+        for hook in hooks:
+            hook({'status': 'started', 'postprocessor': 'ExtractAudio'})
+        self.clock.sleep(duration / 60.0 * self.extract_seconds_per_minute)
+        sr = int(self.rng.choice(self.sample_rates))
+        file_path = opts.get('outtmpl', '%(id)s.%(ext)s') % {'id': video_id, 'ext': 'wav'}
+        sf.write(file_path, self.synthetic_audio(duration, sr), sr)
+        for hook in hooks:
+            hook({'status': 'finished', 'postprocessor': 'ExtractAudio'})
+
+
+    def synthetic_audio(self, duration: float, sr: int) -> np.ndarray:
+        """Pink-ish noise plus a few tones, (frames, channels) float32."""
+        num_frames = int(duration * sr)
+        t = np.arange(num_frames, dtype=np.float32) / sr
+        tones = sum(np.sin(2 * np.pi * self.rng.uniform(100, 4000) * t, dtype=np.float32) for _ in range(3))
+        noise = np.cumsum(self.rng.standard_normal((num_frames, self.channels), dtype=np.float32), axis=0)
+        noise -= np.linspace(noise[0], noise[-1], num_frames, dtype=np.float32)  # remove the random walk drift
+        noise /= np.abs(noise).max() + 1e-9
+        return (0.1 * tones[:, None] + 0.2 * noise).clip(-1.0, 1.0)
+
+
+class _SyntheticYoutubeDL:
+    def __init__(self, backend: SyntheticBackend, opts: dict):
+        self.backend = backend
+        self.opts = opts
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+    def download(self, video_ids: list):
+        for video_id in video_ids:
+            self.backend.download(video_id, self.opts)
+        return 0
+
+
+class SimulatedDownloader(StandardDownloader):
+    def __init__(self, backend: SyntheticBackend, **kwargs):
+        """
+        StandardDownloader running against a synthetic backend on its virtual clock: the whole scheduling, DSP and
+        state (CSV, live statistics, metrics) pipeline is executed, but the downloads, sleeps and cookie refreshes
+        are simulated. To be run on a copy of the dataset CSV (see simulate()).
+
+        :param backend: Synthetic yt-dlp backend.
+        :param kwargs: StandardDownloader arguments.
+        """
+        super().__init__(**kwargs)
+        self.backend = backend
+        self.youtube_dl = backend.youtube_dl
+        self.clock = backend.clock.time
+        self.sleep = backend.clock.sleep
+        self.metrics.clock = backend.clock.time
+
+
+    def refresh_cookies(self):
+        """Simulated manual cookies refresh (no Firefox)."""
+        self.backend.refresh_cookies()
+
+
+    def download_and_process_audio(self, youtube_id: str, label_names: list, start_sec: float, end_sec: float):
+        self.backend.expect(youtube_id, end_sec)
+        super().download_and_process_audio(youtube_id, label_names, start_sec, end_sec)
+
+
+def simulate(data_file: str,
+             labels_file: str,
+             num_samples: Optional[int] = 100,
+             sleep_range: tuple = (5.0, 20.0),
+             sleep_requests: float = 1.25,
+             concurrency: int = 1,
+             backend_options: Optional[dict] = None,
+             downloader_options: Optional[dict] = None,
+             work_dir: Optional[str] = None) -> dict:
+    """
+    Simulate a downloading run of (the first num_samples rows of) a dataset CSV with a given scheduling policy, and
+    project its wall time and throughput.
+
+    :param data_file: Dataset CSV (copied, the original is left untouched).
+    :param labels_file: Labels CSV.
+    :param num_samples: Number of (first) rows to simulate (None for all).
+    :param sleep_range: Range (sec.) of the random sleep between two samples.
+    :param sleep_requests: yt-dlp sleep (sec.) between the requests of a download.
+    :param concurrency: Number of workers sharing the same IP address (see SyntheticBackend).
+    :param backend_options: SyntheticBackend arguments.
+    :param downloader_options: Other StandardDownloader arguments (e.g. target_sr, channels_proc).
+    :param work_dir: Simulation folder (CSV copy, downloads), default: a temporary folder (removed).
+    :return: Simulation report: policy, samples outcome, projected wall time and throughput (all workers), full
+             dataset ETA, and the downloader metrics summary.
+    """
+    data_file, labels_file = Path(data_file).resolve(), Path(labels_file).resolve()
+    with data_file.open('r', newline='') as file:
+        rows = list(csv.reader(file))
+    header, rows = rows[0], [row for row in rows[1:] if row]
+    total_rows = len(rows)
+    if 'downloaded' in header:
+        flag = header.index('downloaded')
+        header = header[:flag] + header[flag + 1:]
+        rows = [row[:flag] + row[flag + 1:] for row in rows]
+    rows = rows[:num_samples] if num_samples is not None else rows
+
+    backend = SyntheticBackend(concurrency=concurrency, **(backend_options or {}))
+    with tempfile.TemporaryDirectory() if work_dir is None else contextlib.nullcontext(work_dir) as run_dir:
+        run_dir = Path(run_dir).resolve()
+        run_dir.mkdir(parents=True, exist_ok=True)
+        run_file = run_dir / data_file.name
+        with run_file.open('w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+        downloader_options = {"output_dir": str(run_dir), **(downloader_options or {})}
+        with SimulatedDownloader(backend, data_file=str(run_file), labels_file=str(labels_file),
+                                 sleep_range=sleep_range, sleep_requests=sleep_requests,
+                                 **downloader_options) as downloader:
+            downloader.download_and_process()
+            summary = downloader.metrics.summary()
+
+    wall_seconds = backend.clock.elapsed()
+    ok = summary["samples"].get('ok', 0)
+    processed = ok + summary["samples"].get('failed', 0)
+    samples_per_hour = concurrency * 3600.0 * processed / wall_seconds if wall_seconds else 0.0
+    return {"policy": {"sleep_range": list(sleep_range), "sleep_requests": sleep_requests,
+                       "concurrency": concurrency},
+            "samples": len(rows),
+            "processed": processed,
+            "downloaded": ok,
+            "halted": backend.banned,
+            "bot_checks": backend.num_bot_checks,
+            "requests": backend.num_requests,
+            "wall_seconds": round(wall_seconds, 1),
+            "samples_per_hour": round(samples_per_hour, 1),
+            "downloads_per_hour": round(samples_per_hour * ok / processed, 1) if processed else 0.0,
+            "audio_hours_per_day": round(24 * concurrency * summary["audio_seconds"] / wall_seconds, 2)
+            if wall_seconds else 0.0,
+            "dataset_eta_days": round(total_rows / samples_per_hour / 24, 2)
+            if samples_per_hour and not backend.banned else None,
+            "metrics": summary}
+
+
+def parse_policy(policy: str) -> dict:
+    """'min_sleep,max_sleep,sleep_requests,concurrency' (e.g. '5,20,1.25,1') to simulate() policy arguments."""
+    min_sleep, max_sleep, sleep_requests, concurrency = policy.split(',')
+    return {"sleep_range": (float(min_sleep), float(max_sleep)), "sleep_requests": float(sleep_requests),
+            "concurrency": int(concurrency)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark of downloader scheduling policies.")
+    parser.add_argument('--data_file', required=True)
+    parser.add_argument('--labels_file', default='./audioset_tools/original_csv_01-11-2024/class_labels_indices.csv')
+    parser.add_argument('--num_samples', type=int, default=100)
+    parser.add_argument('--policy', action='append', type=parse_policy,
+                        help="min_sleep,max_sleep,sleep_requests,concurrency (repeatable, default: 5,20,1.25,1).")
+    parser.add_argument('--backend', type=json.loads, default={}, help="SyntheticBackend arguments (JSON).")
+    parser.add_argument('--target_sr', type=int, default=32000)
+    parser.add_argument('--channels_proc', default='mono_red')
+    parser.add_argument('--output', help="JSON reports file.")
+    args = parser.parse_args()
+
+    reports = []
+    for policy in args.policy or [parse_policy('5,20,1.25,1')]:
+        reports.append(simulate(args.data_file, args.labels_file, args.num_samples, backend_options=args.backend,
+                                downloader_options={'target_sr': args.target_sr,
+                                                    'channels_proc': args.channels_proc}, **policy))
+
+    print(f"{'policy (sleep range, sleep_requests, concurrency)':<52}{'wall (h)':>10}{'samples/h':>11}"
+          f"{'ok/h':>9}{'bot checks':>12}{'halted':>8}{'dataset ETA (days)':>20}")
+    for report in reports:
+        policy = report["policy"]
+        name = f"{policy['sleep_range']}, {policy['sleep_requests']}, {policy['concurrency']}"
+        print(f"{name:<52}{report['wall_seconds'] / 3600:>10.2f}{report['samples_per_hour']:>11.1f}"
+              f"{report['downloads_per_hour']:>9.1f}{report['bot_checks']:>12}{str(report['halted']):>8}"
+              f"{str(report['dataset_eta_days']):>20}")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(reports, file, indent=2)
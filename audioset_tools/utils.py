@@ -1,18 +1,31 @@
+import os
 import csv
 import json
 import ast
+import copy
+import time
+import heapq
+import pickle
+import struct
+import hashlib
+import tempfile
+import zipfile
+import itertools
 from pathlib import Path
-from typing import List
-from collections import defaultdict
+from typing import List, Optional, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 
-def find_samps_by_samps(targets_file: str, data_file: str, verbose: bool = False):
+def find_samps_by_samps(targets_file: str, data_file: str, verbose: bool = False, use_cache: bool = True):
     """
-    Find samples in data_file that match the yt_ids in targets_file.
+    Find samples in data_file that match the yt_ids in targets_file (through the data_file SegmentIndex, see
+    segment_index).
     
     :param targets_file: File containing yt_ids to search for in data_file.
     :param data_file: File containing the data to search for matching yt_ids.
     :param verbose: Whether to print out the matching yt_ids.
+    :param use_cache: If True, load (or save) the cached data_file index.
     
     :returns tuple: 
         matching_rows: List(tuple(int, str))
@@ -27,7 +40,6 @@ def find_samps_by_samps(targets_file: str, data_file: str, verbose: bool = False
     """
     cwd = Path.cwd()
     targets_file_path = cwd / targets_file
-    data_file_path = cwd / data_file
 
     # Load yt_ids from targets_file into a set (fast lookup)
     yt_ids = set()
@@ -35,28 +47,528 @@ def find_samps_by_samps(targets_file: str, data_file: str, verbose: bool = False
         reader = csv.DictReader(targets_file)
         for row in reader:
             yt_ids.add(row['yt_id'])
-    
-    # Find matching yt_ids in data_file and store metadata
-    matching_rows = []
-    with open(data_file_path, 'r') as data_file:
-        reader = csv.DictReader(data_file)
-        for index, row in enumerate(reader):
-            if row['yt_id'] in yt_ids:
-                matching_rows.append((index, row['yt_id']))
-                if verbose:
-                    print(f"Sample IDX: {index}, yt_id: {row['yt_id']}")
+    yt_ids = np.array(sorted(yt_ids), dtype=str)
+
+    # Find matching yt_ids in data_file (index lookup) and store metadata
+    query_pos, rows = segment_index(data_file, use_cache).lookup(yt_ids)
+    matching_rows = sorted(zip(rows.tolist(), yt_ids[query_pos].tolist()))
+    if verbose:
+        for index, yt_id in matching_rows:
+            print(f"Sample IDX: {index}, yt_id: {yt_id}")
 
     return matching_rows, len(matching_rows)
 
 
-def compute_stats(data_file: str, labels_file: str, verbose: bool = False, save_json: bool = False):
+def _source_signature(file_path: Path) -> dict:
+    # Cached artifacts are valid as long as their source file is unchanged
+    stat = Path(file_path).stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# Errors of an unreadable (truncated, corrupt or foreign) cached .npz file, which is then rebuilt
+_CACHE_ERRORS = (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile)
+
+
+def _save_cache(cache_path: Path, save) -> bool:
+    """
+    Atomically write a cache file, through save(tmp_path) and a rename. Write failures (e.g. read-only or full data
+    folders) only skip the caching.
+
+    :return: True if saved.
+    """
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix='.tmp',
+                                         delete=False) as f:
+            tmp_path = f.name
+        save(tmp_path)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return False
+
+
+def line_offsets(data_file: str, use_cache: bool = True, block_size: int = 64 * 1024 ** 2) -> np.ndarray:
+    """
+    Byte offsets of the lines of a (CSV) file, from a vectorized newline scan, cached as "<data_file>_lines_index.npz"
+    and reused as long as the file is unchanged.
+
+    :param data_file: Path to the file.
+    :param use_cache: If True, load (or save) the cached index.
+    :param block_size: Scan block size in bytes.
+    :return: (L + 1,) uint64 array: line i spans bytes [offsets[i], offsets[i + 1]) (the last entry is the file size).
+    """
+    dataset_file_path = Path.cwd() / data_file
+    cache_path = dataset_file_path.parent / f"{dataset_file_path.stem}_lines_index.npz"
+    source = _source_signature(dataset_file_path)
+    if use_cache and cache_path.exists():
+        try:
+            with np.load(cache_path) as cached:
+                if json.loads(str(cached["metadata"])).get("source") == source:
+                    return cached["offsets"]
+        except _CACHE_ERRORS:
+            pass  # unreadable cache: rescan
+
+    offsets = [np.zeros(1, dtype=np.uint64)]
+    position = 0
+    with open(dataset_file_path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+            offsets.append((newlines + position + 1).astype(np.uint64))
+            position += len(block)
+    offsets = np.concatenate(offsets)
+    if offsets[-1] != position:
+        offsets = np.append(offsets, np.uint64(position))  # last line without trailing newline
+
+    def save(path):
+        with open(path, 'wb') as f:
+            np.savez(f, offsets=offsets, metadata=json.dumps({"source": source}))
+
+    if use_cache:
+        _save_cache(cache_path, save)
+    return offsets
+
+
+def copy_byte_range(src, dst, start: int, end: int, chunk_size: int = 16 * 1024 ** 2):
+    """
+    Copy bytes [start, end) of the src binary file object to dst (one seek, raw chunked copy).
+    """
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(chunk_size, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+class SegmentIndex:
+    """
+    Index of the segments (yt_id, start_seconds, end_seconds) of an AudioSet (Processed or original) CSV: rows are
+    sorted by (yt_id, start_seconds), so that all the segments of a yt_id are a contiguous range found by binary search,
+    and queries are answered in batches (vectorized) for exact yt_id or overlapping time window matches.
+    Row indices are 0-based data rows (header and comment lines excluded).
+
+    :param yt_ids: (N,) segments yt_ids.
+    :param starts: (N,) segments start times (sec.).
+    :param ends: (N,) segments end times (sec.).
+    """
+    def __init__(self, yt_ids, starts, ends):
+        yt_ids = np.asarray(yt_ids, dtype=str)
+        self.num_rows = len(yt_ids)
+        order = np.lexsort((np.asarray(starts, dtype=np.float64), yt_ids))
+        self.rows = order.astype(np.int64)
+        self.starts = np.asarray(starts, dtype=np.float64)[order]
+        self.ends = np.asarray(ends, dtype=np.float64)[order]
+        self.ids, self.offsets = np.unique(yt_ids[order], return_index=True)
+        self.offsets = np.append(self.offsets, self.num_rows).astype(np.int64)
+        self.metadata = {}
+
+    @classmethod
+    def from_csv(cls, data_file: str) -> "SegmentIndex":
+        yt_ids, starts, ends = [], [], []
+        with open(data_file, 'r', newline='') as f:
+            for row in csv.reader(f, skipinitialspace=True):
+                if not row or row[0].startswith('#'):
+                    continue
+                try:
+                    start, end = float(row[1]), float(row[2])
+                except (IndexError, ValueError):
+                    if not yt_ids:
+                        continue  # header
+                    start, end = float('nan'), float('nan')
+                yt_ids.append(row[0].strip())
+                starts.append(start)
+                ends.append(end)
+        return cls(yt_ids, starts, ends)
+
+    def save(self, path: str, **metadata):
+        with open(path, 'wb') as f:
+            np.savez(f, ids=self.ids, offsets=self.offsets, rows=self.rows, starts=self.starts, ends=self.ends,
+                     metadata=json.dumps(metadata))
+
+    @classmethod
+    def load(cls, path: str) -> "SegmentIndex":
+        index = cls.__new__(cls)
+        with np.load(path) as data:
+            for name in ("ids", "offsets", "rows", "starts", "ends"):
+                setattr(index, name, data[name])
+            index.metadata = json.loads(str(data["metadata"]))
+        index.num_rows = len(index.rows)
+        return index
+
+    def yt_ids(self) -> np.ndarray:
+        """(N,) yt_ids, in row order."""
+        yt_ids = np.empty(self.num_rows, dtype=self.ids.dtype)
+        yt_ids[self.rows] = np.repeat(self.ids, np.diff(self.offsets))
+        return yt_ids
+
+    def lookup(self, yt_ids, starts=None, ends=None, min_overlap: float = 0.0):
+        """
+        Batch query: find the indexed rows matching each query segment.
+
+        :param yt_ids: (Q,) query yt_ids.
+        :param starts: (Q,) query start times: if given (with ends), only rows overlapping the query time window by
+                       more than min_overlap seconds are matched, otherwise all rows with the same yt_id.
+        :param ends: (Q,) query end times.
+        :param min_overlap: Minimum overlap (sec.) of matched segments.
+        :return: (query positions, matching rows) arrays, sorted by query position then row start time.
+        """
+        yt_ids = np.asarray(yt_ids, dtype=str)
+        pos = np.searchsorted(self.ids, yt_ids)
+        found = pos < len(self.ids)
+        found[found] = self.ids[pos[found]] == yt_ids[found]
+        queries = np.flatnonzero(found)
+        first, last = self.offsets[pos[queries]], self.offsets[pos[queries] + 1]
+
+        # Expand each query into its yt_id candidate (sorted) rows
+        counts = last - first
+        query_pos = np.repeat(queries, counts)
+        candidates = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(first, counts)
+        if starts is not None and ends is not None:
+            starts, ends = np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64)
+            overlap = (np.minimum(self.ends[candidates], ends[query_pos]) -
+                       np.maximum(self.starts[candidates], starts[query_pos]))
+            keep = overlap > min_overlap
+            query_pos, candidates = query_pos[keep], candidates[keep]
+        return query_pos, self.rows[candidates]
+
+    def join(self, other: "SegmentIndex", overlap: bool = False, min_overlap: float = 0.0):
+        """
+        Many-to-many join of the other index rows against this one (exact yt_id, or overlapping segments).
+
+        :return: (other rows, matching rows of this index) arrays.
+        """
+        yt_ids = other.yt_ids()
+        if overlap:
+            starts, ends = np.empty(other.num_rows), np.empty(other.num_rows)
+            starts[other.rows], ends[other.rows] = other.starts, other.ends
+            return self.lookup(yt_ids, starts, ends, min_overlap)
+        return self.lookup(yt_ids)
+
+
+def segment_index(data_file: str, use_cache: bool = True, verbose: bool = False) -> SegmentIndex:
+    """
+    Build (or load) the SegmentIndex of a CSV, cached as "<data_file>_segments_index.npz" and reused as long as the
+    CSV is unchanged.
+
+    :param data_file: Path to the CSV file containing video information.
+    :param use_cache: If True, load (or save) the cached index.
+    :param verbose: If True, enables debug printing. Default is False.
+    :return: A SegmentIndex instance.
+    """
+    dataset_file_path = Path.cwd() / data_file
+    if not dataset_file_path.exists():
+        raise FileNotFoundError(f"Dataset file {data_file} not found.")
+
+    cache_path = dataset_file_path.parent / f"{dataset_file_path.stem}_segments_index.npz"
+    source = _source_signature(dataset_file_path)
+    if use_cache and cache_path.exists():
+        try:
+            index = SegmentIndex.load(str(cache_path))
+        except _CACHE_ERRORS as e:
+            index = None
+            if verbose:
+                print(f"Unreadable segments index {cache_path} ({e}), rebuilding it")
+        if index is not None and index.metadata.get("source") == source:
+            if verbose:
+                print(f"Segments index loaded from {cache_path}")
+            return index
+
+    index = SegmentIndex.from_csv(str(dataset_file_path))
+    if use_cache:
+        saved = _save_cache(cache_path, lambda path: index.save(path, source=source))
+        if verbose:
+            print(f"Segments index saved to {cache_path}" if saved else f"Segments index not cached ({cache_path})")
+    return index
+
+
+def find_leakage(query_files: List[str], data_files: List[str], overlap: bool = True, min_overlap: float = 0.0,
+                 use_cache: bool = True, verbose: bool = False) -> dict:
+    """
+    Leakage audit: match the samples of each query file against each data file through (cached) segment indices.
+
+    :param query_files: CSV files (paths) whose samples are searched (e.g. EV_Positives.csv, EV_Negatives.csv).
+    :param data_files: CSV files (paths) searched in (e.g. eval, balanced and unbalanced train segments).
+    :param overlap: If True, match overlapping segments (by more than min_overlap sec.), otherwise same yt_ids.
+    :param min_overlap: Minimum overlap (sec.) of matched segments.
+    :param use_cache: If True, load (or save) the cached indices.
+    :param verbose: Whether to print out the number of matches per files pair.
+    :return: {(query_file, data_file): (query rows, data rows)} matching rows arrays.
+
+    Example:
+    >>> leaks = find_leakage(query_files=['path/to/EV_Positives.csv', 'path/to/EV_Negatives.csv'],
+                             data_files=['path/to/eval_segments.csv', 'path/to/balanced_train_segments.csv'])
+    """
+    indices = {data_file: segment_index(data_file, use_cache) for data_file in set(query_files) | set(data_files)}
+    leaks = {}
+    for query_file in query_files:
+        for data_file in data_files:
+            query_rows, data_rows = indices[data_file].join(indices[query_file], overlap, min_overlap)
+            leaks[(query_file, data_file)] = (query_rows, data_rows)
+            if verbose:
+                print(f"{query_file} -> {data_file}: {len(np.unique(query_rows))} samples matching "
+                      f"{len(np.unique(data_rows))} rows")
+    return leaks
+
+
+_LABEL_STRIP = ' \t\'"'
+
+
+def parse_label_field(field: str) -> List[str]:
+    """
+    Parse a CSV 'positive_labels' field (e.g. "['/m/012n7d', '/m/03j1ly']") into a list of label IDs.
+    Well-formed lists are split directly, anything else is left to ast.literal_eval (which may raise).
+    """
+    field = field.strip()
+    if field.startswith('[') and field.endswith(']') and '\\' not in field:
+        labels = [lab.strip(_LABEL_STRIP) for lab in field[1:-1].split(',')]
+        return [lab for lab in labels if lab]
+
+    labels = []
+    for item in ast.literal_eval(field):
+        labels.extend([lab.strip() for lab in item.split(',') if lab.strip()])
+    return labels
+
+
+class LabelStats:
+    """
+    Mergeable (partial) label statistics of an AudioSet CSV: per-label occurrence count vectors (all, downloaded and
+    not downloaded samples) over a label vocabulary and samples counts.
+    Partials computed over consecutive parts of a file are merged (in file order) with merge(); to_dict() converts
+    them into the compute_stats schema, labels being listed in order of first occurrence.
+
+    :param vocabulary: Label IDs (e.g. the labels file mids); unknown labels extend the vocabulary when met.
+    """
+    ALL, DOWNLOADED, NOT_DOWNLOADED = 0, 1, 2
+    _NEVER = np.iinfo(np.int64).max
+    _FLUSH_SIZE = 1 << 16
+
+    def __init__(self, vocabulary: List[str]):
+        self.vocabulary = list(vocabulary)
+        self.index = {label: i for i, label in enumerate(self.vocabulary)}
+        self.total_samples = 0
+        self.downloaded = 0
+        self.not_downloaded = 0
+        self.counts = np.zeros((3, len(self.vocabulary)), dtype=np.int64)
+        # Order (i.e. running occurrence number) of each label first occurrence, per counts row
+        self.first_seen = np.full((3, len(self.vocabulary)), self._NEVER, dtype=np.int64)
+        self.occurrences = np.zeros(3, dtype=np.int64)
+        self._pending = ([], [], [])
+
+    def __getstate__(self):
+        self._flush()
+        return self.__dict__
+
+    def _grow(self, size):
+        grow = size - self.counts.shape[1]
+        if grow > 0:
+            self.counts = np.pad(self.counts, ((0, 0), (0, grow)))
+            self.first_seen = np.pad(self.first_seen, ((0, 0), (0, grow)), constant_values=self._NEVER)
+
+    def label_index(self, label: str) -> int:
+        idx = self.index.get(label)
+        if idx is None:
+            idx = self.index[label] = len(self.vocabulary)
+            self.vocabulary.append(label)
+        return idx
+
+    def add(self, labels: List[str], downloaded: Optional[bool] = None):
+        """
+        Add a sample (its label IDs, and downloaded flag if any).
+        """
+        indices = [self.label_index(label) for label in labels]
+        self.total_samples += 1
+        self._pending[self.ALL].extend(indices)
+        if downloaded is True:
+            self.downloaded += 1
+            self._pending[self.DOWNLOADED].extend(indices)
+        elif downloaded is False:
+            self.not_downloaded += 1
+            self._pending[self.NOT_DOWNLOADED].extend(indices)
+        if len(self._pending[self.ALL]) >= self._FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        self._grow(len(self.vocabulary))
+        for row, pending in enumerate(self._pending):
+            if not pending:
+                continue
+            indices = np.asarray(pending, dtype=np.int64)
+            self.counts[row] += np.bincount(indices, minlength=self.counts.shape[1])
+            labels, first = np.unique(indices, return_index=True)
+            self.first_seen[row, labels] = np.minimum(self.first_seen[row, labels], self.occurrences[row] + first)
+            self.occurrences[row] += len(indices)
+            pending.clear()
+
+    def merge(self, other: "LabelStats") -> "LabelStats":
+        """
+        Merge the statistics of the following part of the file into these ones (in-place).
+        """
+        self._flush()
+        other._flush()
+        mapping = np.array([self.label_index(label) for label in other.vocabulary], dtype=np.int64)
+        self._grow(len(self.vocabulary))
+        if len(mapping):
+            self.counts[:, mapping] += other.counts[:, :len(mapping)]
+            seen = other.first_seen[:, :len(mapping)] != self._NEVER
+            shifted = np.where(seen, other.first_seen[:, :len(mapping)] + self.occurrences[:, None], self._NEVER)
+            self.first_seen[:, mapping] = np.minimum(self.first_seen[:, mapping], shifted)
+        self.occurrences += other.occurrences
+        self.total_samples += other.total_samples
+        self.downloaded += other.downloaded
+        self.not_downloaded += other.not_downloaded
+        return self
+
+    def move(self, labels: List[str], downloaded: bool):
+        """
+        Flip the downloaded flag of an already added sample (to downloaded if True, to not downloaded otherwise).
+        Labels first met in the new group are listed after the ones already there.
+        """
+        self._flush()
+        indices = np.array([self.label_index(label) for label in labels], dtype=np.int64)
+        self._grow(len(self.vocabulary))
+        new, old = (self.DOWNLOADED, self.NOT_DOWNLOADED) if downloaded else (self.NOT_DOWNLOADED, self.DOWNLOADED)
+        np.add.at(self.counts[old], indices, -1)
+        np.add.at(self.counts[new], indices, 1)
+        unseen = indices[self.first_seen[new, indices] == self._NEVER]
+        self.first_seen[new, unseen] = self.occurrences[new] + np.arange(len(unseen))
+        self.occurrences[new] += len(indices)
+        if downloaded:
+            self.downloaded += 1
+            self.not_downloaded -= 1
+        else:
+            self.downloaded -= 1
+            self.not_downloaded += 1
+
+    def label_occurrences(self, row: int = 0, label_map: Optional[dict] = None) -> dict:
+        """
+        :return: {label (display name if in label_map): count} in order of first occurrence.
+        """
+        self._flush()
+        occurrences = {}
+        for idx in np.argsort(self.first_seen[row], kind='stable'):
+            if self.first_seen[row, idx] == self._NEVER:
+                break
+            if self.counts[row, idx] == 0:
+                continue  # labels whose samples were all moved (see move())
+            label = self.vocabulary[idx]
+            label = label_map.get(label, label) if label_map else label
+            occurrences[label] = occurrences.get(label, 0) + int(self.counts[row, idx])
+        return occurrences
+
+    def to_dict(self, label_map: Optional[dict] = None, has_downloaded: bool = False) -> dict:
+        stats = {"total_samples": self.total_samples,
+                 "label_occurrences": self.label_occurrences(self.ALL, label_map)}
+        if has_downloaded:
+            stats["downloaded_stats"] = {"downloaded": self.downloaded,
+                                         "not_downloaded": self.not_downloaded,
+                                         "label_occurrences_downloaded": self.label_occurrences(self.DOWNLOADED, label_map),
+                                         "label_occurrences_not_downloaded": self.label_occurrences(self.NOT_DOWNLOADED, label_map)}
+        return stats
+
+
+def _csv_layout(header: List[str], missing_downloaded: Optional[bool] = None) -> dict:
+    # Columns used by the statistics (None if missing), and downloaded flag of the samples without 'downloaded' column
+    return {"labels": 3,
+            "downloaded": header.index('downloaded') if 'downloaded' in header else None,
+            "missing_downloaded": missing_downloaded}
+
+
+def _stats_chunk(job) -> LabelStats:
+    """
+    Statistics of the CSV lines starting in the byte range [start, end) of a file.
+    """
+    file_path, start, end, vocabulary, layout, verbose = job
+    with open(file_path, 'rb') as f:
+        f.seek(start - 1)
+        if f.read(1) != b'\n':
+            f.readline()  # the line starting before this range belongs to the previous chunk
+        position = f.tell()
+        data = f.read(max(0, end - position))
+        if data and not data.endswith(b'\n'):
+            data += f.readline()  # complete the last line starting in this range
+
+    stats = LabelStats(vocabulary)
+    parsed = {}  # labels fields repeat across rows: each one is parsed once
+    for row in csv.reader(data.decode('utf-8').splitlines()):
+        if not row:
+            continue
+        try:
+            field = row[layout["labels"]]
+            labels = parsed.get(field)
+            if labels is None:
+                labels = parsed[field] = parse_label_field(field)
+        except Exception as e:
+            if verbose:
+                print(f"Error parsing labels in row {row}: {e}")
+            labels = []
+
+        downloaded = layout["missing_downloaded"]
+        if layout["downloaded"] is not None:
+            downloaded = row[layout["downloaded"]].strip().lower() in ['true', '1']
+
+        stats.add(labels, downloaded)
+    return stats
+
+
+def _label_stats(data_file: Path, vocabulary: List[str], num_workers: Optional[int] = None,
+                 chunk_size: int = 16 * 1024 ** 2, missing_downloaded: Optional[bool] = None,
+                 verbose: bool = False):
+    """
+    LabelStats of a CSV, computed over line-aligned byte ranges (in parallel, merged in file order).
+
+    :param missing_downloaded: Downloaded flag of the samples if the CSV has no 'downloaded' column (None: neither).
+    :return: tuple (LabelStats, whether the CSV has a 'downloaded' column)
+    """
+    # Read the header, and split the rest of the file into line-aligned byte ranges
+    with open(data_file, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8')]))
+        data_start = f.tell()
+    layout = _csv_layout(header, missing_downloaded)
+    has_downloaded = layout["downloaded"] is not None
+    if verbose:
+        if has_downloaded:
+            print(f"'downloaded' attribute found at index {layout['downloaded']}.")
+        else:
+            print("No 'downloaded' attribute found in the provided CSV's header.")
+
+    file_size = Path(data_file).stat().st_size
+    bounds = list(range(data_start, file_size, chunk_size)) + [file_size]
+    jobs = [(str(data_file), start, end, vocabulary, layout, verbose) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    if len(jobs) <= 1 or num_workers == 1:
+        partials = [_stats_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            partials = list(pool.map(_stats_chunk, jobs))
+    label_stats = LabelStats(vocabulary)
+    for partial in partials:
+        label_stats.merge(partial)
+    return label_stats, has_downloaded
+
+
+def compute_stats(data_file: str,
+                  labels_file: str,
+                  verbose: bool = False,
+                  save_json: bool = False,
+                  num_workers: Optional[int] = None,
+                  chunk_size: int = 16 * 1024 ** 2):
     """
     AudioSet (Processed) CSV statistics retriever: computes occurrences per label and total samples.
     Additionally, if the 'downloaded' attribute is present in the CSV header, the function computes:
       - The total number of samples marked as downloaded (True) and not downloaded (False).
       - Occurrences per label for downloaded and not downloaded samples, output in dictionary format:
         {'class': occurrence (int)}.
-    
+
+    The CSV is split into byte-range chunks (aligned on lines), processed in parallel into mergeable partial
+    statistics (see LabelStats).
     Optionally, statistics are saved as a JSON file.
     
     :param data_file: Path to the CSV file containing video information.
@@ -64,6 +576,8 @@ def compute_stats(data_file: str, labels_file: str, verbose: bool = False, save_
     :param verbose: If True, enables debug printing. Default is False.
     :param save_json: If True, saves the computed statistics to a JSON file.
                       The JSON filename is generated as "<data_file>_stats.json".
+    :param num_workers: Number of worker processes (default: all CPUs; files of a single chunk are processed inline).
+    :param chunk_size: Chunks size in bytes.
     :return: A dictionary with the computed statistics. Example:
       {"total_samples": int,
        "label_occurrences": {<label>: count, ...},
@@ -94,67 +608,12 @@ def compute_stats(data_file: str, labels_file: str, verbose: bool = False, save_
     if verbose:
         print(f"Loaded label mapping: {label_map}")
 
-    # Initialize statistics dictionaries
-    total_samples = 0
-    label_occurrences = defaultdict(int)
-    downloaded_count = 0
-    not_downloaded_count = 0
-    label_occ_downloaded = defaultdict(int)
-    label_occ_not_downloaded = defaultdict(int)
-    
-    # Process dataset file
-    with open(dataset_file_path, 'r') as dataset_file:
-        reader = csv.reader(dataset_file)
-        header = next(reader)
-        try:
-            downloaded_idx = header.index('downloaded')
-            has_downloaded = True
-            if verbose:
-                print(f"'downloaded' attribute found at index {downloaded_idx}.")
-        except ValueError:
-            has_downloaded = False
-            if verbose:
-                print("No 'downloaded' attribute found in the provided CSV's header.")
-        
-        label_data_idx = 3  # default index for label data
-
-        # Main routine
-        for row in reader:
-            total_samples += 1
-            try:
-                labels_list = ast.literal_eval(row[label_data_idx])
-                current_labels = []
-                for item in labels_list:
-                    current_labels.extend([lab.strip() for lab in item.split(',') if lab.strip()])
-            except Exception as e:
-                if verbose:
-                    print(f"Error parsing labels in row {total_samples + 1}: {e}")
-                current_labels = []
-
-            decoded_labels = [label_map.get(label, label) for label in current_labels]
-
-            for label in decoded_labels:
-                label_occurrences[label] += 1
-
-            if has_downloaded:
-                downloaded_value = row[downloaded_idx].strip().lower()
-                if downloaded_value in ['true', '1']:
-                    downloaded_count += 1
-                    for label in decoded_labels:
-                        label_occ_downloaded[label] += 1
-                else:
-                    not_downloaded_count += 1
-                    for label in decoded_labels:
-                        label_occ_not_downloaded[label] += 1
+    # Main routine
+    label_stats, has_downloaded = _label_stats(dataset_file_path, list(label_map), num_workers, chunk_size,
+                                               verbose=verbose)
 
     # Prepare results dictionary
-    stats = {"total_samples": total_samples,
-             "label_occurrences": dict(label_occurrences)}
-    if has_downloaded:
-        stats["downloaded_stats"] = {"downloaded": downloaded_count,
-                                     "not_downloaded": not_downloaded_count,
-                                     "label_occurrences_downloaded": dict(label_occ_downloaded),
-                                     "label_occurrences_not_downloaded": dict(label_occ_not_downloaded)}
+    stats = label_stats.to_dict(label_map, has_downloaded)
     if verbose:
         print("Statistics:")
         print(stats)
@@ -171,40 +630,460 @@ def compute_stats(data_file: str, labels_file: str, verbose: bool = False, save_
     return stats
 
 
-def merge_sets(dataset_files: List[str], output_file: str, verbose: bool = False):
+def _load_label_map(labels_file: str) -> dict:
+    with open(labels_file, 'r') as lf:
+        return {row['mid']: row['display_name'] for row in csv.DictReader(lf)}
+
+
+class LiveStats:
+    """
+    Incrementally maintained compute_stats statistics of a CSV being downloaded (e.g. by StandardDownloader):
+    each sample downloaded flag update is applied as a delta, and statistics are periodically checkpointed to the
+    "<data_file>_stats.json" file (atomically replaced), so monitoring reads a small file instead of the CSV.
+    Per-label counts always match a full compute_stats pass (see verify()), labels of the downloaded groups may be
+    listed in a different order.
+    Initial statistics come from a (parallel) compute_stats pass over data_file, and rows are only parsed when their
+    flag changes: the CSV must be unchanged since the table was loaded.
+
+    :param data_file: Path to the CSV file containing video information.
+    :param labels_file: Path to the CSV file containing labels decoding information.
+    :param table: downloaders.SampleTable of data_file (e.g. StandardDownloader.data): downloaded flags array and
+                  raw rows, loaded from data_file if None.
+    :param checkpoint_interval: Minimum time (sec.) between two checkpoints.
+    :param num_workers: Initial pass worker processes (see compute_stats).
+    :param json_path: Checkpoint file (default: "<data_file>_stats.json").
+    """
+    def __init__(self, data_file: str, labels_file: str, table=None, checkpoint_interval: float = 60.0,
+                 num_workers: Optional[int] = None, json_path: Optional[str] = None):
+        self.data_file = Path(data_file)
+        self.labels_file = Path(labels_file)
+        self.json_path = Path(json_path) if json_path else self.data_file.parent / f"{self.data_file.stem}_stats.json"
+        self.checkpoint_interval = checkpoint_interval
+        self.label_map = _load_label_map(self.labels_file)
+
+        if table is None:
+            from audioset_tools.downloaders import SampleTable
+            table = SampleTable(self.data_file)
+        self.table = table
+        self.flags = table.downloaded.copy()
+        self.stats, _ = _label_stats(self.data_file, list(self.label_map), num_workers, missing_downloaded=False)
+        self.last_checkpoint = 0.0
+
+    def copy(self, json_path: str) -> "LiveStats":
+        """Independent copy of these statistics (sharing the table), checkpointed to json_path."""
+        clone = copy.copy(self)
+        clone.stats = copy.deepcopy(self.stats)
+        clone.flags = self.flags.copy()
+        clone.json_path = Path(json_path)
+        clone.last_checkpoint = 0.0
+        return clone
+
+    def update(self, idx: int, downloaded: bool) -> bool:
+        """
+        Set the downloaded flag of sample idx (CSV row index).
+
+        :return: True if the flag changed.
+        """
+        if self.flags[idx] == downloaded:
+            return False
+        try:
+            labels = parse_label_field(self.table.fields(idx)[self.table.columns['positive_labels']])
+        except Exception:
+            labels = []
+        self.stats.move(labels, downloaded)
+        self.flags[idx] = downloaded
+        return True
+
+    def to_dict(self) -> dict:
+        return self.stats.to_dict(self.label_map, has_downloaded=True)
+
+    def checkpoint(self, force: bool = False) -> bool:
+        """
+        Write the statistics JSON file, if checkpoint_interval elapsed since the last one (or force).
+
+        :return: True if written.
+        """
+        now = time.monotonic()
+        if not force and now - self.last_checkpoint < self.checkpoint_interval:
+            return False
+        with tempfile.NamedTemporaryFile('w', dir=self.json_path.parent, prefix=f".{self.json_path.name}.",
+                                         suffix='.tmp', delete=False) as jf:
+            json.dump(self.to_dict(), jf, indent=4)
+        os.replace(jf.name, self.json_path)
+        self.last_checkpoint = now
+        return True
+
+    def verify(self) -> List[str]:
+        """
+        Compare the statistics with a full compute_stats pass over data_file (as currently saved).
+
+        :return: Mismatching statistics names (empty if consistent).
+        """
+        full, live = compute_stats(str(self.data_file), str(self.labels_file)), self.to_dict()
+        mismatches = [key for key in ["total_samples", "label_occurrences"] if full.get(key) != live.get(key)]
+        full_dl, live_dl = full.get("downloaded_stats", {}), live["downloaded_stats"]
+        mismatches += [f"downloaded_stats.{key}" for key in live_dl if full_dl.get(key) != live_dl[key]]
+        return mismatches
+
+
+def _segment_labels(field: str) -> List[str]:
+    # Processed CSVs hold "['/m/..', ...]" lists, original AudioSet segments CSVs "/m/..,/m/.." strings
+    if field.strip().startswith('['):
+        return parse_label_field(field)
+    return [lab.strip() for lab in field.split(',') if lab.strip()]
+
+
+class LabelCooccurrence:
+    """
+    Label co-occurrence statistics of a segments table: counts[i, j] is the number of samples labelled with both
+    vocabulary[i] and vocabulary[j] (counts[i, i] being the label marginal count).
+    Labels are queried by display name (first matching label ID) or by label ID.
+
+    :param vocabulary: Label IDs (matrix rows/columns order).
+    :param counts: (V, V) co-occurrence counts.
+    :param total_samples: Number of samples in the table.
+    :param label_map: {label ID: display name}.
+    """
+    def __init__(self, vocabulary: List[str], counts: np.ndarray, total_samples: int, label_map: Optional[dict] = None):
+        self.vocabulary = list(vocabulary)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.total_samples = int(total_samples)
+        self.label_map = dict(label_map or {})
+        self.index = {}
+        for i, mid in enumerate(self.vocabulary):
+            self.index.setdefault(mid, i)
+            self.index.setdefault(self.label_map.get(mid, mid), i)
+
+    @classmethod
+    def from_csv(cls, data_file: str, label_map: dict, chunk_rows: int = 16384) -> "LabelCooccurrence":
+        """
+        Compute the co-occurrence matrix by counting, in chunks of rows, the (i, j) label pairs of each sample
+        (np.bincount over the flat i * V + j pair indices), i.e. X^T X of the sparse binary incidence matrix X.
+        """
+        vocabulary = list(label_map)
+        index = {mid: i for i, mid in enumerate(vocabulary)}
+        counts = np.zeros((len(vocabulary), len(vocabulary)), dtype=np.int64)
+        total_samples = 0
+
+        def accumulate(rows, cols, num_rows):
+            nonlocal counts
+            if len(vocabulary) > counts.shape[0]:
+                counts = np.pad(counts, (0, len(vocabulary) - counts.shape[0]))
+            size = len(vocabulary)
+            entries = np.unique(np.asarray(rows, dtype=np.int64) * size + np.asarray(cols, dtype=np.int64))
+            rows, cols = np.divmod(entries, size)  # (row, label) entries sorted by row, without duplicates
+            row_lengths = np.bincount(rows, minlength=num_rows)
+            lengths, first = row_lengths[rows], (np.cumsum(row_lengths) - row_lengths)[rows]
+            # Pair each entry with every entry of its row: the k-th copy of an entry with its row k-th entry
+            offsets = np.cumsum(lengths) - lengths
+            partners = np.repeat(first - offsets, lengths) + np.arange(int(lengths.sum()))
+            pairs = np.repeat(cols, lengths) * size + cols[partners]
+            counts += np.bincount(pairs, minlength=size * size).reshape(size, size)
+
+        with open(data_file, 'r') as f:
+            reader = csv.reader(f, skipinitialspace=True)
+            next(reader)
+            rows, cols, num_rows = [], [], 0
+            for row in reader:
+                if not row or row[0].startswith('#'):
+                    continue
+                try:
+                    labels = _segment_labels(row[3])
+                except Exception:
+                    labels = []
+                for label in labels:
+                    if label not in index:
+                        index[label] = len(vocabulary)
+                        vocabulary.append(label)
+                    rows.append(num_rows)
+                    cols.append(index[label])
+                num_rows += 1
+                if num_rows == chunk_rows:
+                    accumulate(rows, cols, num_rows)
+                    total_samples += num_rows
+                    rows, cols, num_rows = [], [], 0
+            accumulate(rows, cols, num_rows)
+            total_samples += num_rows
+
+        return cls(vocabulary, counts, total_samples, label_map)
+
+    def save(self, path: str, **metadata):
+        """
+        Save as a sparse (COO) .npz file.
+        """
+        rows, cols = np.nonzero(self.counts)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f,
+                                vocabulary=np.array(self.vocabulary),
+                                display_names=np.array([self.label_map.get(mid, mid) for mid in self.vocabulary]),
+                                rows=rows.astype(np.int32),
+                                cols=cols.astype(np.int32),
+                                values=self.counts[rows, cols],
+                                total_samples=self.total_samples,
+                                metadata=json.dumps(metadata))
+
+    @classmethod
+    def load(cls, path: str) -> "LabelCooccurrence":
+        with np.load(path) as data:
+            vocabulary = data["vocabulary"].tolist()
+            counts = np.zeros((len(vocabulary), len(vocabulary)), dtype=np.int64)
+            counts[data["rows"], data["cols"]] = data["values"]
+            label_map = dict(zip(vocabulary, data["display_names"].tolist()))
+            cooc = cls(vocabulary, counts, int(data["total_samples"]), label_map)
+            cooc.metadata = json.loads(str(data["metadata"]))
+        return cooc
+
+    def label_idx(self, label: str) -> int:
+        if label not in self.index:
+            raise KeyError(f"Unknown label: {label}")
+        return self.index[label]
+
+    def count(self, label_a: str, label_b: Optional[str] = None) -> int:
+        """
+        Number of samples labelled with both label_a and label_b (with label_a if label_b is None).
+        """
+        a = self.label_idx(label_a)
+        return int(self.counts[a, a if label_b is None else self.label_idx(label_b)])
+
+    def conditional(self, label_b: str, given: str) -> float:
+        """
+        P(label_b | given): fraction of the samples labelled with 'given' also labelled with label_b.
+        """
+        given_count = self.count(given)
+        return self.count(given, label_b) / given_count if given_count else float('nan')
+
+    def pmi(self, label_a: str, label_b: str) -> float:
+        """
+        Pointwise mutual information log(P(a, b) / (P(a) P(b))) (-inf if a and b never co-occur).
+        """
+        joint, count_a, count_b = self.count(label_a, label_b), self.count(label_a), self.count(label_b)
+        if not count_a or not count_b:
+            return float('nan')
+        if not joint:
+            return float('-inf')
+        return float(np.log(joint * self.total_samples / (count_a * count_b)))
+
+    def conditional_matrix(self) -> np.ndarray:
+        """
+        (V, V) matrix of P(column label | row label).
+        """
+        marginals = np.diag(self.counts).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.counts / marginals[:, None]
+
+    def pmi_matrix(self) -> np.ndarray:
+        """
+        (V, V) PMI matrix (-inf where labels never co-occur, nan for labels with no occurrence).
+        """
+        marginals = np.diag(self.counts).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log(self.counts * float(self.total_samples) / np.outer(marginals, marginals))
+
+    def top(self, label: str, k: int = 10, by: str = 'count', min_count: int = 1) -> List[tuple]:
+        """
+        Labels most co-occurring with label.
+
+        :param by: Ranking criterion: 'count', 'conditional' (P(other | label)) or 'pmi'.
+        :param min_count: Minimum co-occurrence count of the listed labels.
+        :return: List of (display name, count, P(other | label), PMI).
+        """
+        a = self.label_idx(label)
+        candidates = np.flatnonzero(self.counts[a] >= min_count)
+        candidates = candidates[candidates != a]
+        counts = self.counts[a, candidates]
+        conditional = counts / max(self.counts[a, a], 1)
+        marginals = np.diag(self.counts)[candidates]
+        pmi = np.log(counts * float(self.total_samples) / (self.counts[a, a] * marginals))
+        key = {'count': counts, 'conditional': conditional, 'pmi': pmi}[by]
+        order = np.argsort(-key, kind='stable')[:k]
+        return [(self.label_map.get(self.vocabulary[candidates[i]], self.vocabulary[candidates[i]]), int(counts[i]),
+                 float(conditional[i]), float(pmi[i])) for i in order]
+
+
+def compute_cooccurrence(data_file: str, labels_file: str, use_cache: bool = True, verbose: bool = False):
+    """
+    Label co-occurrence counts, conditional probabilities and PMI of an AudioSet (Processed or original) CSV.
+    The result is cached as "<data_file>_cooccurrence.npz" (next to compute_stats "<data_file>_stats.json"), and
+    reused as long as the CSV is unchanged.
+
+    :param data_file: Path to the CSV file containing video information.
+    :param labels_file: Path to the CSV file containing labels decoding information.
+    :param use_cache: If True, load (or save) the cached co-occurrence matrix.
+    :param verbose: If True, enables debug printing. Default is False.
+    :return: A LabelCooccurrence instance.
+
+    Example:
+    >>> cooc = compute_cooccurrence(data_file='path/to/audioset_samples.csv',
+                                    labels_file='path/to/audioset_labels.csv')
+    >>> cooc.conditional('Music', given='Siren'), cooc.pmi('Music', 'Siren'), cooc.top('Siren', k=5, by='pmi')
+    """
+    cwd = Path.cwd()
+    dataset_file_path = cwd / data_file
+    labels_file_path = cwd / labels_file
+    if not dataset_file_path.exists():
+        raise FileNotFoundError(f"Dataset file {data_file} not found.")
+    if not labels_file_path.exists():
+        raise FileNotFoundError(f"Labels file {labels_file} not found.")
+
+    cache_path = dataset_file_path.parent / f"{dataset_file_path.stem}_cooccurrence.npz"
+    source = _source_signature(dataset_file_path)
+    if use_cache and cache_path.exists():
+        try:
+            cooc = LabelCooccurrence.load(str(cache_path))
+        except _CACHE_ERRORS as e:
+            cooc = None
+            if verbose:
+                print(f"Unreadable co-occurrence matrix {cache_path} ({e}), recomputing it")
+        if cooc is not None and cooc.metadata.get("source") == source:
+            if verbose:
+                print(f"Co-occurrence matrix loaded from {cache_path}")
+            return cooc
+
+    cooc = LabelCooccurrence.from_csv(str(dataset_file_path), _load_label_map(labels_file_path))
+    if use_cache:
+        saved = _save_cache(cache_path, lambda path: cooc.save(path, source=source))
+        if verbose:
+            print(f"Co-occurrence matrix saved to {cache_path}" if saved else
+                  f"Co-occurrence matrix not cached ({cache_path})")
+    return cooc
+
+
+_TIMES = struct.Struct('<dd')
+
+
+def row_fingerprint(row: List[str]) -> int:
+    """
+    64-bit fingerprint of a CSV row normalized key (yt_id, start_seconds, end_seconds): rows differing only in
+    whitespace, number formatting or labels share the same fingerprint.
+    """
+    try:
+        key = _TIMES.pack(float(row[1]), float(row[2])) + row[0].strip().encode('utf-8')
+    except (IndexError, ValueError):
+        key = "\x1e".join(field.strip() for field in row).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+def _external_sort(records: Iterable[tuple], max_buffer_rows: int, tmp_dir: str) -> Iterator[tuple]:
+    # Sort (comparable) records, spilling sorted runs of max_buffer_rows records to tmp_dir and k-way merging them
+    runs, buffer = [], []
+
+    def spill():
+        buffer.sort()
+        run = tempfile.NamedTemporaryFile(dir=tmp_dir, suffix='.run', delete=False)
+        with run:
+            for record in buffer:
+                pickle.dump(record, run, protocol=pickle.HIGHEST_PROTOCOL)
+        runs.append(run.name)
+        buffer.clear()
+
+    def read_run(path):
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    break
+
+    for record in records:
+        buffer.append(record)
+        if len(buffer) >= max_buffer_rows:
+            spill()
+    if not runs:
+        yield from sorted(buffer)
+        return
+    if buffer:
+        spill()
+    yield from heapq.merge(*[read_run(path) for path in runs])
+
+
+def _union_labels(rows: List[List[str]]) -> List[str]:
+    # First row, with the (order-preserving) union of all rows labels
+    merged = list(rows[0])
+    labels = []
+    for row in rows:
+        try:
+            labels.extend(label for label in _segment_labels(row[3]) if label not in labels)
+        except Exception:
+            continue
+    if len(merged) > 3:
+        merged[3] = str(labels) if merged[3].strip().startswith('[') else ','.join(labels)
+    return merged
+
+
+def merge_sets(dataset_files: List[str],
+               output_file: str,
+               verbose: bool = False,
+               conflicts: str = 'first',
+               max_buffer_rows: int = 1000000,
+               tmp_dir: Optional[str] = None):
     """
-    Merge multiple CSV files into a single one, removing duplicate rows.
+    Merge multiple CSV files into a single one, removing duplicate samples: rows are deduplicated on their normalized
+    (yt_id, start_seconds, end_seconds) key, through 64-bit fingerprints (see row_fingerprint).
+    Rows are grouped with an external sort: beyond max_buffer_rows, sorted runs are spilled to disk and k-way merged,
+    so that memory stays bounded whatever the inputs size. Output rows keep their input order.
 
     :param dataset_files: List of CSV files (paths) to merge.
     :param output_file: Path to the output file.
     :param verbose: Whether to print out the number of unique rows and the output file path.
+    :param conflicts: Duplicates resolution: 'first' (first row wins) or 'union' (first row with the union of labels).
+    :param max_buffer_rows: Maximum number of rows held in memory.
+    :param tmp_dir: Sorted runs folder (default: system temporary folder).
 
     Example:
     >>> merged_CSV -> merge_sets(dataset_files=['path/to/set1.csv', 'path/to/set2.csv'], 
                                   output_file='path/to/output.csv')
     """
-    unique_rows = set()  # Set to store unique rows
+    if conflicts not in ('first', 'union'):
+        raise ValueError(f"Unknown conflicts resolution '{conflicts}' ('first' or 'union').")
 
-    with open(output_file, 'w', newline='') as fout:
-        writer = None
+    headers = []
 
-        # Main routine
+    def records():
+        seq = 0
         for filename in dataset_files:
-            with open(filename, 'r') as f:
+            with open(filename, 'r', newline='') as f:
                 reader = csv.reader(f)
-                headers = next(reader)
+                header = next(reader)
+                if not headers:
+                    headers.append(header)
+                for row in reader:
+                    yield row_fingerprint(row), seq, row
+                    seq += 1
 
-                if writer is None:
-                    writer = csv.writer(fout)
-                    writer.writerow(headers)
+    def resolved(sorted_records):
+        for _, group in itertools.groupby(sorted_records, key=lambda record: record[0]):
+            group = list(group) if conflicts == 'union' else [next(group)]
+            yield group[0][1], group[0][2] if len(group) == 1 else _union_labels([row for _, _, row in group])
 
-                # Add each row to the set to ensure uniqueness
-                for row in reader:
-                    row_tuple = tuple(row)
-                    if row_tuple not in unique_rows:
-                        unique_rows.add(row_tuple)
-                        writer.writerow(row)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as runs_dir, open(output_file, 'w', newline='') as fout:
+        # In-memory deduplication (dicts keep the input order), falling back to external sorts once over budget
+        merged = {}
+        pending = records()
+        output_rows = None
+        for fp, seq, row in pending:
+            entry = merged.get(fp)
+            if entry is None:
+                if len(merged) >= max_buffer_rows:
+                    spilled = itertools.chain(((key, *entry) for key, entry in merged.items()), [(fp, seq, row)], pending)
+                    by_key = _external_sort(spilled, max_buffer_rows, runs_dir)
+                    output_rows = (row for _, row in _external_sort(resolved(by_key), max_buffer_rows, runs_dir))
+                    break
+                merged[fp] = (seq, row)
+            elif conflicts == 'union':
+                merged[fp] = (entry[0], _union_labels([entry[1], row]))
+        if output_rows is None:
+            output_rows = (row for _, row in merged.values())
+
+        unique_rows = 0
+        writer = csv.writer(fout)
+        for row in output_rows:
+            if not unique_rows:
+                writer.writerow(headers[0])
+            writer.writerow(row)
+            unique_rows += 1
+        if not unique_rows and headers:
+            writer.writerow(headers[0])
 
     if verbose:
-        print(f"Unique rows: {len(unique_rows)}")
+        print(f"Unique rows: {unique_rows}")
         print(f"Output path: {output_file}")
@@ -15,6 +15,7 @@ with StandardDownloader(data_file='./AudioSet_EV/EV_Positives.csv',
                         channels_proc='mono_red',
                         normalize=False,
                         cookies_file='cookies.txt',
+                        live_stats_interval=300.0,
                         verbose=False) as downloader:
     downloader.download_and_process()
 
@@ -25,5 +26,6 @@ with StandardDownloader(data_file='./AudioSet_EV/EV_Negatives.csv',
                         channels_proc='mono_red',
                         normalize=False,
                         cookies_file='cookies.txt',
+                        live_stats_interval=300.0,
                         verbose=False) as downloader:
     downloader.download_and_process()